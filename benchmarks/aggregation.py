@@ -0,0 +1,91 @@
+"""Multi-process logging through `SocketHandler` and `LogAggregator`.
+
+Forks worker processes that each log a numbered sequence of records through a
+`SocketHandler` created before the fork, like a prefork server with a preloaded
+app, and checks that the aggregator received every record of every worker
+exactly once and in order. With `--late-start` the aggregator only starts after
+the workers began logging, so they have to queue and reconnect.
+
+Usage:
+    python benchmarks/aggregation.py [--workers N] [--records N] [--late-start]
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import threading
+import time
+
+from tinylogging import BaseHandler, LogAggregator, Logger, Record, SocketHandler
+
+
+class Collect(BaseHandler):
+    def __init__(self) -> None:
+        super().__init__()
+        self.sequences: dict[str, list[int]] = {}
+        self._lock = threading.Lock()
+
+    def emit(self, record: Record) -> None:
+        with self._lock:
+            self.sequences.setdefault(record.name, []).append(int(record.message))
+
+
+def work(handler: SocketHandler, worker: int, number: int) -> None:
+    logger = Logger(f"worker-{worker}", handlers={handler})
+    for i in range(number):
+        logger.info("%d", i)
+    handler.close()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--records", type=int, default=50_000)
+    parser.add_argument("--late-start", action="store_true")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        address = os.path.join(directory, "log.sock")
+        collect = Collect()
+        aggregator = LogAggregator(address, {collect})
+        handler = SocketHandler(address)
+        if not args.late_start:
+            aggregator.start()
+
+        context = multiprocessing.get_context("fork")
+        begin = time.perf_counter()
+        workers = [
+            context.Process(target=work, args=(handler, worker, args.records))
+            for worker in range(args.workers)
+        ]
+        for process in workers:
+            process.start()
+        if args.late_start:
+            time.sleep(0.5)
+            aggregator.start()
+        for process in workers:
+            process.join()
+        aggregator.close()
+        elapsed = time.perf_counter() - begin
+
+    total = args.workers * args.records
+    expected = list(range(args.records))
+    failed = [
+        name
+        for name in (f"worker-{worker}" for worker in range(args.workers))
+        if collect.sequences.get(name) != expected
+    ]
+    print(
+        f"{aggregator.received} of {total} records from {args.workers} workers in "
+        f"{elapsed:.2f} s ({aggregator.received / elapsed / 1e3:.0f} k records/s)"
+    )
+    if failed:
+        print(f"lost, duplicated or reordered records from {', '.join(failed)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
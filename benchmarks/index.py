@@ -0,0 +1,108 @@
+"""Throughput of the sidecar time/level index on a large log file.
+
+Writes a log file spanning one day with and without an index, builds the index
+of an existing file, and compares a query for the ERROR records of a three-minute
+window with scanning and parsing every line. Fails if the index has more than one
+entry per one-second bucket, as its size must not depend on how levels are mixed.
+
+Usage:
+    python benchmarks/index.py [--records N] [--directory DIR]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from tinylogging import FileHandler, Formatter, Level, Record
+from tinylogging.index import INDEX_SUFFIX, LineParser, LogIndex, build_index
+
+LEVELS = [Level.DEBUG] * 6 + [Level.INFO] * 3 + [Level.ERROR]
+
+
+def write(file_name: str, number: int, start_ns: int, step_ns: int, index: bool) -> float:
+    handler = FileHandler(file_name, flush_every=0, index=index)
+    records = [
+        Record.from_fields(f"request {i} handled", LEVELS[i % len(LEVELS)], "bench", 0)
+        for i in range(min(number, 10_000))
+    ]
+    begin = time.perf_counter()
+    for i in range(number):
+        record = records[i % len(records)]
+        record.time_ns = start_ns + i * step_ns
+        handler.emit(record)
+    handler.close()
+    return time.perf_counter() - begin
+
+
+def scan(file_name: str, start: datetime, end: datetime) -> int:
+    parser = LineParser(Formatter(colorize=False), start.date())
+    start_ns, end_ns = int(start.timestamp() * 1e9), int(end.timestamp() * 1e9)
+    count = 0
+    with open(file_name, "rb") as file:
+        for line in file:
+            parsed = parser.parse(line)
+            if parsed and parsed[1] >= Level.ERROR and start_ns <= parsed[0] < end_ns:
+                count += 1
+    return count
+
+
+def report(label: str, seconds: float, number: int, size: int) -> None:
+    print(
+        f"{label:<32} {seconds:8.3f} s {number / seconds / 1e6:8.2f} M records/s "
+        f"{size / seconds / 2**20:8.1f} MiB/s"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--records", type=int, default=1_000_000)
+    parser.add_argument("--directory", default=None, help="e.g. a tmpfs mount")
+    args = parser.parse_args()
+    number = args.records
+
+    day = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    start_ns = int(day.timestamp()) * 1_000_000_000
+    step_ns = 86_400 * 1_000_000_000 // number
+
+    with tempfile.TemporaryDirectory(dir=args.directory) as directory:
+        file_name = os.path.join(directory, "app.log")
+
+        seconds = write(file_name, number, start_ns, step_ns, index=False)
+        size = os.path.getsize(file_name)
+        report("write (no index)", seconds, number, size)
+
+        begin = time.perf_counter()
+        build_index(file_name, date=day.date())
+        report("build index afterwards", time.perf_counter() - begin, number, size)
+        index_size = os.path.getsize(file_name + INDEX_SUFFIX)
+        print(f"{'index size':<32} {index_size / size * 100:8.2f} % of the log file")
+        buckets = -(-number * step_ns // 1_000_000_000)
+        entries = len(LogIndex(file_name))
+        assert entries <= buckets, f"{entries} index entries for {buckets} buckets"
+
+        os.remove(file_name)
+        os.remove(file_name + INDEX_SUFFIX)
+        seconds = write(file_name, number, start_ns, step_ns, index=True)
+        report("write (index=True)", seconds, number, size)
+        entries = len(LogIndex(file_name))
+        assert entries <= buckets, f"{entries} index entries for {buckets} buckets"
+
+        start = day + timedelta(hours=14, minutes=2)
+        end = day + timedelta(hours=14, minutes=5)
+
+        begin = time.perf_counter()
+        matches = scan(file_name, start, end)
+        report("scan and parse every line", time.perf_counter() - begin, number, size)
+
+        begin = time.perf_counter()
+        found = sum(
+            chunk.count(b"\n") for chunk in LogIndex(file_name).query(Level.ERROR, start, end)
+        )
+        elapsed = time.perf_counter() - begin
+        print(f"{'query through the index':<32} {elapsed:8.3f} s ({found} lines, scan: {matches})")
+
+
+if __name__ == "__main__":
+    main()
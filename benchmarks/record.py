@@ -0,0 +1,102 @@
+"""Per-record cost of `Record` construction and call-site capture.
+
+Compares the previous stack-scanning capture with the fixed-depth capture and
+with call-site capture disabled, and the memory held by queued records with
+the previous `__dict__`-based layout and the slotted layout.
+
+Usage:
+    python benchmarks/record.py [--number N]
+"""
+
+import argparse
+import inspect
+import timeit
+import tracemalloc
+from datetime import datetime
+
+from tinylogging import CallerCapture, Formatter, Level, Logger, Record, StreamHandler
+
+
+class LegacyRecord(Record):
+    """`Record` with the call-site capture used before fixed-depth capture."""
+
+    def __post_init__(self, stacklevel: int, capture_caller: bool) -> None:
+        self.time = datetime.now()
+
+        depth = self._get_stack_index()
+        frame = inspect.stack()[depth]
+
+        depth = self._get_stack_index()
+        frame = inspect.currentframe()
+        for _ in range(depth):
+            frame = frame.f_back  # type: ignore
+
+        self.filename = frame.f_code.co_filename  # type: ignore
+        self.line = frame.f_lineno  # type: ignore
+        self.function = frame.f_code.co_name  # type: ignore
+
+    def _get_stack_index(self) -> int:
+        current_frame = inspect.currentframe()
+        index = 0
+        while current_frame:
+            if current_frame.f_code.co_name == "log":
+                return index + 1
+            current_frame = current_frame.f_back
+            index += 1
+        return 1
+
+
+class DictRecord(Record):
+    """`Record` with a per-instance `__dict__` and an eagerly created `datetime`."""
+
+    def __post_init__(self, stacklevel: int, capture_caller: bool) -> None:
+        Record.__post_init__(self, stacklevel + 1, capture_caller)
+        self.time = datetime.now()
+
+
+class NullStream:
+    def write(self, _: str) -> int:
+        return 0
+
+    def flush(self) -> None:
+        pass
+
+
+def log(record_cls: type[Record], **kwargs) -> Record:
+    return record_cls("message", Level.INFO, "bench", **kwargs)
+
+
+def bench(label: str, stmt, number: int) -> None:
+    best = min(timeit.repeat(stmt, number=number, repeat=5))
+    print(f"{label:<40} {best / number * 1e6:8.2f} us/record")
+
+
+def bench_memory(label: str, record_cls: type[Record], number: int) -> None:
+    tracemalloc.start()
+    records = [log(record_cls, stacklevel=2) for _ in range(number)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<40} {size / len(records):8.1f} bytes/record")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=20_000)
+    number = parser.parse_args().number
+
+    bench("Record (before: inspect.stack)", lambda: log(LegacyRecord), number)
+    bench("Record (fixed depth)", lambda: log(Record, stacklevel=2), number)
+    bench("Record (capture off)", lambda: log(Record, capture_caller=False), number)
+
+    bench_memory("Record memory (before: __dict__ + datetime)", DictRecord, number)
+    bench_memory("Record memory (slots + time_ns)", Record, number)
+
+    template = "{time} | {level} | {message}"
+    for mode in CallerCapture:
+        handler = StreamHandler(Formatter(template=template), stream=NullStream())  # type: ignore
+        logger = Logger("bench", handlers={handler}, caller=mode)
+        bench(f"Logger.info (caller={mode.name})", lambda: logger.info("message"), number)
+
+
+if __name__ == "__main__":
+    main()
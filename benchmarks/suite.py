@@ -0,0 +1,542 @@
+"""Benchmark suite comparing tinylogging with the standard library `logging`.
+
+Each case does the same work with tinylogging and with `logging` (and with loguru
+if it is installed) and reports records per second and per-call latency
+percentiles. Files are written to a tmpfs (`/dev/shm`) where available, so disk
+speed does not hide the cost of the libraries.
+
+Results can be written as JSON and compared with an earlier run, failing when a
+tinylogging case became slower by more than a threshold:
+
+    python benchmarks/suite.py --output results.json
+    python benchmarks/suite.py --compare results.json --threshold 0.2
+
+Usage:
+    python benchmarks/suite.py [--number N] [--threads N] [--directory DIR]
+        [--only SUBSTRING] [--output FILE] [--compare FILE] [--threshold RATIO]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Optional
+
+from tinylogging import (
+    AsyncLogger,
+    AsyncStreamHandler,
+    CallerCapture,
+    FileHandler,
+    FingersCrossedHandler,
+    Formatter,
+    Level,
+    Logger,
+    LoggingAdapterHandler,
+    Record,
+    StreamHandler,
+    TimeFormat,
+)
+from tinylogging.helpers import JsonFormatter
+
+try:
+    import loguru
+except ImportError:
+    loguru = None  # type: ignore[assignment]
+
+TEMPLATE = "{time} | {level} | {message}"
+STDLIB_FORMAT = "%(asctime)s | %(levelname)s | %(message)s"
+TIME_FORMAT = "[%H:%M:%S]"
+
+
+@dataclass
+class Result:
+    case: str
+    library: str
+    number: int
+    per_second: float
+    p50_ns: int
+    p90_ns: int
+    p99_ns: int
+    p999_ns: int
+
+
+def percentile(samples: list[int], fraction: float) -> int:
+    return samples[min(len(samples) - 1, int(len(samples) * fraction))]
+
+
+def result(case: str, library: str, elapsed_ns: int, samples: list[int]) -> Result:
+    samples.sort()
+    return Result(
+        case=case,
+        library=library,
+        number=len(samples),
+        per_second=len(samples) / (elapsed_ns / 1e9),
+        p50_ns=percentile(samples, 0.5),
+        p90_ns=percentile(samples, 0.9),
+        p99_ns=percentile(samples, 0.99),
+        p999_ns=percentile(samples, 0.999),
+    )
+
+
+def measure(case: str, library: str, call: Callable[[], Any], number: int) -> Result:
+    """Times `number` calls in a tight loop for throughput and one by one for latency."""
+    for _ in range(min(number, 1000)):
+        call()
+
+    begin = time.perf_counter_ns()
+    for _ in range(number):
+        call()
+    elapsed = time.perf_counter_ns() - begin
+
+    timer = time.perf_counter_ns
+    samples = [0] * number
+    for i in range(number):
+        start = timer()
+        call()
+        samples[i] = timer() - start
+    return result(case, library, elapsed, samples)
+
+
+def measure_async(
+    case: str, library: str, call: Callable[[], Awaitable[Any]], number: int
+) -> Result:
+    async def run() -> Result:
+        for _ in range(min(number, 1000)):
+            await call()
+
+        begin = time.perf_counter_ns()
+        for _ in range(number):
+            await call()
+        elapsed = time.perf_counter_ns() - begin
+
+        timer = time.perf_counter_ns
+        samples = [0] * number
+        for i in range(number):
+            start = timer()
+            await call()
+            samples[i] = timer() - start
+        return result(case, library, elapsed, samples)
+
+    return asyncio.run(run())
+
+
+def measure_threads(
+    case: str, library: str, call: Callable[[], Any], number: int, threads: int
+) -> Result:
+    """Times `number` calls spread over `threads` threads logging at the same time."""
+    per_thread = number // threads
+    barrier = threading.Barrier(threads + 1)
+    samples: list[list[int]] = [[] for _ in range(threads)]
+
+    def work(index: int) -> None:
+        timer = time.perf_counter_ns
+        own = samples[index]
+        barrier.wait()
+        for _ in range(per_thread):
+            start = timer()
+            call()
+            own.append(timer() - start)
+        barrier.wait()
+
+    workers = [threading.Thread(target=work, args=(i,)) for i in range(threads)]
+    for worker in workers:
+        worker.start()
+    barrier.wait()
+    begin = time.perf_counter_ns()
+    barrier.wait()
+    elapsed = time.perf_counter_ns() - begin
+    for worker in workers:
+        worker.join()
+    return result(case, library, elapsed, [sample for own in samples for sample in own])
+
+
+class NullStream:
+    def write(self, _: str) -> int:
+        return 0
+
+    def flush(self) -> None:
+        pass
+
+
+def stdlib_logger(name: str, handler: Optional[logging.Handler], level: int) -> logging.Logger:
+    logger = logging.getLogger(f"bench.{name}")
+    logger.handlers.clear()
+    logger.propagate = False
+    logger.setLevel(level)
+    if handler is not None:
+        handler.setFormatter(logging.Formatter(STDLIB_FORMAT, "[%H:%M:%S]"))
+        logger.addHandler(handler)
+    return logger
+
+
+def loguru_logger(sink: Any, level: str = "DEBUG") -> Any:
+    assert loguru is not None
+    logger = loguru.logger
+    logger.remove()
+    logger.add(sink, format="{time:HH:mm:ss} | {level} | {message}", level=level)
+    return logger
+
+
+class Suite:
+    def __init__(self, number: int, threads: int, directory: str, only: Optional[str]) -> None:
+        self.number = number
+        self.threads = threads
+        self.directory = directory
+        self.only = only
+        self.results: list[Result] = []
+        self._closers: list[Callable[[], Any]] = []
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def stream(self, name: str) -> Any:
+        stream = open(self.path(name), "w", encoding="utf-8")
+        self._closers.append(stream.close)
+        return stream
+
+    def wanted(self, case: str) -> bool:
+        return self.only is None or self.only in case
+
+    def add(self, result: Result) -> None:
+        self.results.append(result)
+        print(
+            f"{result.case:<36} {result.library:<12} {result.per_second / 1e3:10.1f} k/s "
+            f"p50 {result.p50_ns / 1e3:8.2f} us  p99 {result.p99_ns / 1e3:8.2f} us  "
+            f"p99.9 {result.p999_ns / 1e3:8.2f} us",
+            flush=True,
+        )
+
+    def compare(self, case: str, calls: dict[str, Callable[[], Any]]) -> None:
+        if not self.wanted(case):
+            return
+        for library, call in calls.items():
+            self.add(measure(case, library, call, self.number))
+
+    def run(self) -> None:
+        try:
+            self.record()
+            self.formatters()
+            self.handlers()
+            self.loggers()
+            self.filtered()
+            self.asynchronous()
+            self.contention()
+        finally:
+            for close in self._closers:
+                close()
+
+    def record(self) -> None:
+        std = stdlib_logger("record", None, logging.INFO)
+
+        def stdlib_record() -> logging.LogRecord:
+            filename, line, function, _ = std.findCaller()
+            return std.makeRecord(std.name, logging.INFO, filename, line, "message", (), None)
+
+        self.compare(
+            "record",
+            {
+                "tinylogging": lambda: Record("message", Level.INFO, "bench"),
+                "logging": stdlib_record,
+            },
+        )
+        self.compare(
+            "record (no caller)",
+            {
+                "tinylogging": lambda: Record("message", Level.INFO, "bench", capture_caller=False),
+                "logging": lambda: logging.LogRecord(
+                    "bench", logging.INFO, "", 0, "message", (), None
+                ),
+            },
+        )
+
+    def formatters(self) -> None:
+        record = Record("message", Level.INFO, "bench")
+        std_record = logging.LogRecord(
+            "bench", logging.INFO, __file__, 1, "message", (), None, "record"
+        )
+
+        def stdlib_format(formatter: logging.Formatter) -> Callable[[], str]:
+            def call() -> str:
+                std_record.message = std_record.getMessage()
+                return formatter.format(std_record)
+
+            return call
+
+        def stdlib_json() -> str:
+            return json.dumps(
+                {
+                    "time": datetime.fromtimestamp(std_record.created).isoformat(
+                        timespec="milliseconds"
+                    ),
+                    "level": std_record.levelname,
+                    "name": std_record.name,
+                    "message": std_record.getMessage(),
+                }
+            )
+
+        cases: list[tuple[str, Callable[[], Any], Callable[[], Any]]] = [
+            (
+                "format strftime",
+                Formatter(TIME_FORMAT, TEMPLATE, colorize=False).format,
+                stdlib_format(logging.Formatter(STDLIB_FORMAT, "[%H:%M:%S]")),
+            ),
+            (
+                "format strftime %f",
+                Formatter("%H:%M:%S.%f", TEMPLATE, colorize=False).format,
+                stdlib_format(logging.Formatter("%(asctime)s.%(msecs)03d | %(message)s")),
+            ),
+            (
+                "format iso",
+                Formatter(TimeFormat.ISO, TEMPLATE, colorize=False).format,
+                stdlib_format(logging.Formatter(STDLIB_FORMAT)),
+            ),
+            (
+                "format epoch",
+                Formatter(TimeFormat.EPOCH, TEMPLATE, colorize=False).format,
+                stdlib_format(logging.Formatter("%(created)f | %(levelname)s | %(message)s")),
+            ),
+            (
+                "format caller fields",
+                Formatter(
+                    TIME_FORMAT, "{time} | {level} | {basename}:{line} | {message}", False
+                ).format,
+                stdlib_format(
+                    logging.Formatter(
+                        "%(asctime)s | %(levelname)s | %(filename)s:%(lineno)d | %(message)s",
+                        "[%H:%M:%S]",
+                    )
+                ),
+            ),
+            (
+                "format colorized",
+                Formatter(TIME_FORMAT, TEMPLATE, colorize=True).format,
+                stdlib_format(logging.Formatter(STDLIB_FORMAT, "[%H:%M:%S]")),
+            ),
+            (
+                "format json",
+                JsonFormatter(("time", "level", "name", "message")).format,
+                stdlib_json,
+            ),
+        ]
+        for case, tiny, std in cases:
+            self.compare(case, {"tinylogging": lambda tiny=tiny: tiny(record), "logging": std})
+
+    def handlers(self) -> None:
+        record = Record("message", Level.INFO, "bench")
+        std_record = logging.LogRecord("bench", logging.INFO, __file__, 1, "message", (), None)
+        formatter = Formatter(TIME_FORMAT, TEMPLATE, colorize=False)
+        std_formatter = logging.Formatter(STDLIB_FORMAT, "[%H:%M:%S]")
+
+        stream = StreamHandler(formatter, stream=self.stream("tiny-stream.log"))
+        std_stream = logging.StreamHandler(self.stream("std-stream.log"))
+        std_stream.setFormatter(std_formatter)
+        self.compare(
+            "StreamHandler (tmpfs)",
+            {
+                "tinylogging": lambda: stream.handle(record),
+                "logging": lambda: std_stream.handle(std_record),
+            },
+        )
+
+        instrumented = StreamHandler(formatter, stream=self.stream("tiny-stats.log"))
+        instrumented.enable_stats()
+        self.compare(
+            "StreamHandler with stats (tmpfs)",
+            {"tinylogging": lambda: instrumented.handle(record)},
+        )
+
+        file = FileHandler(self.path("tiny-file.log"), formatter=formatter)
+        std_file = logging.FileHandler(self.path("std-file.log"))
+        std_file.setFormatter(std_formatter)
+        self._closers += [file.close, std_file.close]
+        self.compare(
+            "FileHandler (tmpfs)",
+            {
+                "tinylogging": lambda: file.handle(record),
+                "logging": lambda: std_file.handle(std_record),
+            },
+        )
+
+        buffered = FileHandler(self.path("tiny-buffered.log"), formatter=formatter, flush_every=0)
+        self._closers.append(buffered.close)
+        self.compare(
+            "FileHandler buffered (tmpfs)",
+            {"tinylogging": lambda: buffered.handle(record)},
+        )
+
+        held_back = FingersCrossedHandler(stream, capacity=1000)
+        self.compare(
+            "FingersCrossedHandler held back",
+            {"tinylogging": lambda: held_back.handle(record)},
+        )
+
+    def loggers(self) -> None:
+        formatter = Formatter(TIME_FORMAT, TEMPLATE, colorize=False)
+        for mode in (CallerCapture.EAGER, CallerCapture.OFF):
+            logger = Logger(
+                f"logger-{mode.name}",
+                handlers={StreamHandler(formatter, stream=NullStream())},  # type: ignore[arg-type]
+                caller=mode,
+            )
+            self.compare(
+                f"Logger.info (caller={mode.name})",
+                {"tinylogging": lambda logger=logger: logger.info("message %d", 1)},
+            )
+
+        file = FileHandler(self.path("tiny-logger.log"), formatter=formatter)
+        self._closers.append(file.close)
+        logger = Logger("logger-file", handlers={file})
+        std = stdlib_logger(
+            "logger-file", logging.FileHandler(self.path("std-logger.log")), logging.INFO
+        )
+        self._closers.append(std.handlers[0].close)
+        calls: dict[str, Callable[[], Any]] = {
+            "tinylogging": lambda: logger.info("message %d", 1),
+            "logging": lambda: std.info("message %d", 1),
+        }
+        if loguru is not None:
+            guru = loguru_logger(self.stream("loguru-logger.log"))
+            calls["loguru"] = lambda: guru.info("message {}", 1)
+        self.compare("Logger.info to file (tmpfs)", calls)
+
+        bridged = FileHandler(self.path("tiny-bridge.log"), formatter=formatter)
+        self._closers.append(bridged.close)
+        bridge = stdlib_logger("bridge", None, logging.INFO)
+        bridge.addHandler(LoggingAdapterHandler(bridged))
+        self.compare(
+            "logging via LoggingAdapterHandler",
+            {"tinylogging": lambda: bridge.info("message %d", 1)},
+        )
+
+    def filtered(self) -> None:
+        logger = Logger(
+            "filtered",
+            level=Level.INFO,
+            handlers={StreamHandler(Formatter(), stream=NullStream())},  # type: ignore[arg-type]
+        )
+        null_handler = logging.StreamHandler(NullStream())  # type: ignore[arg-type]
+        std = stdlib_logger("filtered", null_handler, logging.INFO)
+        calls: dict[str, Callable[[], Any]] = {
+            "tinylogging": lambda: logger.debug("message %d", 1),
+            "logging": lambda: std.debug("message %d", 1),
+        }
+        if loguru is not None:
+            guru = loguru_logger(NullStream(), level="INFO")
+            calls["loguru"] = lambda: guru.debug("message {}", 1)
+        self.compare("filtered-out debug", calls)
+
+    def asynchronous(self) -> None:
+        case = "AsyncLogger.info (tmpfs)"
+        if not self.wanted(case):
+            return
+        formatter = Formatter(TIME_FORMAT, TEMPLATE, colorize=False)
+        handler = AsyncStreamHandler(formatter, stream=self.stream("tiny-async.log"))
+        logger = AsyncLogger("async", handlers={handler})
+        self.add(
+            measure_async(case, "tinylogging", lambda: logger.info("message %d", 1), self.number)
+        )
+
+        std = stdlib_logger(
+            "async", logging.StreamHandler(self.stream("std-async.log")), logging.INFO
+        )
+
+        async def stdlib_call() -> None:
+            std.info("message %d", 1)
+
+        self.add(measure_async(case, "logging", stdlib_call, self.number))
+
+    def contention(self) -> None:
+        case = f"{self.threads} threads, one FileHandler"
+        if not self.wanted(case):
+            return
+        formatter = Formatter(TIME_FORMAT, TEMPLATE, colorize=False)
+        file = FileHandler(self.path("tiny-threads.log"), formatter=formatter, flush_every=0)
+        self._closers.append(file.close)
+        logger = Logger("threads", handlers={file})
+        std = stdlib_logger(
+            "threads", logging.FileHandler(self.path("std-threads.log")), logging.INFO
+        )
+        self._closers.append(std.handlers[0].close)
+        self.add(
+            measure_threads(
+                case, "tinylogging", lambda: logger.info("message %d", 1), self.number, self.threads
+            )
+        )
+        self.add(
+            measure_threads(
+                case, "logging", lambda: std.info("message %d", 1), self.number, self.threads
+            )
+        )
+
+
+def compare_results(results: list[Result], baseline_file: str, threshold: float) -> int:
+    """Prints how tinylogging cases changed against a baseline and counts regressions."""
+    with open(baseline_file, encoding="utf-8") as file:
+        baseline = {
+            (entry["case"], entry["library"]): entry for entry in json.load(file)["results"]
+        }
+
+    regressions = 0
+    print(f"\nCompared with {baseline_file}:")
+    for result in results:
+        if result.library != "tinylogging":
+            continue
+        previous = baseline.get((result.case, result.library))
+        if previous is None:
+            continue
+        change = previous["per_second"] / result.per_second - 1
+        regressed = change > threshold
+        regressions += regressed
+        print(f"{result.case:<36} {change * 100:+8.1f} % time{'  REGRESSION' if regressed else ''}")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--number", type=int, default=20_000, help="calls per case")
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--directory", default="/dev/shm" if os.path.isdir("/dev/shm") else None)
+    parser.add_argument("--only", help="only run cases containing this text")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="compare with the results in this JSON file")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown ratio")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(dir=args.directory) as directory:
+        suite = Suite(args.number, args.threads, directory, args.only)
+        suite.run()
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(
+                {
+                    "created": datetime.now().isoformat(timespec="seconds"),
+                    "python": sys.version,
+                    "implementation": platform.python_implementation(),
+                    "platform": platform.platform(),
+                    "cpus": os.cpu_count(),
+                    "number": args.number,
+                    "threads": args.threads,
+                    "results": [asdict(result) for result in suite.results],
+                },
+                file,
+                indent=2,
+            )
+
+    if args.compare:
+        return 1 if compare_results(suite.results, args.compare, args.threshold) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,35 +2,76 @@ from tinylogging import helpers
 from tinylogging.aio import AsyncLogger
 from tinylogging.aio.handlers import (
     AsyncFileHandler,
+    AsyncFingersCrossedHandler,
+    AsyncRotatingFileHandler,
     AsyncStreamHandler,
     AsyncTelegramHandler,
     BaseAsyncHandler,
 )
-from tinylogging.formatter import Formatter
+from tinylogging.aggregator import LogAggregator
+from tinylogging.binary import BinaryLogReader
+from tinylogging.buffer import BufferScope
+from tinylogging.callsite import CallSite, CallSiteCache
+from tinylogging.filters import BaseFilter, DedupFilter, RateLimitFilter, SamplingFilter
+from tinylogging.formatter import Formatter, TimeFormat, supports_color
 from tinylogging.level import Level
-from tinylogging.record import Record
-from tinylogging.sync import Logger
+from tinylogging.overflow import OverflowPolicy
+from tinylogging.record import CallerCapture, Record
+from tinylogging.rotation import Compression
+from tinylogging.stats import HandlerSnapshot, HandlerStats, LatencyHistogram, LoggerSnapshot
+from tinylogging.sync import Logger, get_logger
 from tinylogging.sync.handlers import (
     BaseHandler,
+    BinaryFileHandler,
     FileHandler,
+    FingersCrossedHandler,
     LoggingAdapterHandler,
+    QueueHandler,
+    RotatingFileHandler,
+    SocketHandler,
     StreamHandler,
     TelegramHandler,
 )
 
 __all__ = [
     "Record",
+    "CallerCapture",
+    "CallSite",
+    "CallSiteCache",
     "Formatter",
+    "BaseFilter",
+    "SamplingFilter",
+    "RateLimitFilter",
+    "DedupFilter",
+    "TimeFormat",
+    "supports_color",
     "BaseHandler",
     "StreamHandler",
     "FileHandler",
+    "RotatingFileHandler",
+    "BinaryFileHandler",
+    "BinaryLogReader",
     "LoggingAdapterHandler",
+    "QueueHandler",
+    "SocketHandler",
+    "FingersCrossedHandler",
+    "BufferScope",
+    "LogAggregator",
     "Logger",
+    "get_logger",
     "AsyncLogger",
     "BaseAsyncHandler",
     "AsyncStreamHandler",
     "AsyncFileHandler",
+    "AsyncRotatingFileHandler",
+    "AsyncFingersCrossedHandler",
     "Level",
+    "OverflowPolicy",
+    "Compression",
+    "HandlerStats",
+    "HandlerSnapshot",
+    "LoggerSnapshot",
+    "LatencyHistogram",
     "AsyncTelegramHandler",
     "TelegramHandler",
     "helpers",
@@ -0,0 +1,204 @@
+"""Command line tools for tinylogging log files.
+
+Usage:
+    python -m tinylogging index app.log
+    python -m tinylogging query app.log --level ERROR --start 14:02 --end 14:05
+    python -m tinylogging aggregate /run/app/log.sock app.log
+"""
+
+import argparse
+import signal
+import sys
+from datetime import date, datetime, time, timedelta
+from time import time_ns
+from typing import Iterable, Optional
+
+from tinylogging.aggregator import LogAggregator
+from tinylogging.binary import MAGIC, BinaryLogReader
+from tinylogging.formatter import Formatter, TimeFormat
+from tinylogging.index import LogIndex, build_index
+from tinylogging.level import Level
+from tinylogging.sync.handlers import BinaryFileHandler, FileHandler
+
+
+def _formatter(args: argparse.Namespace) -> Formatter:
+    """Creates the formatter described by the command line arguments.
+
+    Args:
+        args (argparse.Namespace): The parsed arguments.
+
+    Returns:
+        Formatter: The formatter without colors.
+    """
+    time_format = args.time_format
+    if time_format in {member.value for member in TimeFormat}:
+        time_format = TimeFormat(time_format)
+    return Formatter(time_format=time_format, template=args.template, colorize=False)
+
+
+def _parse_time(value: Optional[str], day: date) -> Optional[datetime]:
+    """Parses a time given on the command line.
+
+    Args:
+        value (Optional[str]): An ISO-8601 date and time, or only a time of `day`.
+        day (date): The day for values without a date.
+
+    Returns:
+        Optional[datetime]: The parsed time.
+    """
+    if value is None:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return datetime.combine(day, time.fromisoformat(value))
+
+
+def _is_binary(file_name: str) -> bool:
+    with open(file_name, "rb") as file:
+        return file.read(5 + len(MAGIC))[5:] == MAGIC
+
+
+def _write(chunks: Iterable[bytes]) -> None:
+    output = sys.stdout.buffer
+    try:
+        for chunk in chunks:
+            output.write(chunk)
+        output.flush()
+    except BrokenPipeError:
+        # The reader went away, e.g. `| head`.
+        sys.stderr.close()
+
+
+def index_command(args: argparse.Namespace) -> int:
+    count = build_index(
+        args.file,
+        _formatter(args),
+        bucket=timedelta(seconds=args.bucket),
+        date=args.date,
+    )
+    print(f"Indexed {count} records of {args.file}", file=sys.stderr)
+    return 0
+
+
+def query_command(args: argparse.Namespace) -> int:
+    level = Level[args.level.upper()] if args.level else None
+    formatter = _formatter(args)
+
+    if _is_binary(args.file):
+        with BinaryLogReader(args.file) as reader:
+            day = args.date or datetime.now().date()
+            lines = reader.lines(
+                formatter, level, _parse_time(args.start, day), _parse_time(args.end, day)
+            )
+            _write(line.encode("utf-8") for line in lines)
+        return 0
+
+    if not args.no_update:
+        build_index(args.file, formatter, date=args.date)
+    index = LogIndex(args.file)
+    day = args.date
+    if day is None:
+        last = index.last
+        last_ns = time_ns() if last is None else last.last_ns
+        day = datetime.fromtimestamp(last_ns // 1_000_000_000).date()
+    start, end = _parse_time(args.start, day), _parse_time(args.end, day)
+    _write(index.query(level, start, end, formatter=formatter))
+    return 0
+
+
+def aggregate_command(args: argparse.Namespace) -> int:
+    handler_class = BinaryFileHandler if args.binary else FileHandler
+    handler = handler_class(
+        args.file,
+        flush_every=0,
+        flush_interval=args.flush_interval,
+        index=args.index,
+    )
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    print(f"Aggregating {args.address} into {args.file}", file=sys.stderr)
+    try:
+        LogAggregator(args.address, {handler}).serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        handler.close()
+    return 0
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m tinylogging",
+        description="Index and query log files written by tinylogging.",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    format_options = argparse.ArgumentParser(add_help=False)
+    format_options.add_argument(
+        "--template",
+        default=Formatter().template,
+        help="template the file was written with (default: %(default)r)",
+    )
+    format_options.add_argument(
+        "--time-format",
+        default=Formatter().time_format,
+        help="strftime format, iso, epoch or epoch_ms (default: %(default)r)",
+    )
+    format_options.add_argument(
+        "--date",
+        type=date.fromisoformat,
+        help="day of times without a date (default: the day of the last indexed record)",
+    )
+
+    index = commands.add_parser(
+        "index",
+        parents=[format_options],
+        help="build or update the sidecar index of a text log file",
+    )
+    index.add_argument("file")
+    index.add_argument(
+        "--bucket",
+        type=float,
+        default=1.0,
+        help="longest time span of an index entry in seconds (default: %(default)s)",
+    )
+    index.set_defaults(handler=index_command)
+
+    query = commands.add_parser(
+        "query",
+        parents=[format_options],
+        help="print the records of a text or binary log file matching a level and time range",
+    )
+    query.add_argument("file")
+    query.add_argument("--level", help="minimum level, e.g. ERROR")
+    query.add_argument("--start", help="ISO-8601 date and time, or a time such as 14:02")
+    query.add_argument("--end", help="ISO-8601 date and time, or a time such as 14:05")
+    query.add_argument(
+        "--no-update",
+        action="store_true",
+        help="use the index as is instead of indexing new records first",
+    )
+    query.set_defaults(handler=query_command)
+
+    aggregate = commands.add_parser(
+        "aggregate",
+        help="write the records sent by SocketHandlers of other processes to one file",
+    )
+    aggregate.add_argument("address", help="path of the Unix domain socket to listen on")
+    aggregate.add_argument("file")
+    aggregate.add_argument("--binary", action="store_true", help="write a binary log")
+    aggregate.add_argument("--index", action="store_true", help="maintain a sidecar index")
+    aggregate.add_argument(
+        "--flush-interval",
+        type=float,
+        default=1.0,
+        help="flush the file at least this often in seconds (default: %(default)s)",
+    )
+    aggregate.set_defaults(handler=aggregate_command)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,185 @@
+import os
+import selectors
+import socket
+import stat
+import sys
+import threading
+import traceback
+from typing import Optional
+
+from tinylogging.binary import BinaryDecoder
+from tinylogging.record import Record
+from tinylogging.sync.handlers import BaseHandler
+
+__all__ = ["LogAggregator"]
+
+
+class LogAggregator:
+    """Receives log records from `SocketHandler`s and dispatches them to handlers.
+
+    Lets several processes, e.g. prefork workers, log through one process that owns
+    the files. Each connection is read by its own thread, so records of one process
+    stay in order while records of different processes interleave.
+
+    Args:
+        address (str): Path of the Unix domain socket to listen on. A stale socket
+            file at this path is replaced.
+        handlers (set[BaseHandler]): Handlers to dispatch log records to.
+
+    Attributes:
+        received (int): The number of log records received.
+    """
+
+    def __init__(self, address: str, handlers: set[BaseHandler]) -> None:
+        self.address = address
+        self.handlers = handlers
+        self.received = 0
+        self._listener: Optional[socket.socket] = None
+        self._wakeup: Optional[tuple[socket.socket, socket.socket]] = None
+        self._acceptor: Optional[threading.Thread] = None
+        self._connections: dict[socket.socket, threading.Thread] = {}
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "LogAggregator":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def start(self) -> None:
+        """Start listening and accepting connections on a background thread."""
+        try:
+            if stat.S_ISSOCK(os.stat(self.address).st_mode):
+                os.unlink(self.address)
+        except FileNotFoundError:
+            pass
+
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        listener.bind(self.address)
+        listener.listen(128)
+        listener.setblocking(False)
+        self._listener = listener
+        self._wakeup = socket.socketpair()
+        self._acceptor = threading.Thread(
+            target=self._accept,
+            name="tinylogging-aggregator",
+            daemon=True,
+        )
+        self._acceptor.start()
+
+    def serve_forever(self) -> None:
+        """Start the aggregator and block until it is closed or interrupted."""
+        if self._acceptor is None:
+            self.start()
+        assert self._acceptor is not None
+        try:
+            self._acceptor.join()
+        finally:
+            self.close()
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Stop accepting connections and close the remaining ones.
+
+        Open connections get `timeout` seconds to send their records and disconnect.
+        The handlers are flushed afterwards.
+
+        Args:
+            timeout (float): How long to wait for open connections, in seconds.
+        """
+        listener, self._listener = self._listener, None
+        if listener is None:
+            return
+        # New connections fail from here on, so the handlers keep their records and retry.
+        try:
+            os.unlink(self.address)
+        except OSError:
+            pass
+        # Connections already waiting in the backlog may hold records their handlers
+        # consider delivered, so the acceptor takes them all before it stops.
+        assert self._wakeup is not None and self._acceptor is not None
+        self._wakeup[1].send(b"\0")
+        self._acceptor.join()
+        listener.close()
+        for end in self._wakeup:
+            end.close()
+
+        with self._lock:
+            connections = list(self._connections.items())
+        for _, thread in connections:
+            thread.join(timeout / len(connections))
+        for connection, thread in connections:
+            if thread.is_alive():
+                try:
+                    connection.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+                thread.join()
+
+        for handler in self.handlers:
+            handler.flush()
+
+    def _accept(self) -> None:
+        """Accept connections until `close` is called, then accept the pending ones."""
+        listener = self._listener
+        assert listener is not None and self._wakeup is not None
+        with selectors.DefaultSelector() as selector:
+            selector.register(listener, selectors.EVENT_READ)
+            selector.register(self._wakeup[0], selectors.EVENT_READ)
+            while True:
+                events = selector.select()
+                closing = any(key.fileobj is self._wakeup[0] for key, _ in events)
+                while True:
+                    try:
+                        connection, _ = listener.accept()
+                    except BlockingIOError:
+                        break
+                    except OSError:
+                        return
+                    connection.setblocking(True)
+                    thread = threading.Thread(
+                        target=self._serve,
+                        args=(connection,),
+                        name="tinylogging-aggregator-connection",
+                        daemon=True,
+                    )
+                    with self._lock:
+                        self._connections[connection] = thread
+                    thread.start()
+                if closing:
+                    return
+
+    def _serve(self, connection: socket.socket) -> None:
+        """Read records from a connection and dispatch them until it is closed.
+
+        Args:
+            connection (socket.socket): The accepted connection.
+        """
+        decoder = BinaryDecoder()
+        try:
+            with connection:
+                while data := connection.recv(1 << 16):
+                    records = decoder.feed(data)
+                    with self._lock:
+                        self.received += len(records)
+                    for record in records:
+                        self._dispatch(record)
+        except Exception:
+            traceback.print_exc(file=sys.stderr)
+        finally:
+            with self._lock:
+                self._connections.pop(connection, None)
+
+    def _dispatch(self, record: Record) -> None:
+        """Pass a log record to the handlers.
+
+        Errors raised by a handler are printed to `sys.stderr`.
+
+        Args:
+            record (Record): The log record to be dispatched.
+        """
+        for handler in self.handlers:
+            try:
+                handler.handle(record)
+            except Exception:
+                traceback.print_exc(file=sys.stderr)
@@ -1,28 +1,58 @@
+import asyncio
+import sys
+import traceback
+from typing import Any, Optional
+
 from tinylogging.aio.handlers import (
     AsyncFileHandler,
+    AsyncFingersCrossedHandler,
+    AsyncRotatingFileHandler,
     AsyncStreamHandler,
     AsyncTelegramHandler,
     BaseAsyncHandler,
 )
+from tinylogging import config
+from tinylogging.config import HandlerSet
+from tinylogging.filters import BaseFilter
 from tinylogging.formatter import Formatter
 from tinylogging.level import Level
-from tinylogging.record import Record
+from tinylogging.message import Message, Style, render_message
+from tinylogging.overflow import OverflowPolicy
+from tinylogging.record import CallerCapture, Record
+from tinylogging.stats import LoggerSnapshot
 
 __all__ = [
     "AsyncLogger",
     "BaseAsyncHandler",
     "AsyncFileHandler",
+    "AsyncRotatingFileHandler",
     "AsyncTelegramHandler",
+    "AsyncFingersCrossedHandler",
 ]
 
+# Looking up a member on an enum class is several times slower than a global.
+_TRACE = Level.TRACE
+_DEBUG = Level.DEBUG
+_INFO = Level.INFO
+_NOTICE = Level.NOTICE
+_WARNING = Level.WARNING
+_ERROR = Level.ERROR
+_CRITICAL = Level.CRITICAL
+
 
 class AsyncLogger:
     def __init__(
         self,
         name: str,
         level: Level = Level.NOTSET,
-        formatter: Formatter = Formatter(),
-        handlers: set[BaseAsyncHandler] = set(),
+        formatter: Optional[Formatter] = None,
+        handlers: Optional[set[BaseAsyncHandler]] = None,
+        caller: CallerCapture = CallerCapture.EAGER,
+        style: Style = "%",
+        background: bool = False,
+        maxsize: int = 10_000,
+        overflow: OverflowPolicy = OverflowPolicy.BLOCK,
+        filters: Optional[list[BaseFilter]] = None,
     ) -> None:
         """
         Initializes an asynchronous logger.
@@ -30,93 +60,388 @@ class AsyncLogger:
         Args:
             name (str): The name of the logger.
             level (Level, optional): The logging level. Defaults to Level.NOTSET.
-            formatter (Formatter, optional): The formatter for log messages. Defaults to Formatter().
-            handlers (set[BaseAsyncHandler], optional): A set of handlers for the logger. Defaults to an empty set.
+            formatter (Formatter, optional): The formatter for the logger's own stream handler.
+                Defaults to None.
+            handlers (set[BaseAsyncHandler], optional): A set of handlers for the logger. Defaults to
+                None, which means a stream handler with `formatter` if one is given, and a stream
+                handler shared by all async loggers otherwise. An empty set is treated like None.
+            caller (CallerCapture, optional): When to capture the call site of log records.
+                Defaults to CallerCapture.EAGER.
+            style (Style, optional): How deferred arguments are merged into messages,
+                `%` for `message % args` or `{` for `message.format(*args)`. Defaults to "%".
+            background (bool, optional): Whether logging only enqueues the record and a worker
+                task emits it to all handlers concurrently. Requires asyncio. Defaults to False.
+            maxsize (int, optional): The maximum number of queued records in background mode.
+                `0` means unbounded. Defaults to 10_000.
+            overflow (OverflowPolicy, optional): What to do when the queue is full.
+                Defaults to OverflowPolicy.BLOCK.
+            filters (list[BaseFilter], optional): Filters applied to records of this logger
+                before they are queued or passed to any handler. Defaults to None.
         """
+        self._generation = -1
+        self._effective_level = 0
         self.name = name
         self.level = level
-        self.formatter = formatter
-        self.is_disabled = False
-        self.handlers = handlers or {AsyncStreamHandler(self.formatter, self.level)}
+        self._is_disabled = False
+        self.caller = caller
+        self.style: Style = style
+        self.filters = list(filters or [])
+
+        if not handlers:
+            if formatter is None:
+                handlers = {_get_default_handler()}
+            else:
+                handlers = {AsyncStreamHandler(formatter, self.level)}
+        self.handlers = handlers
+        self.formatter = formatter or _get_default_handler().formatter
+        self.background = background
+        self.maxsize = maxsize
+        self.overflow = overflow
+        self.dropped = 0
+        self._queue: Optional[asyncio.Queue[Record]] = None
+        self._worker: Optional[asyncio.Task[None]] = None
+
+    @property
+    def level(self) -> Level:
+        """
+        The logging level of the logger.
+        """
+        return self._level
+
+    @level.setter
+    def level(self, level: Level) -> None:
+        self._level = level
+        config.invalidate()
+
+    @property
+    def is_disabled(self) -> bool:
+        """
+        Whether the logger drops all records.
+        """
+        return self._is_disabled
+
+    @is_disabled.setter
+    def is_disabled(self, is_disabled: bool) -> None:
+        self._is_disabled = is_disabled
+        # Only this logger is affected, so the cached level is recomputed on its next use.
+        self._generation = -1
+
+    @property
+    def handlers(self) -> HandlerSet[BaseAsyncHandler]:
+        """
+        The handlers of the logger. Changes to the set are picked up automatically.
+        """
+        return self._handlers
+
+    @handlers.setter
+    def handlers(self, handlers: set[BaseAsyncHandler]) -> None:
+        self._handlers: HandlerSet[BaseAsyncHandler] = HandlerSet(handlers)
+        config.invalidate()
+
+    def is_enabled_for(self, level: Level) -> bool:
+        """
+        Checks whether a message with the given level would be emitted by any handler.
+
+        Args:
+            level (Level): The level to check.
+
+        Returns:
+            bool: Whether the level is enabled.
+        """
+        if self._generation != config.generation:
+            self._update_effective_level()
+        return level >= self._effective_level
 
-    async def log(self, message: str, level: Level) -> None:
+    def _update_effective_level(self) -> None:
+        """
+        Recomputes the lowest level any handler of the logger would emit.
+        """
+        self._generation = config.generation
+        handler_levels = [handler.level for handler in self._handlers]
+        if self._is_disabled:
+            self._effective_level = max(Level) + 1
+        elif handler_levels:
+            self._effective_level = max(self._level, min(handler_levels))
+        else:
+            self._effective_level = max(Level) + 1
+
+    async def log(self, message: Message, level: Level, *args: Any, stacklevel: int = 1) -> None:
         """
         Logs a message at the specified level.
 
         Args:
-            message (str): The message to log.
+            message (Message): The message to log, or a callable returning it.
             level (Level): The level at which to log the message.
+            *args (Any): Deferred arguments, merged into the message only if it is logged.
+            stacklevel (int, optional): How many frames above the caller of this method
+                the call site is. Defaults to 1.
         """
-        if self.is_disabled or self.level > level:
+        if self._generation != config.generation:
+            self._update_effective_level()
+        if level < self._effective_level:
             return
 
-        record = Record(message, level, self.name)
+        record = Record(
+            render_message(message, args, self.style),
+            level,
+            self.name,
+            stacklevel=stacklevel + 1,
+            capture_caller=self._should_capture_caller(),
+        )
+
+        for filter_ in self.filters:
+            if record.time_ns >= filter_.due_ns:
+                await self._release(record.time_ns)
+            filtered = filter_.filter(record)
+            if filtered is None:
+                return
+            record = filtered
+
+        await self._dispatch(record)
+
+    async def _dispatch(self, record: Record) -> None:
+        """
+        Passes a record that passed the filters to the queue or the handlers.
+
+        Args:
+            record (Record): The log record.
+        """
+        if self.background:
+            await self._enqueue(record)
+            return
 
         for handler in self.handlers:
             await handler.handle(record)
 
-    async def trace(self, message: str) -> None:
+    async def _release(self, now_ns: Optional[int] = None) -> None:
+        """
+        Passes the records held back by the filters that are due on.
+
+        Args:
+            now_ns (Optional[int]): The time of the record being logged, or `None` to
+                pass all held back records, when the logger is flushed.
+        """
+        for filter_ in self.filters:
+            if now_ns is not None and now_ns < filter_.due_ns:
+                continue
+            for record in filter_.release(now_ns):
+                await self._dispatch(record)
+
+    async def flush(self) -> None:
+        """
+        Waits until all queued records are emitted and flushes the handlers.
+        """
+        await self._release()
+        if self._queue is not None and self._worker is not None and not self._worker.done():
+            await self._queue.join()
+        for handler in self.handlers:
+            await handler.flush()
+
+    async def aclose(self) -> None:
+        """
+        Drains the queue, stops the worker task and flushes the handlers.
+        """
+        await self.flush()
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+        self._queue = None
+        self._worker = None
+
+    async def _enqueue(self, record: Record) -> None:
+        """
+        Puts a record on the queue, starting the worker task if needed.
+
+        Args:
+            record (Record): The record to enqueue.
+        """
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue(self.maxsize)
+            self._worker = asyncio.get_running_loop().create_task(self._work())
+        queue = self._queue
+        assert queue is not None
+
+        if self.overflow is OverflowPolicy.BLOCK:
+            await queue.put(record)
+        elif self.overflow is OverflowPolicy.DROP_NEWEST:
+            try:
+                queue.put_nowait(record)
+            except asyncio.QueueFull:
+                self.dropped += 1
+        else:
+            while True:
+                try:
+                    queue.put_nowait(record)
+                    return
+                except asyncio.QueueFull:
+                    queue.get_nowait()
+                    queue.task_done()
+                    self.dropped += 1
+
+    async def _work(self) -> None:
+        """
+        Worker task that emits queued records to all handlers concurrently.
+
+        Errors raised by a handler are printed to `sys.stderr`.
+        """
+        queue = self._queue
+        assert queue is not None
+        while True:
+            record = await queue.get()
+            try:
+                results = await asyncio.gather(
+                    *(handler.handle(record) for handler in self.handlers),
+                    return_exceptions=True,
+                )
+                for result in results:
+                    if isinstance(result, Exception):
+                        traceback.print_exception(result, file=sys.stderr)
+            finally:
+                queue.task_done()
+
+    async def trace(self, message: Message, *args: Any) -> None:
         """
         Logs a message with TRACE level.
 
         Args:
-            message (str): The message to log.
+            message (Message): The message to log, or a callable returning it.
+            *args (Any): Deferred arguments, merged into the message only if it is logged.
         """
-        await self.log(message, level=Level.TRACE)
+        if _TRACE < self._effective_level and self._generation == config.generation:
+            return
+        await self.log(message, _TRACE, *args, stacklevel=2)
 
-    async def debug(self, message: str) -> None:
+    async def debug(self, message: Message, *args: Any) -> None:
         """
         Logs a message with DEBUG level.
 
         Args:
-            message (str): The message to log.
+            message (Message): The message to log, or a callable returning it.
+            *args (Any): Deferred arguments, merged into the message only if it is logged.
         """
-        await self.log(message, level=Level.DEBUG)
+        if _DEBUG < self._effective_level and self._generation == config.generation:
+            return
+        await self.log(message, _DEBUG, *args, stacklevel=2)
 
-    async def info(self, message: str) -> None:
+    async def info(self, message: Message, *args: Any) -> None:
         """
         Logs a message with INFO level.
 
         Args:
-            message (str): The message to log.
+            message (Message): The message to log, or a callable returning it.
+            *args (Any): Deferred arguments, merged into the message only if it is logged.
         """
-        await self.log(message, level=Level.INFO)
+        if _INFO < self._effective_level and self._generation == config.generation:
+            return
+        await self.log(message, _INFO, *args, stacklevel=2)
 
-    async def notice(self, message: str) -> None:
+    async def notice(self, message: Message, *args: Any) -> None:
         """
         Logs a message with NOTICE level.
 
         Args:
-            message (str): The message to log.
+            message (Message): The message to log, or a callable returning it.
+            *args (Any): Deferred arguments, merged into the message only if it is logged.
         """
-        await self.log(message, level=Level.NOTICE)
+        if _NOTICE < self._effective_level and self._generation == config.generation:
+            return
+        await self.log(message, _NOTICE, *args, stacklevel=2)
 
-    async def warning(self, message: str) -> None:
+    async def warning(self, message: Message, *args: Any) -> None:
         """
         Logs a message with WARNING level.
 
         Args:
-            message (str): The message to log.
+            message (Message): The message to log, or a callable returning it.
+            *args (Any): Deferred arguments, merged into the message only if it is logged.
         """
-        await self.log(message, level=Level.WARNING)
+        if _WARNING < self._effective_level and self._generation == config.generation:
+            return
+        await self.log(message, _WARNING, *args, stacklevel=2)
 
-    async def error(self, message: str) -> None:
+    async def error(self, message: Message, *args: Any) -> None:
         """
         Logs a message with ERROR level.
 
         Args:
-            message (str): The message to log.
+            message (Message): The message to log, or a callable returning it.
+            *args (Any): Deferred arguments, merged into the message only if it is logged.
         """
-        await self.log(message, level=Level.ERROR)
+        if _ERROR < self._effective_level and self._generation == config.generation:
+            return
+        await self.log(message, _ERROR, *args, stacklevel=2)
 
-    async def critical(self, message: str) -> None:
+    async def critical(self, message: Message, *args: Any) -> None:
         """
         Logs a message with CRITICAL level.
 
         Args:
-            message (str): The message to log.
+            message (Message): The message to log, or a callable returning it.
+            *args (Any): Deferred arguments, merged into the message only if it is logged.
+        """
+        if _CRITICAL < self._effective_level and self._generation == config.generation:
+            return
+        await self.log(message, _CRITICAL, *args, stacklevel=2)
+
+    def enable_stats(self) -> None:
         """
-        await self.log(message, level=Level.CRITICAL)
+        Enables stats on the handlers of this logger and on the handlers wrapped by them.
+        """
+        for handler in self._stats_handlers():
+            handler.enable_stats()
+
+    def disable_stats(self) -> None:
+        """
+        Disables stats on the handlers of this logger and on the handlers wrapped by them.
+        """
+        for handler in self._stats_handlers():
+            handler.disable_stats()
+
+    def stats(self) -> LoggerSnapshot:
+        """
+        Takes a snapshot of the stats of the logger, its background queue and its handlers.
+
+        Returns:
+            LoggerSnapshot: The snapshot. Handlers are followed by the handlers wrapped by them.
+        """
+        return LoggerSnapshot(
+            self.name,
+            sum(filter_.dropped for filter_ in self.filters),
+            self.dropped,
+            self._queue.qsize() if self._queue is not None else 0,
+            [handler.snapshot() for handler in self._stats_handlers()],
+        )
+
+    def _stats_handlers(self) -> list[BaseAsyncHandler]:
+        """
+        Lists the handlers of the logger and the handlers wrapped by them.
+
+        Returns:
+            list[BaseAsyncHandler]: The handlers.
+        """
+        handlers = list(self.handlers)
+        for handler in handlers:
+            handlers.extend(wrapped for wrapped in handler._wrapped() if wrapped not in handlers)
+        return handlers
+
+    def _should_capture_caller(self) -> bool:
+        """
+        Checks whether the call site of a new record has to be captured.
+
+        Returns:
+            bool: Whether to capture the call site.
+        """
+        if self.caller is CallerCapture.EAGER:
+            return True
+        if self.caller is CallerCapture.OFF:
+            return False
+        return any(filter_.uses_caller for filter_ in self.filters) or any(
+            handler.formatter.uses_caller or any(filter_.uses_caller for filter_ in handler.filters)
+            for handler in self.handlers
+        )
 
     def enable(self) -> None:
         """
@@ -129,3 +454,19 @@ class AsyncLogger:
         Disables the logger.
         """
         self.is_disabled = True
+
+
+_default_handler: Optional[AsyncStreamHandler] = None
+
+
+def _get_default_handler() -> AsyncStreamHandler:
+    """
+    Gets the stream handler shared by async loggers created without handlers.
+
+    Returns:
+        AsyncStreamHandler: The shared stream handler.
+    """
+    global _default_handler
+    if _default_handler is None:
+        _default_handler = AsyncStreamHandler(Formatter())
+    return _default_handler
@@ -1,19 +1,33 @@
+import asyncio
 import sys
+import time
+import traceback
 from abc import ABC, abstractmethod
-from typing import Optional, Any
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Any, Iterable, Optional, TextIO
 
 import httpx
-from anyio import AsyncFile, open_file
-
-from tinylogging.formatter import Formatter
+from anyio import AsyncFile, Event, Lock, move_on_after, open_file, sleep, to_thread
+
+from tinylogging import config
+from tinylogging.buffer import BufferScope, RecordBuffers
+from tinylogging.filters import BaseFilter
+from tinylogging.formatter import Formatter, render, supports_color
+from tinylogging.helpers import coalesce_messages, get_retry_after
+from tinylogging.index import IndexWriter, encoded_size
 from tinylogging.level import Level
 from tinylogging.record import Record
+from tinylogging.rotation import Compression, Rotator
+from tinylogging.stats import HandlerSnapshot, HandlerStats, snapshot
 
 __all__ = [
     "BaseAsyncHandler",
     "AsyncStreamHandler",
     "AsyncFileHandler",
+    "AsyncRotatingFileHandler",
     "AsyncTelegramHandler",
+    "AsyncFingersCrossedHandler",
 ]
 
 
@@ -36,6 +50,21 @@ class BaseAsyncHandler(ABC):
         """
         self.formatter = formatter
         self.level = level
+        self.filters: list[BaseFilter] = []
+        """Filters applied to records that pass the level check, before they are formatted."""
+        self.stats: Optional[HandlerStats] = None
+        """Counters of emitted records, bytes, errors and emit latency, collected only
+        after `enable_stats` is called."""
+
+    @property
+    def level(self) -> Level:
+        """The logging level threshold for this handler."""
+        return self._level
+
+    @level.setter
+    def level(self, level: Level) -> None:
+        self._level = level
+        config.invalidate()
 
     @abstractmethod
     async def emit(self, record: Record) -> None:
@@ -52,25 +81,142 @@ class BaseAsyncHandler(ABC):
 
     async def handle(self, record: Record) -> None:
         """
-        Handle a log record if it meets the logging level threshold.
+        Handle a log record if it meets the logging level threshold and passes the filters.
 
         Args:
             record (Record): The log record to be handled.
         """
-        if record.level >= self.level:
+        if record.level < self.level:
+            return
+        for filter_ in self.filters:
+            if record.time_ns >= filter_.due_ns:
+                await self._release(record.time_ns)
+            filtered = filter_.filter(record)
+            if filtered is None:
+                return
+            record = filtered
+
+        stats = self.stats
+        if stats is None:
+            await self.emit(record)
+            return
+        start = time.perf_counter_ns()
+        try:
             await self.emit(record)
+        except Exception:
+            stats.failed()
+            raise
+        stats.emitted(record.level, time.perf_counter_ns() - start)
+
+    async def flush(self) -> None:
+        """
+        Flush any buffered log records.
+        """
+        await self._release()
+
+    async def aclose(self) -> None:
+        """
+        Flush and release the resources held by the handler.
+        """
+        await self.flush()
+
+    async def _release(self, now_ns: Optional[int] = None) -> None:
+        """
+        Emit the records held back by the filters that are due.
+
+        Args:
+            now_ns (Optional[int]): The time of the record being handled, or `None` to
+                emit all held back records, when the handler is flushed or closed.
+        """
+        for filter_ in self.filters:
+            if now_ns is not None and now_ns < filter_.due_ns:
+                continue
+            for record in filter_.release(now_ns):
+                stats = self.stats
+                if stats is None:
+                    await self.emit(record)
+                    continue
+                start = time.perf_counter_ns()
+                try:
+                    await self.emit(record)
+                except Exception:
+                    stats.failed()
+                    raise
+                stats.emitted(record.level, time.perf_counter_ns() - start)
+
+    def enable_stats(self) -> HandlerStats:
+        """
+        Start collecting stats, keeping those collected so far.
+
+        Returns:
+            HandlerStats: The stats of the handler.
+        """
+        if self.stats is None:
+            self.stats = HandlerStats()
+        return self.stats
+
+    def disable_stats(self) -> None:
+        """
+        Stop collecting stats and forget those collected so far.
+        """
+        self.stats = None
+
+    def snapshot(self) -> HandlerSnapshot:
+        """
+        Take a snapshot of the stats of the handler.
+
+        Returns:
+            HandlerSnapshot: The snapshot.
+        """
+        return snapshot(self, self.stats, self._queued())
+
+    def _queued(self) -> int:
+        """
+        Get the number of records waiting in the handler's queue.
+
+        Returns:
+            int: The number of records.
+        """
+        return 0
+
+    def _wrapped(self) -> Iterable["BaseAsyncHandler"]:
+        """
+        Get the handlers this handler passes records to, for `AsyncLogger.stats`.
+
+        Returns:
+            Iterable[BaseAsyncHandler]: The wrapped handlers.
+        """
+        return ()
+
+    def _written(self, record: Record, message: str) -> None:
+        """
+        Count the bytes written for a record if stats are enabled.
+
+        Args:
+            record (Record): The log record.
+            message (str): What was written for it.
+        """
+        if self.stats is not None:
+            self.stats.written(record.level, encoded_size(message))
 
 
 class AsyncStreamHandler(BaseAsyncHandler):
     """
     Asynchronous handler for streaming log records.
+
+    For a regular text stream, formatted records are collected in memory and
+    written on the event loop's thread in one call per loop iteration, or as soon
+    as `buffer_size` characters are collected. Outside of asyncio, records are
+    written right away. An `AsyncFile` stream is written through its worker thread.
     """
 
     def __init__(
         self,
         formatter: Formatter = Formatter(),
         level: Level = Level.NOTSET,
-        stream: Optional[AsyncFile[str]] = None,
+        stream: Optional[TextIO | AsyncFile[str]] = None,
+        buffer_size: int = 64 * 1024,
+        colorize: Optional[bool] = None,
     ) -> None:
         """
         Initializes the AsyncStreamHandler.
@@ -78,10 +224,23 @@ class AsyncStreamHandler(BaseAsyncHandler):
         Args:
             formatter (Formatter): The formatter instance to format log records.
             level (Level): The logging level threshold for this handler.
-            stream (Optional[AsyncFile[str]]): The stream to write log records to.
+            stream (Optional[TextIO | AsyncFile[str]]): The stream to write log records to.
+                Defaults to `sys.stdout`.
+            buffer_size (int): Write as soon as this many characters are collected.
+            colorize (Optional[bool]): Whether to keep the colors of the formatter. Defaults
+                to `None`, which keeps them only if the stream is a terminal,
+                see `supports_color`.
         """
         super().__init__(formatter=formatter, level=level)
-        self.stream = stream or AsyncFile(sys.stdout)
+        self.stream = stream or sys.stdout
+        if colorize is None:
+            target = self.stream.wrapped if isinstance(self.stream, AsyncFile) else self.stream
+            colorize = supports_color(target)
+        self.colorize = colorize
+        self.buffer_size = buffer_size
+        self._buffer: list[str] = []
+        self._buffered = 0
+        self._scheduled = False
 
     async def emit(self, record: Record) -> None:
         """
@@ -90,14 +249,60 @@ class AsyncStreamHandler(BaseAsyncHandler):
         Args:
             record (Record): The log record to be emitted.
         """
-        message = self.formatter.format(record)
-        await self.stream.write(message)
-        await self.stream.flush()
+        message = render(self.formatter, record, self.colorize)
+        self._written(record, message)
+        if isinstance(self.stream, AsyncFile):
+            await self.stream.write(message)
+            await self.stream.flush()
+            return
+
+        self._buffer.append(message)
+        self._buffered += len(message)
+        if self._buffered >= self.buffer_size:
+            self._write_buffer()
+        elif not self._scheduled:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                self._write_buffer()
+                return
+            loop.call_soon(self._write_buffer)
+            self._scheduled = True
+
+    async def flush(self) -> None:
+        """
+        Write the collected log records and flush the stream.
+        """
+        await self._release()
+        if isinstance(self.stream, AsyncFile):
+            await self.stream.flush()
+        else:
+            self._write_buffer()
+
+    def _write_buffer(self) -> None:
+        """
+        Write the collected log records to the stream in one call.
+        """
+        self._scheduled = False
+        if not self._buffer:
+            return
+        text = "".join(self._buffer)
+        self._buffer.clear()
+        self._buffered = 0
+        stream: TextIO = self.stream  # type: ignore[assignment]
+        stream.write(text)
+        stream.flush()
 
 
 class AsyncFileHandler(BaseAsyncHandler):
     """
     Asynchronous handler for writing log records to a file.
+
+    The file is opened on the first record and kept open. Records emitted while
+    a write is in progress are gathered and written together in one call. The
+    file is flushed every `flush_every` records, when a write happens at least
+    `flush_interval` seconds after the last flush, on any record at or above
+    `flush_level`, and when the handler is flushed or closed.
     """
 
     def __init__(
@@ -105,6 +310,10 @@ class AsyncFileHandler(BaseAsyncHandler):
         file_name: str,
         level: Level = Level.NOTSET,
         formatter: Formatter = Formatter(colorize=False),
+        flush_every: int = 1,
+        flush_interval: Optional[float] = None,
+        flush_level: Level = Level.ERROR,
+        index: bool = False,
     ) -> None:
         """
         Initializes the AsyncFileHandler.
@@ -113,9 +322,25 @@ class AsyncFileHandler(BaseAsyncHandler):
             file_name (str): The name of the file to write log records to.
             level (Level): The logging level threshold for this handler.
             formatter (Formatter): The formatter instance to format log records.
+            flush_every (int): Flush after this many records. `0` disables count-based flushing.
+            flush_interval (Optional[float]): Flush when writing at least this many seconds
+                after the last flush.
+            flush_level (Level): Flush on any record at or above this level.
+            index (bool): Whether to maintain a sidecar time/level index
+                (`<file_name>.idx`) for `LogIndex` and `python -m tinylogging query`.
         """
         super().__init__(formatter=formatter, level=level)
         self.file_name = file_name
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.flush_level = flush_level
+        self.file: Optional[AsyncFile[str]] = None
+        self.indexer = IndexWriter(file_name) if index else None
+        self._buffer: list[tuple[Record, str]] = []
+        self._writing = False
+        self._pending = 0
+        self._flushed_at = time.monotonic()
+        self._lock = Lock()
 
     async def emit(self, record: Record) -> None:
         """
@@ -125,14 +350,174 @@ class AsyncFileHandler(BaseAsyncHandler):
             record (Record): The log record to be emitted.
         """
         message = self.formatter.format(record)
-        async with await open_file(self.file_name, "a") as f:
-            await f.write(message)
-            await f.flush()
+        self._buffer.append((record, message))
+        if self._writing:
+            return
+
+        self._writing = True
+        try:
+            while self._buffer:
+                batch, self._buffer = self._buffer, []
+                async with self._lock:
+                    await self._write(batch)
+        finally:
+            self._writing = False
+
+    async def flush(self) -> None:
+        """
+        Write the gathered log records and flush the file.
+        """
+        await self._release()
+        async with self._lock:
+            if self._buffer:
+                batch, self._buffer = self._buffer, []
+                await self._write(batch)
+            await self._flush()
+
+    async def aclose(self) -> None:
+        """
+        Flush the gathered log records and close the file.
+        """
+        await self.flush()
+        async with self._lock:
+            await self._close_file()
+
+    async def _write(self, batch: list[tuple[Record, str]]) -> None:
+        """
+        Write a batch of formatted log records and flush it if the flush policy says so.
+
+        Must be called with the handler's lock held.
+
+        Args:
+            batch (list[tuple[Record, str]]): The log records and their formatted messages.
+        """
+        if not batch:
+            return
+        if self.file is None:
+            self.file = await self._open()
+
+        await self.file.write("".join([message for _, message in batch]))
+        self._pending += len(batch)
+        if self.stats is not None:
+            for record, message in batch:
+                self._written(record, message)
+        if self.indexer is not None:
+            for record, message in batch:
+                self.indexer.add(record.time_ns, record.level, encoded_size(message))
+
+        if (
+            max(record.level for record, _ in batch) >= self.flush_level
+            or (self.flush_every and self._pending >= self.flush_every)
+            or (
+                self.flush_interval is not None
+                and time.monotonic() - self._flushed_at >= self.flush_interval
+            )
+        ):
+            await self._flush()
+
+    async def _open(self) -> AsyncFile[str]:
+        """
+        Open the log file for appending.
+
+        Returns:
+            AsyncFile[str]: The opened file.
+        """
+        file = await open_file(self.file_name, "a", encoding="utf-8")
+        if self.indexer is not None:
+            await to_thread.run_sync(self.indexer.open, self.formatter, await file.tell())
+        return file
+
+    async def _flush(self) -> None:
+        if self.file is not None and self._pending:
+            await self.file.flush()
+            if self.indexer is not None:
+                self.indexer.flush()
+        self._pending = 0
+        self._flushed_at = time.monotonic()
+
+    async def _close_file(self) -> None:
+        if self.file is not None:
+            await self.file.aclose()
+            self.file = None
+            if self.indexer is not None:
+                self.indexer.close()
+        self._pending = 0
+
+
+class AsyncRotatingFileHandler(AsyncFileHandler):
+    """
+    Asynchronous handler for writing log records to a file that rotates by size and/or time.
+
+    Rotated files are named `<file_name>.<YYYYmmdd-HHMMSS-ffffff>`. Compressing them and
+    removing those beyond `backup_count` happens on a background thread.
+    """
+
+    def __init__(
+        self,
+        file_name: str,
+        max_bytes: Optional[int] = None,
+        interval: Optional[timedelta] = None,
+        backup_count: int = 5,
+        compression: Optional[Compression] = None,
+        **kwargs: Any,
+    ) -> None:
+        """
+        Initializes the AsyncRotatingFileHandler.
+
+        Args:
+            file_name (str): The name of the file to write log records to.
+            max_bytes (Optional[int]): Rotate before the file would exceed this size.
+            interval (Optional[timedelta]): Rotate at multiples of this interval,
+                counted from local midnight.
+            backup_count (int): The number of rotated files to keep. `0` keeps all of them.
+            compression (Optional[Compression]): The compression for rotated files.
+            **kwargs: Additional keyword arguments for `AsyncFileHandler`.
+        """
+        super().__init__(file_name, **kwargs)
+        self.rotator = Rotator(file_name, max_bytes, interval, backup_count, compression)
+
+    async def rollover(self) -> None:
+        """
+        Rotate the file now.
+        """
+        async with self._lock:
+            await self._rollover(datetime.now())
+
+    async def _rollover(self, now: datetime) -> None:
+        await self._close_file()
+        await to_thread.run_sync(self.rotator.rollover, now)
+
+    async def _write(self, batch: list[tuple[Record, str]]) -> None:
+        start = 0
+        for index, (record, message) in enumerate(batch):
+            size = self.rotator.measure(message)
+            if self.file is not None and self.rotator.should_rollover(record.time_ns, size):
+                await super()._write(batch[start:index])
+                await self._rollover(record.time)
+                start = index
+            if self.file is None:
+                self.file = await self._open()
+            self.rotator.written(size)
+        await super()._write(batch[start:])
+
+    async def _open(self) -> AsyncFile[str]:
+        file = await super()._open()
+        await to_thread.run_sync(self.rotator.start, datetime.now())
+        return file
 
 
 class AsyncTelegramHandler(BaseAsyncHandler):
     """
     Asynchronous handler for sending log records to a Telegram chat.
+
+    Emitting a record only queues it; a background task owned by the handler sends
+    the queued messages through one long-lived HTTP client, so logging never waits
+    for Telegram. With a `batch_interval`, the task waits that long after the first
+    record of a batch while later records are queued; the batch is then joined into
+    as few messages as the Telegram length limit allows. When the API answers
+    `429 Too Many Requests`, the task waits for `retry_after` and sends the queued
+    messages afterwards. Messages that fail to send are dropped, counted in the
+    stats and printed to `sys.stderr`.
     """
 
     def __init__(
@@ -141,6 +526,8 @@ class AsyncTelegramHandler(BaseAsyncHandler):
         chat_id: int | str,
         message_thread_id: Optional[int] = None,
         ignore_errors: bool = False,
+        batch_interval: float = 0.0,
+        client: Optional[httpx.AsyncClient] = None,
         **kwargs: Any,
     ) -> None:
         """
@@ -151,6 +538,9 @@ class AsyncTelegramHandler(BaseAsyncHandler):
             chat_id (int | str): The chat ID to send log records to.
             message_thread_id (Optional[int]): The message thread ID (optional).
             ignore_errors (bool): Whether to ignore errors during sending.
+            batch_interval (float): Seconds to collect records before sending them together.
+                `0` sends each record right away.
+            client (Optional[httpx.AsyncClient]): The HTTP client to send messages with.
             **kwargs: Additional keyword arguments for the base handler.
         """
         super().__init__(**kwargs)
@@ -158,7 +548,13 @@ class AsyncTelegramHandler(BaseAsyncHandler):
         self.chat_id = chat_id
         self.message_thread_id = message_thread_id
         self.ignore_errors = ignore_errors
+        self.batch_interval = batch_interval
         self.api_url = f"https://api.telegram.org/bot{self.token}/sendMessage"
+        self.client = client
+        self._owns_client = client is None
+        self._pending: deque[str] = deque()
+        self._sender: Optional["asyncio.Task[None]"] = None
+        self._flush_requested: Optional[Event] = None
 
     async def emit(self, record: Record) -> None:
         """
@@ -167,10 +563,105 @@ class AsyncTelegramHandler(BaseAsyncHandler):
         Args:
             record (Record): The log record to be emitted.
         """
-        _colorize = self.formatter.colorize
-        self.formatter.colorize = False
-        text = self.formatter.format(record)
-        self.formatter.colorize = _colorize
+        text = render(self.formatter, record, colorize=False)
+        self._written(record, text)
+
+        self._pending.append(text)
+        if self._sender is None:
+            self._flush_requested = Event()
+            self._sender = asyncio.get_running_loop().create_task(self._run_sender())
+
+    async def flush(self) -> None:
+        """
+        Send all queued messages, waiting out rate limits if needed.
+        """
+        await self._release()
+        # Records emitted meanwhile may start another sender task.
+        while self._sender is not None:
+            sender = self._sender
+            if self._flush_requested is not None:
+                self._flush_requested.set()
+            # Unlike awaiting the task, `wait` does not cancel it if flush is cancelled.
+            await asyncio.wait({sender})
+
+    async def aclose(self) -> None:
+        """
+        Send all queued messages and close the HTTP client.
+        """
+        await self.flush()
+        if self._owns_client and self.client is not None:
+            await self.client.aclose()
+            self.client = None
+
+    def _queued(self) -> int:
+        return len(self._pending)
+
+    async def _run_sender(self) -> None:
+        """
+        Sender task that sends queued messages until the queue is empty.
+
+        Only one sender task runs at a time; records emitted meanwhile are queued
+        and picked up by it.
+        """
+        try:
+            if self.batch_interval > 0 and self._flush_requested is not None:
+                with move_on_after(self.batch_interval):
+                    await self._flush_requested.wait()
+
+            while self._pending:
+                messages = deque(coalesce_messages(self._pending))
+                self._pending.clear()
+                try:
+                    retry_after = await self._send_messages(messages)
+                finally:
+                    # Whatever was not sent goes back to the front of the queue.
+                    self._pending.extendleft(reversed(messages))
+                if retry_after is not None:
+                    await sleep(retry_after)
+        finally:
+            self._sender = None
+            self._flush_requested = None
+
+    async def _send_messages(self, messages: deque[str]) -> Optional[float]:
+        """
+        Send messages in order, removing each from `messages` once it is handled.
+
+        A message that fails to send is dropped, counted in the stats and printed
+        to `sys.stderr`.
+
+        Args:
+            messages (deque[str]): The messages to send.
+
+        Returns:
+            Optional[float]: Seconds to wait if the API is rate-limiting the bot. The
+                messages that were not sent are left in `messages`.
+        """
+        while messages:
+            try:
+                retry_after = await self._send(messages[0])
+            except Exception:
+                messages.popleft()
+                if self.stats is not None:
+                    self.stats.failed()
+                traceback.print_exc(file=sys.stderr)
+                continue
+            if retry_after is not None:
+                return retry_after
+            messages.popleft()
+        return None
+
+    async def _send(self, text: str) -> Optional[float]:
+        """
+        Send a message to the Telegram chat.
+
+        Args:
+            text (str): The message to send.
+
+        Returns:
+            Optional[float]: Seconds to wait if the API is rate-limiting the bot.
+        """
+        if self.client is None:
+            self.client = httpx.AsyncClient()
 
         data = {
             "chat_id": self.chat_id,
@@ -179,8 +670,86 @@ class AsyncTelegramHandler(BaseAsyncHandler):
             "parse_mode": "HTML",
         }
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(self.api_url, json=data)
+        response = await self.client.post(self.api_url, json=data)
 
+        retry_after = get_retry_after(response)
+        if retry_after is None:
             if not self.ignore_errors:
                 response.raise_for_status()
+            elif response.is_error and self.stats is not None:
+                self.stats.failed()
+        return retry_after
+
+
+class AsyncFingersCrossedHandler(BaseAsyncHandler):
+    """
+    Asynchronous handler that keeps recent records back and passes them on only when
+    an error occurs.
+
+    The last `capacity` records are kept unformatted in a ring buffer per logger, or
+    per asyncio task with `BufferScope.CONTEXT`. When a record at or above `trigger`
+    arrives, the buffered records of its scope and then the record itself are passed
+    to the wrapped handler, which formats them. Records are buffered again afterwards.
+    """
+
+    def __init__(
+        self,
+        handler: BaseAsyncHandler,
+        trigger: Level = Level.ERROR,
+        capacity: int = 1000,
+        scope: BufferScope = BufferScope.LOGGER,
+        level: Level = Level.NOTSET,
+    ) -> None:
+        """
+        Initializes the AsyncFingersCrossedHandler.
+
+        Args:
+            handler (BaseAsyncHandler): The handler to pass the records to.
+            trigger (Level): The level of records that flush the buffer.
+            capacity (int): The number of records kept per buffer.
+            scope (BufferScope): Which records share a buffer.
+            level (Level): The logging level threshold for this handler.
+        """
+        # Shares the formatter so that loggers capture the call site if it needs one.
+        super().__init__(formatter=handler.formatter, level=level)
+        self.handler = handler
+        self.trigger = trigger
+        self.buffers = RecordBuffers(capacity, scope)
+
+    async def emit(self, record: Record) -> None:
+        """
+        Buffer a log record, or pass the buffer and the record on if it is at or above `trigger`.
+
+        Args:
+            record (Record): The log record to be emitted.
+        """
+        if record.level < self.trigger:
+            self.buffers.append(record)
+            return
+        for buffered in self.buffers.drain(record):
+            await self.handler.handle(buffered)
+        await self.handler.handle(record)
+
+    def clear(self) -> None:
+        """
+        Discard the buffered records, e.g. after a request finished without errors.
+        """
+        self.buffers.clear()
+
+    async def flush(self) -> None:
+        """
+        Flush the wrapped handler. Buffered records are kept back.
+        """
+        await self._release()
+        await self.handler.flush()
+
+    async def aclose(self) -> None:
+        """
+        Close the wrapped handler. Buffered records are discarded.
+        """
+        await self._release()
+        self.buffers.clear()
+        await self.handler.aclose()
+
+    def _wrapped(self) -> Iterable[BaseAsyncHandler]:
+        return (self.handler,)
@@ -0,0 +1,327 @@
+import mmap
+import os
+from datetime import datetime
+from struct import Struct
+from typing import Iterator, Optional
+
+from tinylogging.formatter import Formatter
+from tinylogging.level import Level
+from tinylogging.record import Record, datetime_to_ns
+
+__all__ = ["BinaryEncoder", "BinaryDecoder", "BinaryLogReader", "MAGIC", "VERSION"]
+
+MAGIC = b"TLOG"
+"""Magic bytes at the start of every session of a binary log."""
+
+VERSION = 1
+"""Version of the binary log layout."""
+
+# Every entry starts with its length (not counting the length itself) and its type.
+_HEADER = Struct("<IB")
+_SESSION = Struct("<IB4sB")
+_NAME = Struct("<IBI")
+_SITE = Struct("<IBIIH")
+_RECORD = Struct("<IBBqII")
+
+_SESSION_ENTRY = 0
+_NAME_ENTRY = 1
+_SITE_ENTRY = 2
+_RECORD_ENTRY = 3
+
+_LEVELS = {level.value: level for level in Level}
+
+
+class BinaryEncoder:
+    """Encodes log records into the binary log layout.
+
+    A binary log is a sequence of length-prefixed entries. Each session starts with a
+    header entry; logger names and call sites are written once per session as
+    definition entries and records refer to them by ID:
+
+    - session: `u32 length, u8 type=0, b"TLOG", u8 version`
+    - name: `u32 length, u8 type=1, u32 id, utf-8 name`
+    - call site: `u32 length, u8 type=2, u32 id, u32 line, u16 filename length,
+      utf-8 filename, utf-8 function`
+    - record: `u32 length, u8 type=3, u8 level, i64 time_ns, u32 name id,
+      u32 call site id (0 if there is none), utf-8 message`
+
+    All integers are little-endian.
+    """
+
+    def __init__(self) -> None:
+        self._names: dict[str, int] = {}
+        self._sites: dict[tuple[str, int, str], int] = {}
+
+    def session(self) -> bytes:
+        """Starts a new session, forgetting all interned names and call sites.
+
+        Returns:
+            bytes: The session header entry.
+        """
+        self._names.clear()
+        self._sites.clear()
+        return _SESSION.pack(_SESSION.size - 4, _SESSION_ENTRY, MAGIC, VERSION)
+
+    def encode(self, record: Record) -> bytes:
+        """Encodes a log record, preceded by definitions of a new name or call site.
+
+        A new name or call site is only interned once the record is encoded, so a
+        record that fails to encode leaves the session as it was.
+
+        Args:
+            record (Record): The log record to encode.
+
+        Returns:
+            bytes: The encoded entries.
+        """
+        parts = []
+
+        name_id = self._names.get(record.name)
+        new_name = name_id is None
+        if name_id is None:
+            name_id = len(self._names) + 1
+            name = record.name.encode("utf-8", "backslashreplace")
+            parts.append(_NAME.pack(_NAME.size - 4 + len(name), _NAME_ENTRY, name_id))
+            parts.append(name)
+
+        site_id = 0
+        key = None
+        if record.filename:
+            site_id = self._sites.get((record.filename, record.line, record.function), 0)
+            if not site_id:
+                key = (record.filename, record.line, record.function)
+                site_id = len(self._sites) + 1
+                filename = record.filename.encode("utf-8", "backslashreplace")
+                function = record.function.encode("utf-8", "backslashreplace")
+                parts.append(
+                    _SITE.pack(
+                        _SITE.size - 4 + len(filename) + len(function),
+                        _SITE_ENTRY,
+                        site_id,
+                        record.line,
+                        len(filename),
+                    )
+                )
+                parts.append(filename)
+                parts.append(function)
+
+        message = record.message.encode("utf-8", "backslashreplace")
+        parts.append(
+            _RECORD.pack(
+                _RECORD.size - 4 + len(message),
+                _RECORD_ENTRY,
+                record.level,
+                record.time_ns,
+                name_id,
+                site_id,
+            )
+        )
+        parts.append(message)
+        encoded = b"".join(parts)
+
+        if new_name:
+            self._names[record.name] = name_id
+        if key is not None:
+            self._sites[key] = site_id
+        return encoded
+
+
+class BinaryDecoder:
+    """Decodes entries of the binary log layout, keeping the interned names and call sites.
+
+    Use `feed` to decode a stream arriving in arbitrary chunks, e.g. from a socket.
+    """
+
+    def __init__(self) -> None:
+        self.names: dict[int, str] = {}
+        self.sites: dict[int, tuple[str, int, str]] = {0: ("", 0, "")}
+        self._buffer = bytearray()
+
+    def feed(self, data: bytes) -> list[Record]:
+        """Decodes the complete entries of a chunk, keeping an incomplete one for later.
+
+        Args:
+            data (bytes): The next chunk of the stream.
+
+        Returns:
+            list[Record]: The log records completed by the chunk.
+        """
+        buffer = self._buffer
+        buffer += data
+        view = memoryview(buffer)
+        records = []
+        pos = 0
+        try:
+            while pos + _HEADER.size <= len(view):
+                length, kind = _HEADER.unpack_from(view, pos)
+                entry_end = pos + 4 + length
+                if entry_end > len(view):
+                    break
+                if kind == _RECORD_ENTRY:
+                    records.append(self.record(view, pos, entry_end))
+                else:
+                    self.define(kind, view, pos, entry_end)
+                pos = entry_end
+        finally:
+            view.release()
+        del buffer[:pos]
+        return records
+
+    def define(self, kind: int, view: memoryview, pos: int, end: int) -> None:
+        """Applies a session, name or call-site entry.
+
+        Args:
+            kind (int): The type of the entry.
+            view (memoryview): The buffer holding the entry.
+            pos (int): The offset of the entry.
+            end (int): The offset just past the entry.
+        """
+        if kind == _NAME_ENTRY:
+            _, _, name_id = _NAME.unpack_from(view, pos)
+            self.names[name_id] = str(view[pos + _NAME.size : end], "utf-8")
+        elif kind == _SITE_ENTRY:
+            _, _, site_id, line, filename_size = _SITE.unpack_from(view, pos)
+            function_start = pos + _SITE.size + filename_size
+            self.sites[site_id] = (
+                str(view[pos + _SITE.size : function_start], "utf-8"),
+                line,
+                str(view[function_start:end], "utf-8"),
+            )
+        elif kind == _SESSION_ENTRY:
+            if view[pos + _HEADER.size : pos + _HEADER.size + len(MAGIC)] != MAGIC:
+                raise ValueError("Not a tinylogging binary log")
+            self.names.clear()
+            self.sites = {0: ("", 0, "")}
+
+    def record(self, view: memoryview, pos: int, end: int) -> Record:
+        """Decodes a record entry.
+
+        Args:
+            view (memoryview): The buffer holding the entry.
+            pos (int): The offset of the entry.
+            end (int): The offset just past the entry.
+
+        Returns:
+            Record: The log record.
+        """
+        _, _, level, time_ns, name_id, site_id = _RECORD.unpack_from(view, pos)
+        filename, line, function = self.sites[site_id]
+        return Record.from_fields(
+            str(view[pos + _RECORD.size : end], "utf-8"),
+            _LEVELS.get(level, Level.NOTSET),
+            self.names[name_id],
+            time_ns,
+            filename,
+            line,
+            function,
+        )
+
+
+class BinaryLogReader:
+    """Reads a binary log written by `BinaryFileHandler` through a memory map.
+
+    Entries are parsed in place; a message is only decoded once its record passes
+    the level and time filters. The file is read as it was when the reader was
+    opened, and a partially written entry at the end is ignored.
+
+    Args:
+        file_name (str): Name of the binary log file.
+
+    Raises:
+        ValueError: If the file is not a binary log.
+    """
+
+    def __init__(self, file_name: str) -> None:
+        self.file_name = file_name
+        self._mmap: Optional[mmap.mmap] = None
+        self._view = memoryview(b"")
+        with open(file_name, "rb") as file:
+            if os.fstat(file.fileno()).st_size:
+                self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+                self._view = memoryview(self._mmap)
+        if self._view and self._view[_HEADER.size : _HEADER.size + len(MAGIC)] != MAGIC:
+            self.close()
+            raise ValueError(f"{file_name} is not a tinylogging binary log")
+
+    def __enter__(self) -> "BinaryLogReader":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def __iter__(self) -> Iterator[Record]:
+        return self.records()
+
+    def close(self) -> None:
+        """Unmaps the file. Records already read stay valid."""
+        self._view.release()
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def records(
+        self,
+        level: Optional[Level] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> Iterator[Record]:
+        """Iterates over the log records in the file.
+
+        Args:
+            level (Optional[Level]): Only yield records at or above this level.
+            start (Optional[datetime]): Only yield records created at or after this time.
+            end (Optional[datetime]): Only yield records created before this time.
+
+        Yields:
+            Record: The log records in the order they were written.
+        """
+        min_level = 0 if level is None else int(level)
+        start_ns = None if start is None else datetime_to_ns(start)
+        end_ns = None if end is None else datetime_to_ns(end)
+
+        view = self._view
+        size = len(view)
+        header = _HEADER.unpack_from
+        record_fields = _RECORD.unpack_from
+        decoder = BinaryDecoder()
+
+        pos = 0
+        while pos + _HEADER.size <= size:
+            length, kind = header(view, pos)
+            entry_end = pos + 4 + length
+            if entry_end > size:
+                break
+
+            if kind == _RECORD_ENTRY:
+                _, _, level_value, time_ns, _, _ = record_fields(view, pos)
+                if (
+                    level_value >= min_level
+                    and (start_ns is None or time_ns >= start_ns)
+                    and (end_ns is None or time_ns < end_ns)
+                ):
+                    yield decoder.record(view, pos, entry_end)
+            else:
+                decoder.define(kind, view, pos, entry_end)
+
+            pos = entry_end
+
+    def lines(
+        self,
+        formatter: Formatter,
+        level: Optional[Level] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> Iterator[str]:
+        """Iterates over the log records in the file rendered by a formatter.
+
+        Args:
+            formatter (Formatter): The formatter to render the records with.
+            level (Optional[Level]): Only yield records at or above this level.
+            start (Optional[datetime]): Only yield records created at or after this time.
+            end (Optional[datetime]): Only yield records created before this time.
+
+        Yields:
+            str: The formatted log records.
+        """
+        for record in self.records(level, start, end):
+            yield formatter.format(record)
@@ -0,0 +1,153 @@
+import asyncio
+import threading
+from contextvars import ContextVar
+from enum import Enum, auto
+from typing import Any, Optional
+
+from tinylogging.record import Record
+
+__all__ = ["BufferScope", "RingBuffer", "RecordBuffers"]
+
+
+class BufferScope(Enum):
+    """Enumeration for which records share a buffer of a fingers-crossed handler.
+
+    Attributes:
+        LOGGER: One buffer per logger name.
+        CONTEXT: One buffer per thread or asyncio task.
+    """
+
+    LOGGER = auto()
+    CONTEXT = auto()
+
+
+class RingBuffer:
+    """Fixed-size ring of the most recent records, allocated once.
+
+    Args:
+        capacity (int): The number of records kept. Older records are overwritten.
+        generation (int): The generation of `RecordBuffers` the ring belongs to.
+        owner (Any): The thread or task the ring belongs to.
+    """
+
+    __slots__ = ("records", "end", "size", "generation", "owner")
+
+    def __init__(self, capacity: int, generation: int = 0, owner: Any = None) -> None:
+        self.records: list[Optional[Record]] = [None] * capacity
+        self.end = 0
+        self.size = 0
+        self.generation = generation
+        self.owner = owner
+
+    def __len__(self) -> int:
+        return self.size
+
+    def append(self, record: Record) -> None:
+        """Adds a record, overwriting the oldest one if the ring is full.
+
+        Args:
+            record (Record): The log record.
+        """
+        records = self.records
+        records[self.end] = record
+        self.end += 1
+        if self.end == len(records):
+            self.end = 0
+        if self.size < len(records):
+            self.size += 1
+
+    def drain(self) -> list[Record]:
+        """Removes and returns the buffered records.
+
+        Returns:
+            list[Record]: The records, oldest first.
+        """
+        records = self.records
+        start = self.end - self.size
+        if start >= 0:
+            drained = records[start : self.end]
+        else:
+            drained = records[start:] + records[: self.end]
+        self.records = [None] * len(records)
+        self.end = self.size = 0
+        return drained  # type: ignore[return-value]
+
+
+def _current_task() -> Optional["asyncio.Task[Any]"]:
+    try:
+        return asyncio.current_task()
+    except RuntimeError:
+        return None
+
+
+class RecordBuffers:
+    """The ring buffers of a fingers-crossed handler, one per `BufferScope`.
+
+    Args:
+        capacity (int): The number of records kept per buffer.
+        scope (BufferScope): Which records share a buffer.
+    """
+
+    def __init__(self, capacity: int, scope: BufferScope) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self.scope = scope
+        self._generation = 0
+        self._by_name: dict[str, RingBuffer] = {}
+        self._context: ContextVar[Optional[RingBuffer]] = ContextVar(
+            f"tinylogging-buffer-{id(self)}", default=None
+        )
+        self._lock = threading.Lock()
+
+    def append(self, record: Record) -> None:
+        """Buffers a record.
+
+        Args:
+            record (Record): The log record.
+        """
+        if self.scope is BufferScope.CONTEXT:
+            self._ring().append(record)
+            return
+        with self._lock:
+            ring = self._by_name.get(record.name)
+            if ring is None:
+                ring = self._by_name[record.name] = RingBuffer(self.capacity)
+            ring.append(record)
+
+    def drain(self, record: Record) -> list[Record]:
+        """Removes and returns the records buffered in the scope of a record.
+
+        Args:
+            record (Record): The log record whose scope to drain.
+
+        Returns:
+            list[Record]: The buffered records, oldest first.
+        """
+        if self.scope is BufferScope.CONTEXT:
+            return self._ring().drain()
+        with self._lock:
+            ring = self._by_name.get(record.name)
+            return ring.drain() if ring is not None else []
+
+    def clear(self) -> None:
+        """Discards the records of all buffers."""
+        with self._lock:
+            self._by_name.clear()
+            self._generation += 1
+
+    def _ring(self) -> RingBuffer:
+        """Gets the ring of the current thread or asyncio task, creating it if needed.
+
+        Threads start with an empty context, but asyncio tasks inherit the ring of
+        the task that created them, so the owner is checked too.
+
+        Returns:
+            RingBuffer: The ring.
+        """
+        ring = self._context.get()
+        owner = _current_task()
+        if ring is None or ring.owner is not owner or ring.generation != self._generation:
+            ring = RingBuffer(self.capacity, self._generation, owner)
+            self._context.set(ring)
+        return ring
@@ -0,0 +1,141 @@
+import os
+from collections import OrderedDict
+from threading import Lock
+from types import CodeType
+from typing import NamedTuple
+
+__all__ = ["CallSite", "CallSiteCache", "CallSiteCacheInfo"]
+
+
+class CallSite(NamedTuple):
+    """Resolved metadata of a call site.
+
+    Attributes:
+        filename (str): The name of the file of the call site.
+        relpath (str): The path of the file relative to `cwd`.
+        basename (str): The base name of the file.
+        function (str): The function name of the call site.
+        cwd (str): The working directory `relpath` was resolved against.
+    """
+
+    filename: str
+    relpath: str
+    basename: str
+    function: str
+    cwd: str
+
+
+class CallSiteCacheInfo(NamedTuple):
+    """Statistics of a `CallSiteCache`.
+
+    Attributes:
+        hits (int): The number of lookups answered from the cache.
+        misses (int): The number of lookups that resolved a new call site.
+        maxsize (int): The maximum number of cached call sites.
+        currsize (int): The current number of cached call sites.
+    """
+
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class CallSiteCache:
+    """Bounded LRU cache of call-site metadata keyed by code object and line.
+
+    The cache is cleared when the working directory is found to have changed
+    while resolving a relative path.
+
+    Args:
+        maxsize (int): The maximum number of cached call sites. `0` disables caching.
+    """
+
+    def __init__(self, maxsize: int = 1024) -> None:
+        self._sites: OrderedDict[tuple[CodeType, int], CallSite] = OrderedDict()
+        self._lock = Lock()
+        self._maxsize = maxsize
+        self._cwd = os.getcwd()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def maxsize(self) -> int:
+        """The maximum number of cached call sites."""
+        return self._maxsize
+
+    @maxsize.setter
+    def maxsize(self, maxsize: int) -> None:
+        with self._lock:
+            self._maxsize = maxsize
+            while len(self._sites) > maxsize:
+                self._sites.popitem(last=False)
+
+    def lookup(self, code: CodeType, line: int) -> CallSite:
+        """Gets the metadata of a call site, resolving it on a miss.
+
+        Args:
+            code (CodeType): The code object of the call site.
+            line (int): The line number of the call site.
+
+        Returns:
+            CallSite: The resolved call site.
+        """
+        key = (code, line)
+        site = self._sites.get(key)
+        if site is not None:
+            self.hits += 1
+            try:
+                self._sites.move_to_end(key)
+            except KeyError:
+                pass
+            return site
+
+        self.misses += 1
+        filename = code.co_filename
+        cwd = self._cwd
+        site = CallSite(
+            filename=filename,
+            relpath=os.path.relpath(filename, cwd),
+            basename=os.path.basename(filename),
+            function=code.co_name,
+            cwd=cwd,
+        )
+        if self._maxsize > 0:
+            with self._lock:
+                self._sites[key] = site
+                while len(self._sites) > self._maxsize:
+                    self._sites.popitem(last=False)
+        return site
+
+    def relpath(self, site: CallSite) -> str:
+        """Gets the relative path of a call site for the current working directory.
+
+        Clears the cache if the working directory has changed.
+
+        Args:
+            site (CallSite): The call site.
+
+        Returns:
+            str: The relative path of the call site's file.
+        """
+        cwd = os.getcwd()
+        if cwd != self._cwd:
+            self.clear()
+            self._cwd = cwd
+        if site.cwd == cwd:
+            return site.relpath
+        return os.path.relpath(site.filename, cwd)
+
+    def clear(self) -> None:
+        """Removes all cached call sites."""
+        with self._lock:
+            self._sites.clear()
+
+    def cache_info(self) -> CallSiteCacheInfo:
+        """Gets the statistics of the cache.
+
+        Returns:
+            CallSiteCacheInfo: The hit and miss counters and the cache size.
+        """
+        return CallSiteCacheInfo(self.hits, self.misses, self._maxsize, len(self._sites))
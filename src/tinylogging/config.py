@@ -0,0 +1,75 @@
+from typing import Any, Generic, Iterable, TypeVar
+
+__all__ = ["HandlerSet", "invalidate"]
+
+_T = TypeVar("_T")
+
+generation = 0
+"""Counter bumped whenever a level or a set of handlers changes anywhere."""
+
+
+def invalidate() -> None:
+    """Marks every cached effective level as stale."""
+    global generation
+    generation += 1
+
+
+class HandlerSet(set, Generic[_T]):  # type: ignore[type-arg]
+    """A set of handlers that invalidates cached effective levels when it changes."""
+
+    def add(self, element: _T) -> None:
+        super().add(element)
+        invalidate()
+
+    def discard(self, element: _T) -> None:
+        super().discard(element)
+        invalidate()
+
+    def remove(self, element: _T) -> None:
+        super().remove(element)
+        invalidate()
+
+    def pop(self) -> _T:
+        element = super().pop()
+        invalidate()
+        return element
+
+    def clear(self) -> None:
+        super().clear()
+        invalidate()
+
+    def update(self, *others: Iterable[_T]) -> None:
+        super().update(*others)
+        invalidate()
+
+    def difference_update(self, *others: Iterable[Any]) -> None:
+        super().difference_update(*others)
+        invalidate()
+
+    def intersection_update(self, *others: Iterable[Any]) -> None:
+        super().intersection_update(*others)
+        invalidate()
+
+    def symmetric_difference_update(self, other: Iterable[_T]) -> None:
+        super().symmetric_difference_update(other)
+        invalidate()
+
+    def __ior__(self, other: Any) -> "HandlerSet[_T]":
+        super().__ior__(other)
+        invalidate()
+        return self
+
+    def __iand__(self, other: Any) -> "HandlerSet[_T]":
+        super().__iand__(other)
+        invalidate()
+        return self
+
+    def __isub__(self, other: Any) -> "HandlerSet[_T]":
+        super().__isub__(other)
+        invalidate()
+        return self
+
+    def __ixor__(self, other: Any) -> "HandlerSet[_T]":
+        super().__ixor__(other)
+        invalidate()
+        return self
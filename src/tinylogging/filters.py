@@ -0,0 +1,238 @@
+import heapq
+import random
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, Hashable, Mapping, Optional
+
+from tinylogging.level import Level
+from tinylogging.record import Record
+
+__all__ = ["BaseFilter", "SamplingFilter", "RateLimitFilter", "DedupFilter", "callsite_key"]
+
+_NEVER = 2**63 - 1
+
+
+def callsite_key(record: Record) -> tuple[str, str, int]:
+    """Gets a cheap key identifying the call site of a record.
+
+    The key is the logger name, file name and line. Without a captured call site
+    all records of a logger share one key.
+
+    Args:
+        record (Record): The log record.
+
+    Returns:
+        tuple[str, str, int]: The key.
+    """
+    return (record.name, record.filename, record.line)
+
+
+def _with_message(record: Record, message: str) -> Record:
+    """Copies a record with another message, leaving the original untouched.
+
+    Args:
+        record (Record): The log record.
+        message (str): The new message.
+
+    Returns:
+        Record: The copy.
+    """
+    copy = Record.from_fields(
+        message,
+        record.level,
+        record.name,
+        record.time_ns,
+        record.filename,
+        record.line,
+        record.function,
+    )
+    copy._callsite = record._callsite
+    return copy
+
+
+class BaseFilter(ABC):
+    """Abstract base class for filters.
+
+    Filters run on the `filters` of a logger after the record is created, and on the
+    `filters` of a handler after its level check, in both cases before the record is
+    formatted.
+
+    Attributes:
+        uses_caller (bool): Whether the filter needs the call site, so loggers with
+            `CallerCapture.LAZY` capture it.
+        dropped (int): The number of records the filter dropped.
+        due_ns (int): When records held back by the filter are due, in nanoseconds
+            since the epoch. See `release`.
+    """
+
+    uses_caller = False
+
+    def __init__(self) -> None:
+        self.dropped = 0
+        self.due_ns = _NEVER
+
+    @abstractmethod
+    def filter(self, record: Record) -> Optional[Record]:
+        """Decides whether a record is logged.
+
+        Args:
+            record (Record): The log record.
+
+        Returns:
+            Optional[Record]: The record to log, which may be a modified copy,
+                or `None` to drop it.
+        """
+        raise NotImplementedError
+
+    def release(self, now_ns: Optional[int] = None) -> list[Record]:
+        """Takes the records held back by the filter that are due.
+
+        Loggers and handlers call this before filtering a record created at or after
+        `due_ns`, and handlers also call it when they are flushed or closed.
+
+        Args:
+            now_ns (Optional[int]): The time of the record being filtered, or `None`
+                to take all held back records.
+
+        Returns:
+            list[Record]: The records to log, which skip the filters.
+        """
+        return []
+
+
+class SamplingFilter(BaseFilter):
+    """Filter that keeps only a random fraction of the records of some levels.
+
+    Args:
+        rates (Mapping[Level, float]): The fraction of records to keep per level,
+            e.g. `{Level.DEBUG: 0.01}`. Levels that are not listed are always kept.
+        seed (Optional[int]): Seed for the random number generator.
+    """
+
+    def __init__(self, rates: Mapping[Level, float], seed: Optional[int] = None) -> None:
+        super().__init__()
+        self.rates = dict(rates)
+        self._random = random.Random(seed).random
+
+    def filter(self, record: Record) -> Optional[Record]:
+        rate = self.rates.get(record.level)
+        if rate is None or self._random() < rate:
+            return record
+        self.dropped += 1
+        return None
+
+
+class RateLimitFilter(BaseFilter):
+    """Filter that limits how often each call site logs, with a token bucket per call site.
+
+    Each call site may log `burst` records at once and then `rate` records per second.
+    Time is taken from the records, so no clock is read.
+
+    Args:
+        rate (float): The number of records per second a call site may log.
+        burst (int): The number of records a call site may log at once.
+        maxsize (int): The maximum number of tracked call sites. The least recently
+            added one is forgotten first.
+    """
+
+    uses_caller = True
+
+    def __init__(self, rate: float, burst: int = 10, maxsize: int = 10_000) -> None:
+        super().__init__()
+        self.rate = rate
+        self.burst = burst
+        self.maxsize = maxsize
+        self._buckets: dict[Hashable, list[float]] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: Record) -> Optional[Record]:
+        key = callsite_key(record)
+        now = record.time_ns / 1e9
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                if len(self._buckets) >= self.maxsize:
+                    del self._buckets[next(iter(self._buckets))]
+                bucket = self._buckets[key] = [float(self.burst), now]
+            else:
+                tokens = bucket[0] + (now - bucket[1]) * self.rate
+                bucket[0] = min(tokens, float(self.burst))
+                bucket[1] = now
+
+            if bucket[0] >= 1:
+                bucket[0] -= 1
+                return record
+            self.dropped += 1
+            return None
+
+
+class DedupFilter(BaseFilter):
+    """Filter that collapses repeated identical messages from one call site.
+
+    The first occurrence of a message is logged. Repeats within `interval` seconds are
+    dropped and counted. Once the interval is over, the last dropped repeat is logged
+    with ` (repeated N times)` appended, N being the number of dropped repeats, as soon
+    as the next record from any call site reaches the filter or its handler is flushed
+    or closed.
+
+    Args:
+        interval (float): The number of seconds repeats are collapsed for.
+        maxsize (int): The maximum number of tracked messages. The least recently
+            added one is forgotten first.
+    """
+
+    uses_caller = True
+
+    def __init__(self, interval: float = 10.0, maxsize: int = 10_000) -> None:
+        super().__init__()
+        self.interval = interval
+        self.maxsize = maxsize
+        self._seen: dict[Hashable, list[Any]] = {}
+        # Heap of the ends of the intervals with dropped repeats.
+        self._due: list[tuple[int, Hashable]] = []
+        self._lock = threading.Lock()
+
+    def filter(self, record: Record) -> Optional[Record]:
+        key = (record.name, record.filename, record.line, record.level, record.message)
+        now = record.time_ns
+        with self._lock:
+            seen = self._seen.get(key)
+            if seen is None:
+                if len(self._seen) >= self.maxsize:
+                    del self._seen[next(iter(self._seen))]
+                self._seen[key] = [now, 0, record]
+                return record
+
+            due_ns = seen[0] + int(self.interval * 1e9)
+            if now < due_ns:
+                if not seen[1]:
+                    heapq.heappush(self._due, (due_ns, key))
+                    self.due_ns = self._due[0][0]
+                seen[1] += 1
+                seen[2] = record
+                self.dropped += 1
+                return None
+
+            repeated = seen[1]
+            seen[0], seen[1], seen[2] = now, 0, record
+
+        if not repeated:
+            return record
+        return _with_message(record, f"{record.message} (repeated {repeated} times)")
+
+    def release(self, now_ns: Optional[int] = None) -> list[Record]:
+        released = []
+        with self._lock:
+            due = self._due
+            while due and (now_ns is None or due[0][0] <= now_ns):
+                due_ns, key = heapq.heappop(due)
+                seen = self._seen.get(key)
+                # Skip repeats already summarized, forgotten, or of an earlier interval.
+                if seen is None or not seen[1] or seen[0] + int(self.interval * 1e9) != due_ns:
+                    continue
+                released.append(
+                    _with_message(seen[2], f"{seen[2].message} (repeated {seen[1]} times)")
+                )
+                seen[1] = 0
+            self.due_ns = due[0][0] if due else _NEVER
+        return released
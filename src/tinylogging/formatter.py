@@ -1,15 +1,181 @@
+import os
+from contextvars import ContextVar
+from datetime import datetime
+from enum import Enum
+from string import Formatter as _TemplateParser
+from typing import Any, Callable, Mapping, Optional
+
 from colorama import Fore, Style
 
 from tinylogging.level import Level
 from tinylogging.record import Record
 
-__all__ = ["Formatter"]
+__all__ = ["Formatter", "TimeFormat", "render", "supports_color"]
+
+CALLER_FIELDS = frozenset({"filename", "line", "function", "relpath", "basename"})
+"""Template fields that need the call site of a record."""
+
+_CONVERSIONS: dict[str, Callable[[Any], str]] = {"s": str, "r": repr, "a": ascii}
+
+_Renderer = Callable[[Record], str]
+
+_LEVEL_NAMES = {level: level.name for level in Level}
+
+_RESET = Style.RESET_ALL + "\n"
+
+_plain: ContextVar[bool] = ContextVar("tinylogging-plain", default=False)
+"""Set by `render` while a `Formatter` subclass formats a record that must not be colored."""
+
+
+def render(formatter: "Formatter", record: Record, colorize: bool) -> str:
+    """Formats a log record, leaving out colors without changing the formatter.
+
+    Subclasses that override `Formatter.format` are called as they are; colors are
+    left out of what `Formatter.format` renders for them.
+
+    Args:
+        formatter (Formatter): The formatter.
+        record (Record): The log record to format.
+        colorize (bool): Whether colors may be written.
+
+    Returns:
+        str: The formatted log message.
+    """
+    if type(formatter).format is Formatter.format:
+        return formatter.format(record, colorize and formatter.colorize)
+    if colorize:
+        return formatter.format(record)
+    token = _plain.set(True)
+    try:
+        return formatter.format(record)
+    finally:
+        _plain.reset(token)
+
+
+def supports_color(stream: Any) -> bool:
+    """Checks whether colors written to a stream are likely to be rendered.
+
+    The `NO_COLOR` and `FORCE_COLOR` environment variables take precedence;
+    otherwise the stream must be a terminal.
+
+    Args:
+        stream (Any): The stream, e.g. `sys.stdout`.
+
+    Returns:
+        bool: Whether to write colors to the stream.
+    """
+    if os.environ.get("NO_COLOR"):
+        return False
+    if os.environ.get("FORCE_COLOR"):
+        return True
+    isatty = getattr(stream, "isatty", None)
+    try:
+        return bool(isatty and isatty())
+    except (OSError, ValueError):
+        return False
+
+
+class _ColorMap(dict):  # type: ignore[type-arg]
+    """A mapping of color codes that tells its formatter when it changes."""
+
+    def __init__(self, colors: Mapping[Level, str], changed: Callable[[], None]) -> None:
+        super().__init__(colors)
+        self._changed = changed
+
+    def __setitem__(self, level: Level, color: str) -> None:
+        super().__setitem__(level, color)
+        self._changed()
+
+    def __delitem__(self, level: Level) -> None:
+        super().__delitem__(level)
+        self._changed()
+
+    def __ior__(self, other: Any) -> "_ColorMap":
+        super().__ior__(other)
+        self._changed()
+        return self
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        super().update(*args, **kwargs)
+        self._changed()
+
+    def setdefault(self, level: Level, color: str = "") -> str:
+        color = super().setdefault(level, color)
+        self._changed()
+        return color
+
+    def pop(self, level: Level, *default: Any) -> Any:
+        color = super().pop(level, *default)
+        self._changed()
+        return color
+
+    def popitem(self) -> tuple[Level, str]:
+        item = super().popitem()
+        self._changed()
+        return item
+
+    def clear(self) -> None:
+        super().clear()
+        self._changed()
+
+
+class TimeFormat(str, Enum):
+    """Special time formats that are rendered without `strftime`.
+
+    Attributes:
+        ISO: ISO-8601 with milliseconds, e.g. `2025-01-25T14:02:03.123`.
+        EPOCH: Seconds since the epoch with microseconds, e.g. `1737813723.123456`.
+        EPOCH_MS: Milliseconds since the epoch, e.g. `1737813723123`.
+    """
+
+    ISO = "iso"
+    EPOCH = "epoch"
+    EPOCH_MS = "epoch_ms"
+
+
+def _split_subsecond(time_format: str) -> list[str]:
+    """Splits a `strftime` format on its `%f` directives.
+
+    Args:
+        time_format (str): The `strftime` format.
+
+    Returns:
+        list[str]: The segments between `%f` directives.
+    """
+    segments: list[str] = []
+    start = index = 0
+    while index < len(time_format) - 1:
+        if time_format[index] != "%":
+            index += 1
+        elif time_format[index + 1] == "f":
+            segments.append(time_format[start:index])
+            start = index = index + 2
+        else:
+            index += 2
+    segments.append(time_format[start:])
+    return segments
+
+
+def _missing_field(name: str) -> Callable[[Record], Any]:
+    """Builds the getter of a template field the formatter does not know.
+
+    Args:
+        name (str): The name of the field.
+
+    Returns:
+        Callable[[Record], Any]: A getter raising `KeyError`, like `str.format_map`.
+    """
+
+    def getter(record: Record) -> Any:
+        raise KeyError(name)
+
+    return getter
 
 
 class Formatter:
     def __init__(
         self,
-        time_format: str = "[%H:%M:%S]",
+        time_format: str | TimeFormat = "[%H:%M:%S]",
         template: str = "{time} | {level} | {relpath}:{line} | {message}",
         colorize: bool = True,
     ) -> None:
@@ -17,14 +183,15 @@ class Formatter:
         Initializes the Formatter instance.
 
         Args:
-            time_format (str): The format for the timestamp in log messages.
+            time_format (str | TimeFormat): The `strftime` format for the timestamp in log
+                messages, or a `TimeFormat` to skip `strftime` entirely.
             template (str): The template for formatting log messages.
             colorize (bool): Whether to colorize the log messages.
         """
         self.template = template
-        self.time_format = time_format
+        self.time_format = time_format  # type: ignore[assignment]
         self.colorize = colorize
-        self.color_map: dict[Level, str] = {
+        self.color_map = {
             Level.TRACE: Fore.WHITE + Style.DIM,
             Level.DEBUG: Fore.CYAN,
             Level.INFO: Fore.BLUE,
@@ -43,22 +210,184 @@ class Formatter:
             Level.CRITICAL: "💥",
         }
 
-    def format(self, record: Record) -> str:
+    @property
+    def color_map(self) -> dict[Level, str]:
+        """The color codes per level."""
+        return self._color_map
+
+    @color_map.setter
+    def color_map(self, color_map: Mapping[Level, str]) -> None:
+        self._color_map = _ColorMap(color_map, self._build_colors)
+        self._build_colors()
+
+    def _build_colors(self) -> None:
+        """
+        Builds the color code put before the log messages of each level.
+        """
+        # Indexed by level; cheaper than a dict lookup for every record.
+        colors = {int(level): color for level, color in self._color_map.items()}
+        self._prefixes = [colors.get(level, "") for level in range(max(Level) + 1)]
+
+    @property
+    def time_format(self) -> str:
+        """The format for the timestamp in log messages."""
+        return self._time_format
+
+    @time_format.setter
+    def time_format(self, time_format: str | TimeFormat) -> None:
+        self._time_format = time_format
+        self._time_segments = _split_subsecond(time_format)
+        self._time_cache: tuple[Optional[int], list[str]] = (None, [])
+
+        if time_format == TimeFormat.ISO:
+            self._render_time = self._render_time_iso
+        elif time_format == TimeFormat.EPOCH:
+            self._render_time = self._render_time_epoch
+        elif time_format == TimeFormat.EPOCH_MS:
+            self._render_time = self._render_time_epoch_ms
+        else:
+            self._render_time = self._render_time_cached
+
+    def _render_time_cached(self, time_ns: int) -> str:
+        """
+        Renders a timestamp with `strftime`, once per second.
+
+        The segments around `%f` are rendered once per second and reused;
+        only the microseconds are spliced in for every record.
+
+        Args:
+            time_ns (int): The timestamp to render, in nanoseconds since the epoch.
+
+        Returns:
+            str: The rendered timestamp.
+        """
+        second, nanoseconds = divmod(time_ns, 1_000_000_000)
+        cached_second, pieces = self._time_cache
+        if second != cached_second:
+            time = datetime.fromtimestamp(second)
+            pieces = [time.strftime(segment) for segment in self._time_segments]
+            self._time_cache = (second, pieces)
+
+        if len(pieces) == 1:
+            return pieces[0]
+        return f"{nanoseconds // 1000:06d}".join(pieces)
+
+    def _render_time_iso(self, time_ns: int) -> str:
+        second, nanoseconds = divmod(time_ns, 1_000_000_000)
+        cached_second, pieces = self._time_cache
+        if second != cached_second:
+            pieces = [datetime.fromtimestamp(second).strftime("%Y-%m-%dT%H:%M:%S.")]
+            self._time_cache = (second, pieces)
+        return f"{pieces[0]}{nanoseconds // 1_000_000:03d}"
+
+    def _render_time_epoch(self, time_ns: int) -> str:
+        second, nanoseconds = divmod(time_ns, 1_000_000_000)
+        return f"{second}.{nanoseconds // 1000:06d}"
+
+    def _render_time_epoch_ms(self, time_ns: int) -> str:
+        return str(time_ns // 1_000_000)
+
+    @property
+    def template(self) -> str:
+        """The template for formatting log messages."""
+        return self._template
+
+    @template.setter
+    def template(self, template: str) -> None:
+        self._template = template
+        self._compile(template)
+
+    def _compile(self, template: str) -> None:
+        """
+        Parses the template into literal segments and field renderers.
+
+        Adjacent literal segments are merged, and only the fields present in the
+        template are evaluated when a record is formatted.
+
+        Args:
+            template (str): The template for formatting log messages.
+        """
+        parts: list[str | _Renderer] = []
+        fields: set[str] = set()
+
+        for literal, field_name, format_spec, conversion in _TemplateParser().parse(template):
+            if literal:
+                if parts and isinstance(parts[-1], str):
+                    parts[-1] += literal
+                else:
+                    parts.append(literal)
+            if field_name is None:
+                continue
+
+            name = field_name.split(".", 1)[0].split("[", 1)[0]
+            fields.add(name)
+            parts.append(self._compile_field(field_name, name, format_spec or "", conversion))
+
+        self.fields = frozenset(fields)
+        self._parts = tuple(parts)
+
+    def _compile_field(
+        self,
+        field_name: str,
+        name: str,
+        format_spec: str,
+        conversion: str | None,
+    ) -> _Renderer:
+        """
+        Builds a renderer for a single template field.
+
+        Args:
+            field_name (str): The full field expression, e.g. `time` or `time.year`.
+            name (str): The name of the field the expression starts with.
+            format_spec (str): The format spec of the field.
+            conversion (str | None): The conversion of the field (`s`, `r` or `a`).
+
+        Returns:
+            Callable[[Record], str]: A function rendering the field for a record.
+        """
+        getter = getattr(self, f"_get_{name}", None) or _missing_field(name)
+        if field_name != name or "{" in format_spec:
+            # Attribute/index access or nested fields: let str.format resolve the rest.
+            spec = "{" + field_name
+            spec += f"!{conversion}" if conversion else ""
+            spec += f":{format_spec}" if format_spec else ""
+            spec += "}"
+            return lambda record: spec.format_map({name: getter(record)})
+
+        if conversion:
+            convert = _CONVERSIONS[conversion]
+            return lambda record: format(convert(getter(record)), format_spec)
+        if format_spec:
+            return lambda record: format(getter(record), format_spec)
+        return lambda record: str(getter(record))
+
+    @property
+    def uses_caller(self) -> bool:
+        """Whether the template references any call-site field.
+
+        Returns:
+            bool: `True` if the template uses `{filename}`, `{line}`, `{function}`,
+                `{relpath}` or `{basename}`.
+        """
+        return not CALLER_FIELDS.isdisjoint(self.fields)
+
+    def format(self, record: Record, colorize: Optional[bool] = None) -> str:
         """
         Formats a log record.
 
         Args:
             record (Record): The log record to format.
+            colorize (Optional[bool]): Whether to colorize the log message. Defaults to
+                `None`, which uses `colorize` of the formatter, without changing it.
 
         Returns:
             str: The formatted log message.
         """
-        formatted_text = self._format(record)
-
-        if self.colorize:
-            color = self.color_map.get(record.level, "")
-            return f"{color}{formatted_text}{Style.RESET_ALL}\n"
-        return formatted_text + "\n"
+        if colorize is None:
+            colorize = self.colorize and not _plain.get()
+        if colorize:
+            return f"{self._prefixes[record.level]}{self._format(record)}{_RESET}"
+        return self._format(record) + "\n"
 
     def _format(self, record: Record) -> str:
         """
@@ -70,15 +399,34 @@ class Formatter:
         Returns:
             str: The formatted log message.
         """
-        return self.template.format(
-            level=record.level.name,
-            message=record.message,
-            time=record.time.strftime(self.time_format),
-            name=record.name,
-            filename=record.filename,
-            line=record.line,
-            basename=record.basename,
-            relpath=record.relpath,
-            function=record.function,
-            emoji=self.emojis.get(record.level, ""),
-        )
+        return "".join([part if isinstance(part, str) else part(record) for part in self._parts])
+
+    def _get_level(self, record: Record) -> str:
+        return _LEVEL_NAMES[record.level]
+
+    def _get_message(self, record: Record) -> str:
+        return record.message
+
+    def _get_time(self, record: Record) -> str:
+        return self._render_time(record.time_ns)
+
+    def _get_name(self, record: Record) -> str:
+        return record.name
+
+    def _get_filename(self, record: Record) -> str:
+        return record.filename
+
+    def _get_line(self, record: Record) -> int:
+        return record.line
+
+    def _get_basename(self, record: Record) -> str:
+        return record.basename
+
+    def _get_relpath(self, record: Record) -> str:
+        return record.relpath
+
+    def _get_function(self, record: Record) -> str:
+        return record.function
+
+    def _get_emoji(self, record: Record) -> str:
+        return self.emojis.get(record.level, "")
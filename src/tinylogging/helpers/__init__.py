@@ -1,12 +1,75 @@
 import html
+import json.encoder
+from typing import Any, Callable, Iterable, Optional, Sequence
 
-from tinylogging.formatter import Formatter
+import httpx
+
+from tinylogging.formatter import Formatter, TimeFormat
 from tinylogging.record import Record
 
 __all__ = [
     "TelegramFormatter",
+    "JsonFormatter",
+    "TELEGRAM_MESSAGE_LIMIT",
+    "coalesce_messages",
+    "get_retry_after",
 ]
 
+TELEGRAM_MESSAGE_LIMIT = 4096
+"""Maximum length of a Telegram message."""
+
+
+def coalesce_messages(
+    texts: Iterable[str],
+    limit: int = TELEGRAM_MESSAGE_LIMIT,
+    separator: str = "\n\n",
+) -> list[str]:
+    """
+    Joins texts into as few messages as the length limit allows.
+
+    Trailing newlines are stripped from each text. Texts are never split, so a single
+    text longer than `limit` is kept as is.
+
+    Args:
+        texts (Iterable[str]): The texts to join, in order.
+        limit (int): The maximum length of a message.
+        separator (str): The separator between joined texts.
+
+    Returns:
+        list[str]: The joined messages.
+    """
+    messages: list[str] = []
+    current = ""
+    for text in texts:
+        text = text.rstrip("\n")
+        if current and len(current) + len(separator) + len(text) <= limit:
+            current += separator + text
+        else:
+            if current:
+                messages.append(current)
+            current = text
+    if current:
+        messages.append(current)
+    return messages
+
+
+def get_retry_after(response: httpx.Response) -> Optional[float]:
+    """
+    Gets how long to wait before retrying a rate-limited Telegram API call.
+
+    Args:
+        response (httpx.Response): The response of the Telegram API.
+
+    Returns:
+        Optional[float]: The delay in seconds, or `None` if the call was not rate-limited.
+    """
+    if response.status_code != 429:
+        return None
+    try:
+        return float(response.json()["parameters"]["retry_after"])
+    except (ValueError, KeyError, TypeError):
+        return float(response.headers.get("Retry-After", 1))
+
 
 class TelegramFormatter(Formatter):
     def __init__(self, time_format: str = "%H:%M:%S"):
@@ -36,5 +99,95 @@ class TelegramFormatter(Formatter):
         Returns:
             str: The formatted log record as a string.
         """
-        record.message = html.escape(record.message)
         return self._format(record)
+
+    def _get_message(self, record: Record) -> str:
+        # Escaped here rather than on the record, which other handlers may share.
+        return html.escape(record.message)
+
+
+_encode_string: Callable[[str], str] = (
+    json.encoder.c_encode_basestring or json.encoder.py_encode_basestring  # type: ignore[attr-defined]
+)
+"""Encodes a string as a JSON string literal, using the C encoder if available."""
+
+
+class JsonFormatter(Formatter):
+    DEFAULT_FIELDS = ("time", "level", "name", "message", "relpath", "line", "function")
+
+    def __init__(
+        self,
+        fields: Sequence[str] = DEFAULT_FIELDS,
+        time_format: str | TimeFormat = TimeFormat.ISO,
+        keys: Optional[dict[str, str]] = None,
+    ):
+        """
+        Initializes the JsonFormatter, which renders each record as one line of JSON.
+
+        The JSON object is assembled from key fragments prepared once at construction
+        and the encoded values of the configured fields. Epoch time formats are
+        rendered as numbers.
+
+        Args:
+            fields (Sequence[str]): The template fields to include, in order.
+            time_format (str | TimeFormat): The format for the `time` field.
+                Defaults to TimeFormat.ISO.
+            keys (Optional[dict[str, str]]): JSON keys to use instead of field names.
+
+        Raises:
+            ValueError: If a field is unknown.
+        """
+        self.json_fields = tuple(fields)
+        self.keys = keys or {}
+        super().__init__(time_format=time_format, template="", colorize=False)
+        self._compile_json()
+
+    def format(self, record: Record) -> str:
+        """
+        Formats a log record as a line of JSON.
+
+        Args:
+            record (Record): The log record to format.
+
+        Returns:
+            str: The JSON object followed by a newline.
+        """
+        return self._format(record) + "\n"
+
+    def _compile_json(self) -> None:
+        """
+        Prepares the key fragments and value renderers of the JSON object.
+
+        Raises:
+            ValueError: If a field is unknown.
+        """
+        parts: list[Any] = []
+        for index, name in enumerate(self.json_fields):
+            getter = getattr(self, f"_get_{name}", None)
+            if getter is None:
+                raise ValueError(f"Unknown field: {name!r}")
+
+            key = _encode_string(self.keys.get(name, name))
+            parts.append(("{" if index == 0 else ",") + key + ":")
+            parts.append(self._compile_json_value(name, getter))
+        parts.append("}" if parts else "{}")
+
+        self.fields = frozenset(self.json_fields)
+        self._parts = tuple(parts)
+
+    def _compile_json_value(self, name: str, getter: Callable[[Record], Any]) -> Any:
+        """
+        Builds a renderer for the JSON value of a field.
+
+        Args:
+            name (str): The name of the field.
+            getter (Callable[[Record], Any]): The getter of the field.
+
+        Returns:
+            Callable[[Record], str]: A function rendering the JSON value for a record.
+        """
+        if name == "line" or (
+            name == "time" and self.time_format in (TimeFormat.EPOCH, TimeFormat.EPOCH_MS)
+        ):
+            return lambda record: str(getter(record))
+        return lambda record: _encode_string(getter(record))
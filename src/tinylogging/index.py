@@ -0,0 +1,531 @@
+import os
+import re
+from datetime import date, datetime, timedelta
+from string import Formatter as _TemplateParser
+from struct import Struct
+from typing import BinaryIO, Iterator, NamedTuple, Optional
+
+from tinylogging.formatter import Formatter, TimeFormat
+from tinylogging.level import Level
+from tinylogging.record import datetime_to_ns
+
+__all__ = [
+    "INDEX_SUFFIX",
+    "IndexEntry",
+    "IndexWriter",
+    "LineParser",
+    "LogIndex",
+    "build_index",
+    "encoded_size",
+]
+
+INDEX_SUFFIX = ".idx"
+"""Suffix of the sidecar index next to a log file."""
+
+_MAGIC = b"TIDX"
+_VERSION = 2
+# magic, version, bucket size in nanoseconds, inode of the indexed log file
+_HEADER = Struct("<4sB3xqQ")
+# offset, end, time of the earliest and the latest record, bit `1 << level` per level
+_ENTRY = Struct("<QQqqH")
+
+_LEVEL_BITS = [1 << level for level in range(max(Level) + 1)]
+_LEVEL_NAMES = {level.name.encode(): level for level in Level}
+_HALF_DAY_NS = 12 * 3600 * 1_000_000_000
+
+
+def encoded_size(message: str) -> int:
+    """Gets the size of a message once encoded as UTF-8.
+
+    Args:
+        message (str): The message.
+
+    Returns:
+        int: The size in bytes.
+    """
+    return len(message) if message.isascii() else len(message.encode("utf-8"))
+
+
+class IndexEntry(NamedTuple):
+    """A run of consecutive log records within one time bucket.
+
+    Attributes:
+        offset (int): Byte offset of the first record in the log file.
+        end (int): Byte offset just past the last record in the log file.
+        first_ns (int): Time of the earliest record, in nanoseconds since the epoch.
+        last_ns (int): Time of the latest record, in nanoseconds since the epoch.
+        levels (int): Bit mask of the levels of the records, bit `1 << level` per level.
+    """
+
+    offset: int
+    end: int
+    first_ns: int
+    last_ns: int
+    levels: int
+
+    @property
+    def level(self) -> Level:
+        """The highest level of the records."""
+        return Level(self.levels.bit_length() - 1) if self.levels else Level.NOTSET
+
+
+class LineParser:
+    """Parses the time and level out of lines rendered by a `Formatter`.
+
+    The template is turned into a regular expression up to the `{time}` and
+    `{level}` fields, so the rest of the line is never looked at. Lines that do not
+    match are treated as continuation lines of a multi-line message.
+
+    Times rendered without a date are placed on `date` and move to the next day
+    whenever they go back by more than twelve hours.
+
+    Args:
+        formatter (Formatter): The formatter the lines were rendered with, without colors.
+        date (Optional[date]): The day of the first line if the time format has no date.
+
+    Raises:
+        ValueError: If the template has no plain `{time}` field.
+    """
+
+    def __init__(self, formatter: Formatter, date: Optional[date] = None) -> None:
+        self.time_format = formatter.time_format
+        self.date = date or datetime.now().date()
+        self._last: tuple[Optional[bytes], int] = (None, 0)
+        self._previous_ns = 0
+
+        pattern = ""
+        groups: set[str] = set()
+        wanted = {"time", "level"} & {
+            field for _, field, _, _ in _TemplateParser().parse(formatter.template)
+        }
+        if "time" not in wanted:
+            raise ValueError("The template has no {time} field to index by")
+
+        for literal, field_name, _, _ in _TemplateParser().parse(formatter.template):
+            pattern += re.escape(literal)
+            if groups == wanted and literal:
+                # The literal after the last wanted field ends its non-greedy match.
+                break
+            if field_name is None:
+                continue
+            if field_name == "time" and "time" not in groups:
+                pattern += "(?P<time>.+?)"
+                groups.add("time")
+            elif field_name == "level" and "level" not in groups:
+                pattern += " *(?P<level>[A-Z]+) *"
+                groups.add("level")
+            else:
+                pattern += ".*?"
+        else:
+            pattern += "$"
+
+        self._match = re.compile(pattern.encode()).match
+        self._has_level = "level" in groups
+
+    def parse(self, line: bytes) -> Optional[tuple[int, Level]]:
+        """Parses the time and level of a line.
+
+        Args:
+            line (bytes): The line, including its line break.
+
+        Returns:
+            Optional[tuple[int, Level]]: The time in nanoseconds since the epoch and the
+                level, or `None` if the line does not start a log record.
+        """
+        match = self._match(line)
+        if match is None:
+            return None
+
+        level = Level.NOTSET
+        if self._has_level:
+            found = _LEVEL_NAMES.get(match.group("level"))
+            if found is None:
+                return None
+            level = found
+
+        text = match.group("time")
+        cached_text, time_ns = self._last
+        if text != cached_text:
+            try:
+                time_ns = self._parse_time(text.decode())
+            except ValueError:
+                return None
+            self._last = (text, time_ns)
+        return time_ns, level
+
+    def _parse_time(self, text: str) -> int:
+        """Parses a rendered timestamp.
+
+        Args:
+            text (str): The timestamp as rendered by the formatter.
+
+        Returns:
+            int: The time in nanoseconds since the epoch.
+
+        Raises:
+            ValueError: If the timestamp does not match the time format.
+        """
+        if self.time_format == TimeFormat.EPOCH_MS:
+            return int(text) * 1_000_000
+        if self.time_format == TimeFormat.EPOCH:
+            seconds, _, fraction = text.partition(".")
+            return int(seconds) * 1_000_000_000 + int(fraction.ljust(9, "0")[:9])
+        if self.time_format == TimeFormat.ISO:
+            return datetime_to_ns(datetime.fromisoformat(text))
+
+        time = datetime.strptime(text, self.time_format)
+        if time.year != 1900:
+            return datetime_to_ns(time)
+
+        time_ns = datetime_to_ns(datetime.combine(self.date, time.time()))
+        if time_ns < self._previous_ns - _HALF_DAY_NS:
+            self.date += timedelta(days=1)
+            time_ns = datetime_to_ns(datetime.combine(self.date, time.time()))
+        self._previous_ns = time_ns
+        return time_ns
+
+
+class LogIndex:
+    """Sidecar index of a log file, loaded from `<file_name>.idx`.
+
+    Args:
+        file_name (str): Name of the indexed log file.
+
+    Raises:
+        FileNotFoundError: If the log file has no index.
+        ValueError: If the index is not a tinylogging index.
+    """
+
+    def __init__(self, file_name: str) -> None:
+        self.file_name = file_name
+        with open(file_name + INDEX_SUFFIX, "rb") as file:
+            data = file.read()
+        if len(data) < _HEADER.size or data[:4] != _MAGIC:
+            raise ValueError(f"{file_name}{INDEX_SUFFIX} is not a tinylogging index")
+        _, version, self.bucket_ns, self.inode = _HEADER.unpack_from(data)
+        if version != _VERSION:
+            raise ValueError(f"{file_name}{INDEX_SUFFIX} has unsupported version {version}")
+        body = memoryview(data)[_HEADER.size :]
+        # Entries stay packed until they are needed; a partially written one is ignored.
+        self._body = body[: len(body) - len(body) % _ENTRY.size]
+
+    def __len__(self) -> int:
+        return len(self._body) // _ENTRY.size
+
+    @property
+    def entries(self) -> list[IndexEntry]:
+        """All entries of the index, in file order."""
+        return [IndexEntry(*entry) for entry in _ENTRY.iter_unpack(self._body)]
+
+    @property
+    def last(self) -> Optional[IndexEntry]:
+        """The last entry of the index, or `None` if it is empty."""
+        if not self._body:
+            return None
+        return IndexEntry(*_ENTRY.unpack_from(self._body, len(self._body) - _ENTRY.size))
+
+    @property
+    def end(self) -> int:
+        """Byte offset just past the last indexed record."""
+        last = self.last
+        return 0 if last is None else last.end
+
+    def ranges(
+        self,
+        level: Optional[Level] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> list[tuple[int, int]]:
+        """Finds the byte ranges of the log file that hold matching records.
+
+        A range may contain records slightly outside the time range, as runs are
+        only as precise as their earliest and latest record, and records below the
+        level, as a run contains records of all levels within its time bucket.
+
+        Args:
+            level (Optional[Level]): Only include records at or above this level.
+            start (Optional[datetime]): Only include records created at or after this time.
+            end (Optional[datetime]): Only include records created before this time.
+
+        Returns:
+            list[tuple[int, int]]: The start and end offsets of the matching ranges,
+                with adjacent ranges merged.
+        """
+        ranges: list[tuple[int, int]] = []
+        for offset, stop, _ in self._runs(level, start, end):
+            if ranges and ranges[-1][1] == offset:
+                ranges[-1] = (ranges[-1][0], stop)
+            else:
+                ranges.append((offset, stop))
+        return ranges
+
+    def query(
+        self,
+        level: Optional[Level] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        chunk_size: int = 1 << 20,
+        formatter: Optional[Formatter] = None,
+    ) -> Iterator[bytes]:
+        """Reads the parts of the log file that hold matching records.
+
+        Runs that also contain records below `level` are parsed line by line to
+        leave those records out; all other runs are copied as they are. If the lines
+        do not match `formatter`, such runs are copied as they are too.
+
+        Args:
+            level (Optional[Level]): Only include records at or above this level.
+            start (Optional[datetime]): Only include records created at or after this time.
+            end (Optional[datetime]): Only include records created before this time.
+            chunk_size (int): The maximum number of bytes read at once.
+            formatter (Optional[Formatter]): The formatter the log file was written with,
+                to parse the level of records. Defaults to the default `FileHandler`
+                formatter.
+
+        Yields:
+            bytes: Chunks of whole lines from the matching ranges, in file order.
+        """
+        parser: Optional[LineParser] = None
+        with open(self.file_name, "rb") as file:
+            for offset, stop, mixed in self._runs(level, start, end):
+                file.seek(offset)
+                remaining = stop - offset
+                if not mixed:
+                    while remaining > 0:
+                        chunk = file.read(min(chunk_size, remaining))
+                        if not chunk:
+                            break
+                        remaining -= len(chunk)
+                        yield chunk
+                    continue
+
+                if parser is None:
+                    parser = LineParser(formatter or Formatter(colorize=False))
+                lines: list[bytes] = []
+                # Runs start with a record, so this only lasts if no line can be parsed.
+                keep = True
+                while remaining > 0:
+                    line = file.readline(remaining)
+                    if not line:
+                        break
+                    remaining -= len(line)
+                    parsed = parser.parse(line)
+                    if parsed is not None:
+                        keep = parsed[1] >= level  # type: ignore[operator]
+                    if keep:
+                        lines.append(line)
+                if lines:
+                    yield b"".join(lines)
+
+    def _runs(
+        self,
+        level: Optional[Level],
+        start: Optional[datetime],
+        end: Optional[datetime],
+    ) -> Iterator[tuple[int, int, bool]]:
+        """Finds the runs that hold matching records.
+
+        Args:
+            level (Optional[Level]): Only include records at or above this level.
+            start (Optional[datetime]): Only include records created at or after this time.
+            end (Optional[datetime]): Only include records created before this time.
+
+        Yields:
+            tuple[int, int, bool]: The start and end offsets of a run, and whether it
+                also contains records below the level.
+        """
+        min_level = 0 if level is None else int(level)
+        below = (1 << min_level) - 1
+        start_ns = -(2**63) if start is None else datetime_to_ns(start)
+        end_ns = 2**63 - 1 if end is None else datetime_to_ns(end)
+
+        for offset, stop, first_ns, last_ns, levels in _ENTRY.iter_unpack(self._body):
+            if not levels >> min_level or last_ns < start_ns or first_ns >= end_ns:
+                continue
+            yield offset, stop, bool(levels & below)
+
+
+class IndexWriter:
+    """Appends to the sidecar index of a log file as records are written.
+
+    Consecutive records within one `bucket` form a run, and a run is written to the
+    index once it ends. A run records which levels it contains rather than
+    starting anew whenever the level changes, so the size of the index depends
+    only on the time span of the log file, not on how its levels are mixed. When the index is opened it first
+    catches up with records already in the log file, so a log file written
+    without an index, or by a process that did not close its index, is indexed
+    on its next open. An index of another file, e.g. before rotation, is replaced.
+
+    Args:
+        file_name (str): Name of the indexed log file.
+        bucket (timedelta): The longest time span of a run.
+    """
+
+    def __init__(self, file_name: str, bucket: timedelta = timedelta(seconds=1)) -> None:
+        self.file_name = file_name
+        self.bucket_ns = bucket // timedelta(microseconds=1) * 1000
+        self.file: Optional[BinaryIO] = None
+        self._end = 0
+        self._run: Optional[list[int]] = None
+        self._run_bucket = -1
+
+    def open(
+        self,
+        formatter: Formatter,
+        offset: Optional[int] = None,
+        date: Optional[date] = None,
+    ) -> int:
+        """Opens the index, indexing the records it does not cover yet.
+
+        Args:
+            formatter (Formatter): The formatter the log file was written with.
+            offset (Optional[int]): Index up to this offset, where the caller continues
+                writing. A trailing partial line before it is skipped. Defaults to the
+                last complete line of the file.
+            date (Optional[date]): The day of the first unindexed record if the time
+                format has no date. Defaults to the day of the last indexed record, or
+                the day the log file was last modified.
+
+        Returns:
+            int: The number of records indexed while catching up.
+        """
+        stat = os.stat(self.file_name)
+        index_name = self.file_name + INDEX_SUFFIX
+        last_ns: Optional[int] = None
+        self._end = 0
+        try:
+            index = LogIndex(self.file_name)
+            if index.inode != stat.st_ino or index.end > stat.st_size:
+                raise ValueError("The index belongs to another file")
+            self.bucket_ns = index.bucket_ns
+            last = index.last
+            if last is not None:
+                self._end, last_ns = last.end, last.last_ns
+            self.file = open(index_name, "r+b")
+            self.file.truncate(_HEADER.size + len(index) * _ENTRY.size)
+            self.file.seek(0, os.SEEK_END)
+        except (FileNotFoundError, ValueError):
+            self.file = open(index_name, "wb")
+            self.file.write(_HEADER.pack(_MAGIC, _VERSION, self.bucket_ns, stat.st_ino))
+
+        if date is None:
+            time_ns = last_ns if last_ns is not None else int(stat.st_mtime * 1_000_000_000)
+            date = datetime.fromtimestamp(time_ns // 1_000_000_000).date()
+        return self._catch_up(LineParser(formatter, date), offset)
+
+    def _catch_up(self, parser: LineParser, offset: Optional[int]) -> int:
+        """Indexes the records between the end of the index and `offset`.
+
+        Args:
+            parser (LineParser): The parser for the lines of the log file.
+            offset (Optional[int]): Where to stop, or `None` for the end of the file.
+
+        Returns:
+            int: The number of records indexed.
+        """
+        count = 0
+        pending: Optional[tuple[int, Level]] = None
+        size = 0
+        with open(self.file_name, "rb") as log:
+            log.seek(self._end)
+            position = self._end
+            for line in log:
+                if offset is not None and position + len(line) > offset:
+                    break
+                if not line.endswith(b"\n"):
+                    break
+                position += len(line)
+                parsed = parser.parse(line)
+                if parsed is None:
+                    if pending is None:
+                        self.skip(len(line))
+                    else:
+                        size += len(line)
+                    continue
+                if pending is not None:
+                    self.add(pending[0], pending[1], size)
+                    count += 1
+                pending, size = parsed, len(line)
+
+        if pending is not None:
+            self.add(pending[0], pending[1], size)
+            count += 1
+        if offset is not None and offset > self._end:
+            self.skip(offset - self._end)
+        return count
+
+    def add(self, time_ns: int, level: Level, size: int) -> None:
+        """Accounts for a record written at the end of the log file.
+
+        Args:
+            time_ns (int): The time of the record, in nanoseconds since the epoch.
+            level (Level): The level of the record.
+            size (int): The size of the formatted record in bytes.
+        """
+        bucket = time_ns // self.bucket_ns
+        run = self._run
+        if run is None or bucket != self._run_bucket:
+            self._end_run()
+            run = self._run = [self._end, self._end, time_ns, time_ns, 0]
+            self._run_bucket = bucket
+        elif time_ns > run[3]:
+            run[3] = time_ns
+        elif time_ns < run[2]:
+            run[2] = time_ns
+        self._end += size
+        run[1] = self._end
+        run[4] |= _LEVEL_BITS[level]
+
+    def skip(self, size: int) -> None:
+        """Accounts for bytes at the end of the log file that are not a record.
+
+        Args:
+            size (int): The number of bytes.
+        """
+        self._end_run()
+        self._end += size
+
+    def flush(self) -> None:
+        """Writes the finished runs to the index file."""
+        if self.file is not None:
+            self.file.flush()
+
+    def close(self) -> None:
+        """Writes all runs, including the current one, and closes the index file."""
+        self._end_run()
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def _end_run(self) -> None:
+        if self._run is not None and self.file is not None:
+            self.file.write(_ENTRY.pack(*self._run))
+        self._run = None
+
+
+def build_index(
+    file_name: str,
+    formatter: Optional[Formatter] = None,
+    bucket: timedelta = timedelta(seconds=1),
+    date: Optional[date] = None,
+) -> int:
+    """Builds or updates the sidecar index of a log file.
+
+    Only the records after the end of an existing index are parsed.
+
+    Args:
+        file_name (str): Name of the log file.
+        formatter (Optional[Formatter]): The formatter the log file was written with.
+            Defaults to the default `FileHandler` formatter.
+        bucket (timedelta): The longest time span of a run, for a new index.
+        date (Optional[date]): The day of the first unindexed record if the time
+            format has no date.
+
+    Returns:
+        int: The number of records indexed.
+    """
+    writer = IndexWriter(file_name, bucket)
+    try:
+        return writer.open(formatter or Formatter(colorize=False), date=date)
+    finally:
+        writer.close()
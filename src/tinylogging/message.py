@@ -0,0 +1,34 @@
+from typing import Any, Callable, Literal
+
+__all__ = ["Message", "Style", "render_message"]
+
+Message = str | Callable[[], Any]
+"""A log message: a string, or a zero-argument callable returning the message."""
+
+Style = Literal["%", "{"]
+"""How deferred arguments are merged into a message: `%`-style or `str.format` style."""
+
+
+def render_message(message: Message, args: tuple[Any, ...], style: Style = "%") -> str:
+    """Renders a log message with its deferred arguments.
+
+    Args:
+        message (Message): The message, or a callable returning it.
+        args (tuple[Any, ...]): The deferred arguments of the message.
+        style (Style): `%` to render with `message % args`, `{` to render with
+            `message.format(*args)`.
+
+    Returns:
+        str: The rendered message.
+    """
+    if callable(message):
+        message = message()
+    if not isinstance(message, str):
+        message = str(message)
+    if not args:
+        return message
+    if style == "{":
+        return message.format(*args)
+    if len(args) == 1 and isinstance(args[0], dict) and args[0]:
+        return message % args[0]
+    return message % args
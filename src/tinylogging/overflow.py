@@ -0,0 +1,17 @@
+from enum import Enum, auto
+
+__all__ = ["OverflowPolicy"]
+
+
+class OverflowPolicy(Enum):
+    """Enumeration for what to do when a bounded log queue is full.
+
+    Attributes:
+        BLOCK: Wait until there is room in the queue.
+        DROP_NEWEST: Discard the record being enqueued.
+        DROP_OLDEST: Discard the oldest queued record to make room.
+    """
+
+    BLOCK = auto()
+    DROP_NEWEST = auto()
+    DROP_OLDEST = auto()
@@ -1,13 +1,66 @@
-import inspect
 import os
-from dataclasses import dataclass, field, asdict
+import sys
+import time
+from dataclasses import InitVar, dataclass, field
 from datetime import datetime
-from typing import Any
+from enum import Enum, auto
+from types import FrameType
+from typing import Any, ClassVar, Optional
 
+from tinylogging.callsite import CallSite, CallSiteCache
 from tinylogging.level import Level
 
+__all__ = ["Record", "CallerCapture"]
 
-@dataclass
+
+class CallerCapture(Enum):
+    """Enumeration for call-site capture modes.
+
+    Attributes:
+        EAGER: Always capture the call site of a log record.
+        LAZY: Capture the call site only when a formatter references
+            `{filename}`, `{line}`, `{function}`, `{relpath}` or `{basename}`.
+        OFF: Never capture the call site.
+    """
+
+    EAGER = auto()
+    LAZY = auto()
+    OFF = auto()
+
+
+def _get_frame(depth: int) -> Optional[FrameType]:
+    """Gets the frame `depth` levels above the caller.
+
+    Falls back to the outermost frame when the stack is shallower than `depth`.
+
+    Args:
+        depth (int): The number of frames to walk up from the caller.
+
+    Returns:
+        Optional[FrameType]: The requested stack frame.
+    """
+    try:
+        return sys._getframe(depth + 1)
+    except ValueError:
+        frame = sys._getframe(1)
+        while frame.f_back:
+            frame = frame.f_back
+        return frame
+
+
+def datetime_to_ns(time: datetime) -> int:
+    """Converts a `datetime` to nanoseconds since the epoch.
+
+    Args:
+        time (datetime): The time, naive local or aware.
+
+    Returns:
+        int: The time in nanoseconds since the epoch.
+    """
+    return int(time.timestamp()) * 1_000_000_000 + time.microsecond * 1000
+
+
+@dataclass(slots=True)
 class Record:
     """Represents a log record.
 
@@ -15,19 +68,49 @@ class Record:
         message (str): The log message.
         level (Level): The log level.
         name (str): The name of the logger.
-        time (datetime): The time the log record was created.
+        time_ns (int): The time the log record was created, in nanoseconds since the epoch.
+        time (datetime): The time the log record was created, as a local `datetime`.
+            Created from `time_ns` when first accessed.
         filename (str): The name of the file where the log record was created.
         line (int): The line number in the file where the log record was created.
         function (str): The function name where the log record was created.
+        stacklevel (int): How many frames above the code creating the record the
+            call site is. `1` means the code that creates the record.
+        capture_caller (bool): Whether to capture the call site at all. When `False`,
+            `filename` and `function` are empty and `line` is `0`.
+        callsites (CallSiteCache): Cache of resolved call sites shared by all records.
     """
 
+    callsites: ClassVar[CallSiteCache] = CallSiteCache()
+
     message: str
     level: Level
     name: str
-    time: datetime = field(init=False)
+    time_ns: int = field(init=False)
     filename: str = field(init=False)
     line: int = field(init=False)
     function: str = field(init=False)
+    _callsite: Optional[CallSite] = field(default=None, init=False, repr=False, compare=False)
+    _time: Optional[datetime] = field(default=None, init=False, repr=False, compare=False)
+    stacklevel: InitVar[int] = 1
+    capture_caller: InitVar[bool] = True
+
+    @property
+    def time(self) -> datetime:
+        """Gets the time the log record was created.
+
+        Returns:
+            datetime: The creation time as a naive local `datetime`.
+        """
+        if self._time is None:
+            seconds, nanoseconds = divmod(self.time_ns, 1_000_000_000)
+            self._time = datetime.fromtimestamp(seconds).replace(microsecond=nanoseconds // 1000)
+        return self._time
+
+    @time.setter
+    def time(self, time: datetime) -> None:
+        self._time = time
+        self.time_ns = datetime_to_ns(time)
 
     @property
     def basename(self) -> str:
@@ -36,6 +119,9 @@ class Record:
         Returns:
             str: The base name of the file.
         """
+        site = self._callsite
+        if site is not None and site.filename == self.filename:
+            return site.basename
         return os.path.basename(self.filename)
 
     @property
@@ -45,45 +131,75 @@ class Record:
         Returns:
             str: The relative path of the file.
         """
+        site = self._callsite
+        if site is not None and site.filename == self.filename:
+            return self.callsites.relpath(site)
+        if not self.filename:
+            return ""
         return os.path.relpath(self.filename)
 
-    def __post_init__(self) -> None:
+    @classmethod
+    def from_fields(
+        cls,
+        message: str,
+        level: Level,
+        name: str,
+        time_ns: int,
+        filename: str = "",
+        line: int = 0,
+        function: str = "",
+    ) -> "Record":
+        """Creates a log record from already known fields without inspecting the stack.
+
+        Args:
+            message (str): The log message.
+            level (Level): The log level.
+            name (str): The name of the logger.
+            time_ns (int): The creation time, in nanoseconds since the epoch.
+            filename (str): The name of the file where the log record was created.
+            line (int): The line number where the log record was created.
+            function (str): The function name where the log record was created.
+
+        Returns:
+            Record: The log record.
+        """
+        record = cls(message, level, name, capture_caller=False)
+        record.time_ns = time_ns
+        record.filename = filename
+        record.line = line
+        record.function = function
+        return record
+
+    def __post_init__(self, stacklevel: int, capture_caller: bool) -> None:
         """Initializes additional attributes after the dataclass is created.
 
+        Args:
+            stacklevel (int): How many frames above the code creating the record
+                the call site is.
+            capture_caller (bool): Whether to capture the call site.
+
         Raises:
             RuntimeError: If the stack frame cannot be retrieved.
         """
-        self.time = datetime.now()
+        self.time_ns = time.time_ns()
 
-        depth = self._get_stack_index()
-        frame = inspect.stack()[depth]
+        if not capture_caller:
+            self.filename = ""
+            self.line = 0
+            self.function = ""
+            return
 
-        depth = self._get_stack_index()
-        frame = inspect.currentframe()  # type: ignore
-        for _ in range(depth):
-            frame = frame.f_back  # type: ignore
+        # __post_init__ <- __init__ <- code creating the record
+        frame = _get_frame(stacklevel + 1)
 
         if not frame:
             raise RuntimeError("Failed to get stack frame")
 
-        self.filename = frame.f_code.co_filename  # type: ignore
-        self.line = frame.f_lineno  # type: ignore
-        self.function = frame.f_code.co_name  # type: ignore
-
-    def _get_stack_index(self) -> int:
-        """Gets the index of the stack frame for the log record.
-
-        Returns:
-            int: The index of the stack frame.
-        """
-        current_frame = inspect.currentframe()
-        index = 0
-        while current_frame:
-            if current_frame.f_code.co_name == "log":
-                return index + 1
-            current_frame = current_frame.f_back
-            index += 1
-        return 1
+        site = self.callsites.lookup(frame.f_code, frame.f_lineno)
+        self._callsite = site
+        self.filename = site.filename
+        self.line = frame.f_lineno
+        self.function = site.function
 
     def to_dict(self) -> dict[str, Any]:
         """Converts the log record to a dictionary.
@@ -91,7 +207,14 @@ class Record:
         Returns:
             dict: A dictionary representation of the log record.
         """
-        dict_ = asdict(self)
-        dict_["basename"] = self.basename
-        dict_["relpath"] = self.relpath
-        return dict_
+        return {
+            "message": self.message,
+            "level": self.level,
+            "name": self.name,
+            "time": self.time,
+            "filename": self.filename,
+            "line": self.line,
+            "function": self.function,
+            "basename": self.basename,
+            "relpath": self.relpath,
+        }
@@ -0,0 +1,197 @@
+import gzip
+import os
+import re
+import shutil
+import zlib
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta
+from enum import Enum
+from typing import Optional
+
+__all__ = ["Compression", "Rotator"]
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+class Compression(Enum):
+    """Enumeration for compression of rotated log files.
+
+    The value of each member is the suffix added to compressed files.
+
+    Attributes:
+        GZIP: Compress with `gzip`.
+        ZLIB: Compress with `zlib`.
+    """
+
+    GZIP = ".gz"
+    ZLIB = ".zz"
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Gets the thread that compresses and prunes rotated log files.
+
+    Returns:
+        ThreadPoolExecutor: The shared single-threaded executor.
+    """
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tinylogging-rotation")
+    return _executor
+
+
+def _compress(path: str, compression: Compression) -> None:
+    """Compresses a file next to itself and removes the original.
+
+    Args:
+        path (str): The file to compress.
+        compression (Compression): The compression to use.
+    """
+    target = path + compression.value
+    with open(path, "rb") as src:
+        if compression is Compression.GZIP:
+            with gzip.open(target, "wb") as dst:
+                shutil.copyfileobj(src, dst)
+        else:
+            compressor = zlib.compressobj()
+            with open(target, "wb") as dst:
+                while chunk := src.read(1 << 20):
+                    dst.write(compressor.compress(chunk))
+                dst.write(compressor.flush())
+    os.remove(path)
+
+
+class Rotator:
+    """Decides when a log file rotates and moves its segments aside.
+
+    Rotated segments are named `<file_name>.<YYYYmmdd-HHMMSS-ffffff>` and are compressed
+    and pruned on a background thread, so rotating never waits for compression.
+
+    Args:
+        file_name (str): Name of the log file.
+        max_bytes (Optional[int]): Rotate before the file would exceed this size.
+        interval (Optional[timedelta]): Rotate at multiples of this interval,
+            counted from local midnight.
+        backup_count (int): Number of rotated segments to keep. `0` keeps all of them.
+        compression (Optional[Compression]): Compression for rotated segments.
+    """
+
+    def __init__(
+        self,
+        file_name: str,
+        max_bytes: Optional[int] = None,
+        interval: Optional[timedelta] = None,
+        backup_count: int = 5,
+        compression: Optional[Compression] = None,
+    ) -> None:
+        self.file_name = file_name
+        self.max_bytes = max_bytes
+        self.interval = interval
+        self.backup_count = backup_count
+        self.compression = compression
+        self.size = 0
+        self.rollover_at: Optional[datetime] = None
+        self._rollover_at_ns: Optional[int] = None
+        self._segment_re = re.compile(
+            re.escape(os.path.basename(file_name))
+            + r"\.(\d{8}-\d{6}-\d{6}(?:_\d+)?)(?:\.gz|\.zz)?$"
+        )
+
+    def start(self, now: datetime) -> None:
+        """Starts tracking a freshly opened log file.
+
+        Args:
+            now (datetime): The current time.
+        """
+        try:
+            self.size = os.path.getsize(self.file_name)
+        except OSError:
+            self.size = 0
+        if self.interval is not None:
+            midnight = now.replace(hour=0, minute=0, second=0, microsecond=0)
+            self.rollover_at = midnight + ((now - midnight) // self.interval + 1) * self.interval
+            self._rollover_at_ns = int(self.rollover_at.timestamp()) * 1_000_000_000
+
+    def measure(self, message: str) -> int:
+        """Measures the size a message adds to the file, if rotation is size-based.
+
+        Args:
+            message (str): The formatted message about to be written.
+
+        Returns:
+            int: The size of the message in bytes, or `0` without `max_bytes`.
+        """
+        if self.max_bytes is None:
+            return 0
+        return len(message.encode("utf-8"))
+
+    def should_rollover(self, time_ns: int, size: int) -> bool:
+        """Checks whether the file has to rotate before writing a message.
+
+        Args:
+            time_ns (int): The time of the log record, in nanoseconds since the epoch.
+            size (int): The size of the message as returned by `measure`.
+
+        Returns:
+            bool: Whether the file has to rotate.
+        """
+        if self._rollover_at_ns is not None and time_ns >= self._rollover_at_ns:
+            return True
+        return self.max_bytes is not None and 0 < self.size and self.size + size > self.max_bytes
+
+    def written(self, size: int) -> None:
+        """Accounts for a message written to the file.
+
+        Args:
+            size (int): The size of the message as returned by `measure`.
+        """
+        self.size += size
+
+    def rollover(self, now: datetime) -> Future[None]:
+        """Moves the current log file aside and schedules compression and pruning.
+
+        The log file must be closed before calling this method.
+
+        Args:
+            now (datetime): The current time.
+
+        Returns:
+            Future[None]: The scheduled compression and pruning.
+        """
+        start = now
+        if self.interval is not None and self.rollover_at is not None and now >= self.rollover_at:
+            # The segment holds the records of the interval that just ended.
+            start = self.rollover_at - self.interval
+
+        segment = f"{self.file_name}.{start:%Y%m%d-%H%M%S-%f}"
+        candidate, n = segment, 0
+        while any(os.path.exists(candidate + suffix) for suffix in ("", ".gz", ".zz")):
+            n += 1
+            candidate = f"{segment}_{n}"
+
+        if os.path.exists(self.file_name):
+            os.replace(self.file_name, candidate)
+        return _get_executor().submit(self._compress_and_prune, candidate)
+
+    def _compress_and_prune(self, segment: str) -> None:
+        """Compresses a rotated segment and removes segments beyond `backup_count`.
+
+        Args:
+            segment (str): The path of the rotated segment.
+        """
+        if self.compression is not None and os.path.exists(segment):
+            _compress(segment, self.compression)
+        if not self.backup_count:
+            return
+
+        directory = os.path.dirname(self.file_name) or "."
+        segments: list[tuple[str, str]] = []
+        for name in os.listdir(directory):
+            match = self._segment_re.match(name)
+            if match:
+                segments.append((match.group(1), os.path.join(directory, name)))
+        segments.sort(reverse=True)
+        for _, path in segments[self.backup_count :]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
@@ -0,0 +1,257 @@
+import threading
+from typing import Any, NamedTuple, Optional
+
+from tinylogging.level import Level
+
+__all__ = ["LatencyHistogram", "HandlerStats", "HandlerSnapshot", "LoggerSnapshot", "snapshot"]
+
+
+class LatencyHistogram:
+    """Histogram of durations in power-of-two nanosecond buckets.
+
+    Bucket `i` counts durations of `i` bits, i.e. from `2**(i - 1)` up to `2**i`
+    nanoseconds, so adding a duration costs one `int.bit_length` and percentiles
+    are accurate to a factor of two.
+
+    Attributes:
+        counts (list[int]): The number of durations per bucket.
+        count (int): The number of durations.
+        total_ns (int): The sum of the durations.
+        max_ns (int): The longest duration.
+    """
+
+    BUCKETS = 48
+
+    def __init__(self) -> None:
+        self.counts = [0] * self.BUCKETS
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+
+    def add(self, duration_ns: int) -> None:
+        """Adds a duration.
+
+        Args:
+            duration_ns (int): The duration in nanoseconds.
+        """
+        bucket = duration_ns.bit_length()
+        self.counts[bucket if bucket < self.BUCKETS else self.BUCKETS - 1] += 1
+        self.count += 1
+        self.total_ns += duration_ns
+        if duration_ns > self.max_ns:
+            self.max_ns = duration_ns
+
+    def percentile(self, fraction: float) -> int:
+        """Gets an upper bound of a percentile.
+
+        Args:
+            fraction (float): The percentile as a fraction, e.g. `0.99`.
+
+        Returns:
+            int: The upper bound of the bucket holding the percentile, in nanoseconds,
+                or `0` if the histogram is empty.
+        """
+        if not self.count:
+            return 0
+        rank = fraction * self.count
+        seen = 0
+        for bucket, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                return min(1 << bucket, self.max_ns)
+        return self.max_ns
+
+    @property
+    def mean_ns(self) -> float:
+        """The mean duration in nanoseconds."""
+        return self.total_ns / self.count if self.count else 0.0
+
+    def copy(self) -> "LatencyHistogram":
+        """Copies the histogram.
+
+        Returns:
+            LatencyHistogram: The copy.
+        """
+        copy = LatencyHistogram()
+        copy.counts = self.counts.copy()
+        copy.count = self.count
+        copy.total_ns = self.total_ns
+        copy.max_ns = self.max_ns
+        return copy
+
+
+class HandlerStats:
+    """Counters a handler collects once `enable_stats` is called on it.
+
+    Attributes:
+        errors (int): The number of records or sends the handler failed on, including
+            errors it swallowed, e.g. with `ignore_errors=True`.
+        latency (LatencyHistogram): How long `emit` took per record.
+    """
+
+    def __init__(self) -> None:
+        # Indexed by level; hashing an `IntEnum` for a dict is several times slower.
+        self._records = [0] * (max(Level) + 1)
+        self._bytes = [0] * (max(Level) + 1)
+        self.errors = 0
+        self.latency = LatencyHistogram()
+        self._lock = threading.Lock()
+
+    @property
+    def records(self) -> dict[Level, int]:
+        """The number of emitted records per level."""
+        return {level: self._records[level] for level in Level if self._records[level]}
+
+    @property
+    def bytes(self) -> dict[Level, int]:
+        """The number of bytes written or sent per level."""
+        return {level: self._bytes[level] for level in Level if self._bytes[level]}
+
+    def emitted(self, level: Level, duration_ns: int) -> None:
+        """Counts an emitted record.
+
+        Args:
+            level (Level): The level of the record.
+            duration_ns (int): How long emitting it took, in nanoseconds.
+        """
+        with self._lock:
+            self._records[level] += 1
+            self.latency.add(duration_ns)
+
+    def written(self, level: Level, size: int) -> None:
+        """Counts bytes written or sent for a record.
+
+        Args:
+            level (Level): The level of the record.
+            size (int): The number of bytes.
+        """
+        with self._lock:
+            self._bytes[level] += size
+
+    def failed(self, count: int = 1) -> None:
+        """Counts records or sends the handler failed on.
+
+        Args:
+            count (int): The number of failures.
+        """
+        with self._lock:
+            self.errors += count
+
+
+class HandlerSnapshot(NamedTuple):
+    """Statistics of a handler at one point in time.
+
+    Records, bytes, errors and latency are only counted while stats are enabled on
+    the handler; the other fields are always available.
+
+    Attributes:
+        handler (str): The class name of the handler.
+        enabled (bool): Whether stats are enabled on the handler.
+        records (dict[Level, int]): The number of emitted records per level.
+        bytes (dict[Level, int]): The number of bytes written or sent per level.
+        errors (int): The number of records or sends the handler failed on.
+        latency (LatencyHistogram): How long `emit` took per record.
+        filtered (int): The number of records dropped by the handler's filters.
+        dropped (int): The number of records dropped by the handler itself,
+            e.g. by its `OverflowPolicy`.
+        queued (int): The number of records waiting in the handler's queue.
+    """
+
+    handler: str
+    enabled: bool
+    records: dict[Level, int]
+    bytes: dict[Level, int]
+    errors: int
+    latency: LatencyHistogram
+    filtered: int
+    dropped: int
+    queued: int
+
+    def as_dict(self) -> dict[str, Any]:
+        """Converts the snapshot to plain types, e.g. for `json.dumps`.
+
+        Returns:
+            dict[str, Any]: The snapshot with level names and latency percentiles.
+        """
+        return {
+            "handler": self.handler,
+            "enabled": self.enabled,
+            "records": {level.name: count for level, count in self.records.items()},
+            "bytes": {level.name: size for level, size in self.bytes.items()},
+            "errors": self.errors,
+            "latency_ns": {
+                "count": self.latency.count,
+                "mean": self.latency.mean_ns,
+                "p50": self.latency.percentile(0.5),
+                "p90": self.latency.percentile(0.9),
+                "p99": self.latency.percentile(0.99),
+                "max": self.latency.max_ns,
+            },
+            "filtered": self.filtered,
+            "dropped": self.dropped,
+            "queued": self.queued,
+        }
+
+
+class LoggerSnapshot(NamedTuple):
+    """Statistics of a logger and its handlers at one point in time.
+
+    Attributes:
+        name (str): The name of the logger.
+        filtered (int): The number of records dropped by the logger's filters.
+        dropped (int): The number of records dropped by the logger's queue.
+        queued (int): The number of records waiting in the logger's queue.
+        handlers (list[HandlerSnapshot]): The handlers records of the logger are passed
+            to, followed by the handlers wrapped by them.
+    """
+
+    name: str
+    filtered: int
+    dropped: int
+    queued: int
+    handlers: list[HandlerSnapshot]
+
+    def as_dict(self) -> dict[str, Any]:
+        """Converts the snapshot to plain types, e.g. for `json.dumps`.
+
+        Returns:
+            dict[str, Any]: The snapshot.
+        """
+        return {
+            "name": self.name,
+            "filtered": self.filtered,
+            "dropped": self.dropped,
+            "queued": self.queued,
+            "handlers": [handler.as_dict() for handler in self.handlers],
+        }
+
+
+def snapshot(handler: Any, stats: Optional[HandlerStats], queued: int) -> HandlerSnapshot:
+    """Takes a snapshot of the stats of a sync or async handler.
+
+    Args:
+        handler (Any): The handler.
+        stats (Optional[HandlerStats]): The stats of the handler, if enabled.
+        queued (int): The number of records waiting in the handler's queue.
+
+    Returns:
+        HandlerSnapshot: The snapshot.
+    """
+    filtered = sum(filter_.dropped for filter_ in handler.filters)
+    dropped = getattr(handler, "dropped", 0)
+    if stats is None:
+        return HandlerSnapshot(
+            type(handler).__name__, False, {}, {}, 0, LatencyHistogram(), filtered, dropped, queued
+        )
+    with stats._lock:
+        return HandlerSnapshot(
+            type(handler).__name__,
+            True,
+            stats.records,
+            stats.bytes,
+            stats.errors,
+            stats.latency.copy(),
+            filtered,
+            dropped,
+            queued,
+        )
@@ -1,125 +1,414 @@
+import threading
+from typing import Any, Optional
+
+from tinylogging import config
+from tinylogging.config import HandlerSet
+from tinylogging.filters import BaseFilter
 from tinylogging.formatter import Formatter
 from tinylogging.level import Level
-from tinylogging.record import Record
+from tinylogging.message import Message, Style, render_message
+from tinylogging.record import CallerCapture, Record
+from tinylogging.stats import LoggerSnapshot
 from tinylogging.sync.handlers import (
     BaseHandler,
+    BinaryFileHandler,
     FileHandler,
+    FingersCrossedHandler,
     LoggingAdapterHandler,
+    QueueHandler,
+    RotatingFileHandler,
+    SocketHandler,
     StreamHandler,
     TelegramHandler,
 )
 
 __all__ = [
     "Logger",
+    "get_logger",
     "Formatter",
     "BaseHandler",
     "FileHandler",
+    "RotatingFileHandler",
+    "BinaryFileHandler",
     "LoggingAdapterHandler",
+    "QueueHandler",
+    "SocketHandler",
+    "FingersCrossedHandler",
     "TelegramHandler",
 ]
 
+# Looking up a member on an enum class is several times slower than a global.
+_TRACE = Level.TRACE
+_DEBUG = Level.DEBUG
+_INFO = Level.INFO
+_NOTICE = Level.NOTICE
+_WARNING = Level.WARNING
+_ERROR = Level.ERROR
+_CRITICAL = Level.CRITICAL
+
 
 class Logger:
     def __init__(
         self,
         name: str,
         level: Level = Level.NOTSET,
-        formatter: Formatter = Formatter(),
-        handlers: set[BaseHandler] = set(),
+        formatter: Optional[Formatter] = None,
+        handlers: Optional[set[BaseHandler]] = None,
+        caller: CallerCapture = CallerCapture.EAGER,
+        style: Style = "%",
+        parent: Optional["Logger"] = None,
+        propagate: bool = True,
+        filters: Optional[list[BaseFilter]] = None,
     ) -> None:
         """
         Initializes a new Logger instance.
 
         Args:
             name (str): The name of the logger.
-            level (Level, optional): The logging level. Defaults to Level.NOTSET.
-            formatter (Formatter, optional): The formatter for log messages. Defaults to Formatter().
-            handlers (set[BaseHandler], optional): A set of handlers for the logger. Defaults to an empty set.
+            level (Level, optional): The logging level. Defaults to Level.NOTSET, which
+                inherits the level of the parent logger.
+            formatter (Formatter, optional): The formatter for the logger's own stream handler.
+                Defaults to None.
+            handlers (set[BaseHandler], optional): A set of handlers for the logger. Defaults to
+                None, which means no handlers for a child logger, a stream handler with
+                `formatter` if one is given, and a stream handler shared by all loggers otherwise.
+                An empty set is treated like None.
+            caller (CallerCapture, optional): When to capture the call site of log records.
+                Defaults to CallerCapture.EAGER.
+            style (Style, optional): How deferred arguments are merged into messages,
+                `%` for `message % args` or `{` for `message.format(*args)`. Defaults to "%".
+            parent (Logger, optional): The parent logger to inherit the level and handlers from.
+                Defaults to None.
+            propagate (bool, optional): Whether records are also passed to the handlers of the
+                parent loggers. Defaults to True.
+            filters (list[BaseFilter], optional): Filters applied to records of this logger
+                before they are passed to any handler. Defaults to None.
         """
+        self._generation = -1
+        self._effective_level = 0
+        self._effective_handlers: tuple[BaseHandler, ...] = ()
         self.name = name
         self.level = level
-        self.formatter = formatter
-        self.is_disabled = False
-        self.handlers = handlers or {StreamHandler(self.formatter, self.level)}
+        self._is_disabled = False
+        self.caller = caller
+        self.style: Style = style
+        self.parent = parent
+        self.propagate = propagate
+        self.filters = list(filters or [])
+
+        if not handlers and parent is None:
+            if formatter is None:
+                handlers = {_get_default_handler()}
+            else:
+                handlers = {StreamHandler(formatter, self.level)}
+        self.handlers = handlers or set()
+        self.formatter = formatter or _get_default_handler().formatter
+
+    @property
+    def level(self) -> Level:
+        """
+        The logging level of the logger.
+        """
+        return self._level
+
+    @level.setter
+    def level(self, level: Level) -> None:
+        self._level = level
+        config.invalidate()
+
+    @property
+    def is_disabled(self) -> bool:
+        """
+        Whether the logger drops all records.
+        """
+        return self._is_disabled
 
-    def log(self, message: str, level: Level) -> None:
+    @is_disabled.setter
+    def is_disabled(self, is_disabled: bool) -> None:
+        self._is_disabled = is_disabled
+        # Only this logger is affected, so the cached level is recomputed on its next use.
+        self._generation = -1
+
+    @property
+    def parent(self) -> Optional["Logger"]:
+        """
+        The parent logger, whose level and handlers are inherited.
+        """
+        return self._parent
+
+    @parent.setter
+    def parent(self, parent: Optional["Logger"]) -> None:
+        self._parent = parent
+        config.invalidate()
+
+    @property
+    def propagate(self) -> bool:
+        """
+        Whether records are also passed to the handlers of the parent loggers.
+        """
+        return self._propagate
+
+    @propagate.setter
+    def propagate(self, propagate: bool) -> None:
+        self._propagate = propagate
+        config.invalidate()
+
+    @property
+    def handlers(self) -> HandlerSet[BaseHandler]:
+        """
+        The handlers of the logger. Changes to the set are picked up automatically.
+        """
+        return self._handlers
+
+    @handlers.setter
+    def handlers(self, handlers: set[BaseHandler]) -> None:
+        self._handlers: HandlerSet[BaseHandler] = HandlerSet(handlers)
+        config.invalidate()
+
+    def is_enabled_for(self, level: Level) -> bool:
+        """
+        Checks whether a message with the given level would be emitted by any handler.
+
+        Args:
+            level (Level): The level to check.
+
+        Returns:
+            bool: Whether the level is enabled.
+        """
+        if self._generation != config.generation:
+            self._update_effective_level()
+        return level >= self._effective_level
+
+    def get_effective_level(self) -> Level:
+        """
+        Gets the level of the logger, or of its nearest ancestor with a level set.
+
+        Returns:
+            Level: The effective level.
+        """
+        logger: Optional[Logger] = self
+        while logger is not None:
+            if logger.level is not Level.NOTSET:
+                return logger.level
+            logger = logger.parent
+        return Level.NOTSET
+
+    def _update_effective_level(self) -> None:
+        """
+        Recomputes the handlers records are passed to and the lowest level any of
+        them would emit.
+        """
+        self._generation = config.generation
+
+        handlers: list[BaseHandler] = []
+        logger: Optional[Logger] = self
+        while logger is not None:
+            handlers.extend(handler for handler in logger.handlers if handler not in handlers)
+            logger = logger.parent if logger.propagate else None
+        self._effective_handlers = tuple(handlers)
+
+        if self._is_disabled:
+            self._effective_level = max(Level) + 1
+        elif handlers:
+            level = self.get_effective_level()
+            self._effective_level = max(level, min(handler.level for handler in handlers))
+        else:
+            self._effective_level = max(Level) + 1
+
+    def log(self, message: Message, level: Level, *args: Any, stacklevel: int = 1) -> None:
         """
         Logs a message with the specified logging level.
 
         Args:
-            message (str): The message to log.
+            message (Message): The message to log, or a callable returning it.
             level (Level): The logging level for the message.
+            *args (Any): Deferred arguments, merged into the message only if it is logged.
+            stacklevel (int, optional): How many frames above the caller of this method
+                the call site is. Defaults to 1.
         """
-        if self.is_disabled or self.level > level:
+        if self._generation != config.generation:
+            self._update_effective_level()
+        if level < self._effective_level:
             return
 
-        record = Record(message, level, self.name)
+        record = Record(
+            render_message(message, args, self.style),
+            level,
+            self.name,
+            stacklevel=stacklevel + 1,
+            capture_caller=self._should_capture_caller(),
+        )
+
+        for filter_ in self.filters:
+            if record.time_ns >= filter_.due_ns:
+                self._release(record.time_ns)
+            filtered = filter_.filter(record)
+            if filtered is None:
+                return
+            record = filtered
 
-        for handler in self.handlers:
+        for handler in self._effective_handlers:
             handler.handle(record)
 
-    def trace(self, message: str) -> None:
+    def _release(self, now_ns: int) -> None:
+        """
+        Passes the records held back by the filters that are due to the handlers.
+
+        Args:
+            now_ns (int): The time of the record being logged.
+        """
+        for filter_ in self.filters:
+            if now_ns < filter_.due_ns:
+                continue
+            for record in filter_.release(now_ns):
+                for handler in self._effective_handlers:
+                    handler.handle(record)
+
+    def trace(self, message: Message, *args: Any) -> None:
         """
         Logs a message with TRACE level.
 
         Args:
-            message (str): The message to log.
+            message (Message): The message to log, or a callable returning it.
+            *args (Any): Deferred arguments, merged into the message only if it is logged.
         """
-        self.log(message, level=Level.TRACE)
+        if _TRACE < self._effective_level and self._generation == config.generation:
+            return
+        self.log(message, _TRACE, *args, stacklevel=2)
 
-    def debug(self, message: str) -> None:
+    def debug(self, message: Message, *args: Any) -> None:
         """
         Logs a message with DEBUG level.
 
         Args:
-            message (str): The message to log.
+            message (Message): The message to log, or a callable returning it.
+            *args (Any): Deferred arguments, merged into the message only if it is logged.
         """
-        self.log(message, level=Level.DEBUG)
+        if _DEBUG < self._effective_level and self._generation == config.generation:
+            return
+        self.log(message, _DEBUG, *args, stacklevel=2)
 
-    def info(self, message: str) -> None:
+    def info(self, message: Message, *args: Any) -> None:
         """
         Logs a message with INFO level.
 
         Args:
-            message (str): The message to log.
+            message (Message): The message to log, or a callable returning it.
+            *args (Any): Deferred arguments, merged into the message only if it is logged.
         """
-        self.log(message, level=Level.INFO)
+        if _INFO < self._effective_level and self._generation == config.generation:
+            return
+        self.log(message, _INFO, *args, stacklevel=2)
 
-    def notice(self, message: str) -> None:
+    def notice(self, message: Message, *args: Any) -> None:
         """
         Logs a message with NOTICE level.
 
         Args:
-            message (str): The message to log.
+            message (Message): The message to log, or a callable returning it.
+            *args (Any): Deferred arguments, merged into the message only if it is logged.
         """
-        self.log(message, level=Level.NOTICE)
+        if _NOTICE < self._effective_level and self._generation == config.generation:
+            return
+        self.log(message, _NOTICE, *args, stacklevel=2)
 
-    def warning(self, message: str) -> None:
+    def warning(self, message: Message, *args: Any) -> None:
         """
         Logs a message with WARNING level.
 
         Args:
-            message (str): The message to log.
+            message (Message): The message to log, or a callable returning it.
+            *args (Any): Deferred arguments, merged into the message only if it is logged.
         """
-        self.log(message, level=Level.WARNING)
+        if _WARNING < self._effective_level and self._generation == config.generation:
+            return
+        self.log(message, _WARNING, *args, stacklevel=2)
 
-    def error(self, message: str) -> None:
+    def error(self, message: Message, *args: Any) -> None:
         """
         Logs a message with ERROR level.
 
         Args:
-            message (str): The message to log.
+            message (Message): The message to log, or a callable returning it.
+            *args (Any): Deferred arguments, merged into the message only if it is logged.
         """
-        self.log(message, level=Level.ERROR)
+        if _ERROR < self._effective_level and self._generation == config.generation:
+            return
+        self.log(message, _ERROR, *args, stacklevel=2)
 
-    def critical(self, message: str) -> None:
+    def critical(self, message: Message, *args: Any) -> None:
         """
         Logs a message with CRITICAL level.
 
         Args:
-            message (str): The message to log.
+            message (Message): The message to log, or a callable returning it.
+            *args (Any): Deferred arguments, merged into the message only if it is logged.
+        """
+        if _CRITICAL < self._effective_level and self._generation == config.generation:
+            return
+        self.log(message, _CRITICAL, *args, stacklevel=2)
+
+    def enable_stats(self) -> None:
         """
-        self.log(message, level=Level.CRITICAL)
+        Enables stats on the handlers records of this logger are passed to,
+        and on the handlers wrapped by them.
+        """
+        for handler in self._stats_handlers():
+            handler.enable_stats()
+
+    def disable_stats(self) -> None:
+        """
+        Disables stats on the handlers records of this logger are passed to,
+        and on the handlers wrapped by them.
+        """
+        for handler in self._stats_handlers():
+            handler.disable_stats()
+
+    def stats(self) -> LoggerSnapshot:
+        """
+        Takes a snapshot of the stats of the logger and its handlers.
+
+        Returns:
+            LoggerSnapshot: The snapshot. Handlers are listed in the order records are
+                passed to them, followed by the handlers wrapped by them.
+        """
+        return LoggerSnapshot(
+            self.name,
+            sum(filter_.dropped for filter_ in self.filters),
+            0,
+            0,
+            [handler.snapshot() for handler in self._stats_handlers()],
+        )
+
+    def _stats_handlers(self) -> list[BaseHandler]:
+        """
+        Lists the handlers records are passed to and the handlers wrapped by them.
+
+        Returns:
+            list[BaseHandler]: The handlers.
+        """
+        if self._generation != config.generation:
+            self._update_effective_level()
+        handlers = list(self._effective_handlers)
+        for handler in handlers:
+            handlers.extend(wrapped for wrapped in handler._wrapped() if wrapped not in handlers)
+        return handlers
+
+    def _should_capture_caller(self) -> bool:
+        """
+        Checks whether the call site of a new record has to be captured.
+
+        Returns:
+            bool: Whether to capture the call site.
+        """
+        if self.caller is CallerCapture.EAGER:
+            return True
+        if self.caller is CallerCapture.OFF:
+            return False
+        return any(filter_.uses_caller for filter_ in self.filters) or any(
+            handler.formatter.uses_caller or any(filter_.uses_caller for filter_ in handler.filters)
+            for handler in self._effective_handlers
+        )
 
     def enable(self) -> None:
         """
@@ -132,3 +421,68 @@ class Logger:
         Disables the logger.
         """
         self.is_disabled = True
+
+
+_default_handler: Optional[StreamHandler] = None
+_registry: dict[str, Logger] = {}
+_registry_lock = threading.Lock()
+
+
+def _get_default_handler() -> StreamHandler:
+    """
+    Gets the stream handler shared by loggers created without handlers.
+
+    Returns:
+        StreamHandler: The shared stream handler.
+    """
+    global _default_handler
+    if _default_handler is None:
+        _default_handler = StreamHandler(Formatter())
+    return _default_handler
+
+
+def get_logger(name: Optional[str] = None) -> Logger:
+    """
+    Gets a logger by its dotted name, creating it and its ancestors if needed.
+
+    A logger named `a.b` is a child of `a`, and top-level loggers are children of
+    the root logger. Loggers inherit their level from the nearest ancestor with a
+    level set, and pass records to the handlers of their ancestors unless
+    `propagate` is `False`. Only the root logger has a handler by default.
+
+    Args:
+        name (Optional[str]): The dotted name of the logger. Defaults to None, the root logger.
+
+    Returns:
+        Logger: The logger with the given name.
+    """
+    name = name or "root"
+    logger = _registry.get(name)
+    if logger is not None:
+        return logger
+
+    with _registry_lock:
+        return _get_or_create_logger(name)
+
+
+def _get_or_create_logger(name: str) -> Logger:
+    """
+    Gets or creates a logger and its ancestors. Must be called with the registry lock held.
+
+    Args:
+        name (str): The dotted name of the logger.
+
+    Returns:
+        Logger: The logger with the given name.
+    """
+    logger = _registry.get(name)
+    if logger is not None:
+        return logger
+
+    if name == "root":
+        logger = Logger(name)
+    else:
+        parent_name = name.rpartition(".")[0] or "root"
+        logger = Logger(name, parent=_get_or_create_logger(parent_name))
+    _registry[name] = logger
+    return logger
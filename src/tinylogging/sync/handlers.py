@@ -1,22 +1,87 @@
+import atexit
+import io
+import itertools
 import logging
+import os
+import queue
+import signal
+import socket
 import sys
+import threading
+import time
+import traceback
+import weakref
 from abc import ABC, abstractmethod
-from typing import TextIO, Optional, Any
+from collections import deque
+from datetime import datetime, timedelta
+from typing import IO, Any, Iterable, Optional, TextIO
 
 import httpx
 
-from tinylogging.formatter import Formatter
+from tinylogging import config
+from tinylogging.binary import BinaryEncoder
+from tinylogging.buffer import BufferScope, RecordBuffers
+from tinylogging.filters import BaseFilter
+from tinylogging.formatter import Formatter, render, supports_color
+from tinylogging.helpers import coalesce_messages, get_retry_after
+from tinylogging.index import IndexWriter, encoded_size
 from tinylogging.level import Level
+from tinylogging.overflow import OverflowPolicy
 from tinylogging.record import Record
+from tinylogging.rotation import Compression, Rotator
+from tinylogging.stats import HandlerSnapshot, HandlerStats, snapshot
 
 __all__ = [
     "BaseHandler",
     "StreamHandler",
     "FileHandler",
+    "RotatingFileHandler",
+    "BinaryFileHandler",
     "LoggingAdapterHandler",
     "TelegramHandler",
+    "QueueHandler",
+    "SocketHandler",
+    "FingersCrossedHandler",
 ]
 
+# Handlers to close at interpreter exit, with the order they were registered in, and
+# handlers to reset in forked children. Both hold them weakly, so registering a
+# handler does not keep it alive.
+_exit_handlers: "weakref.WeakKeyDictionary[BaseHandler, int]" = weakref.WeakKeyDictionary()
+_exit_order = itertools.count()
+_fork_handlers: "weakref.WeakSet[SocketHandler | QueueHandler]" = weakref.WeakSet()
+
+
+def _close_at_exit(handler: "BaseHandler") -> None:
+    """Close a handler at interpreter exit unless it is closed or collected before.
+
+    Args:
+        handler (BaseHandler): The handler.
+    """
+    _exit_handlers[handler] = next(_exit_order)
+
+
+def _close_all() -> None:
+    """Close the registered handlers at interpreter exit.
+
+    Newer handlers are closed first, like `atexit` callbacks, so a handler wrapping
+    others is drained before they are closed.
+    """
+    handlers = sorted(_exit_handlers.items(), key=lambda item: item[1], reverse=True)
+    for handler, _ in handlers:
+        handler.close()
+
+
+def _reset_after_fork() -> None:
+    """Reset the registered handlers in a forked child."""
+    for handler in list(_fork_handlers):
+        handler._after_fork()
+
+
+atexit.register(_close_all)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
 
 class BaseHandler(ABC):
     """Abstract base class for all handlers.
@@ -24,6 +89,12 @@ class BaseHandler(ABC):
     Args:
         formatter (Formatter): Formatter instance to format the log records.
         level (Level): Logging level for the handler.
+
+    Attributes:
+        filters (list[BaseFilter]): Filters applied to records that pass the level check,
+            before they are formatted.
+        stats (Optional[HandlerStats]): Counters of emitted records, bytes, errors and
+            emit latency, collected only after `enable_stats` is called.
     """
 
     def __init__(
@@ -33,6 +104,18 @@ class BaseHandler(ABC):
     ) -> None:
         self.formatter = formatter
         self.level = level
+        self.filters: list[BaseFilter] = []
+        self.stats: Optional[HandlerStats] = None
+
+    @property
+    def level(self) -> Level:
+        """The logging level threshold for this handler."""
+        return self._level
+
+    @level.setter
+    def level(self, level: Level) -> None:
+        self._level = level
+        config.invalidate()
 
     @abstractmethod
     def emit(self, record: Record) -> None:
@@ -49,8 +132,107 @@ class BaseHandler(ABC):
         Args:
             record (Record): The log record to be handled.
         """
-        if record.level >= self.level:
+        if record.level < self.level:
+            return
+        for filter_ in self.filters:
+            if record.time_ns >= filter_.due_ns:
+                self._release(record.time_ns)
+            filtered = filter_.filter(record)
+            if filtered is None:
+                return
+            record = filtered
+
+        stats = self.stats
+        if stats is None:
+            self.emit(record)
+            return
+        start = time.perf_counter_ns()
+        try:
             self.emit(record)
+        except Exception:
+            stats.failed()
+            raise
+        stats.emitted(record.level, time.perf_counter_ns() - start)
+
+    def flush(self) -> None:
+        """Flush any buffered log records."""
+        self._release()
+
+    def close(self) -> None:
+        """Flush and release the resources held by the handler."""
+        self.flush()
+
+    def _release(self, now_ns: Optional[int] = None) -> None:
+        """Emit the records held back by the filters that are due.
+
+        Args:
+            now_ns (Optional[int]): The time of the record being handled, or `None` to
+                emit all held back records, when the handler is flushed or closed.
+        """
+        for filter_ in self.filters:
+            if now_ns is not None and now_ns < filter_.due_ns:
+                continue
+            for record in filter_.release(now_ns):
+                stats = self.stats
+                if stats is None:
+                    self.emit(record)
+                    continue
+                start = time.perf_counter_ns()
+                try:
+                    self.emit(record)
+                except Exception:
+                    stats.failed()
+                    raise
+                stats.emitted(record.level, time.perf_counter_ns() - start)
+
+    def enable_stats(self) -> HandlerStats:
+        """Start collecting stats, keeping those collected so far.
+
+        Returns:
+            HandlerStats: The stats of the handler.
+        """
+        if self.stats is None:
+            self.stats = HandlerStats()
+        return self.stats
+
+    def disable_stats(self) -> None:
+        """Stop collecting stats and forget those collected so far."""
+        self.stats = None
+
+    def snapshot(self) -> HandlerSnapshot:
+        """Take a snapshot of the stats of the handler.
+
+        Returns:
+            HandlerSnapshot: The snapshot.
+        """
+        return snapshot(self, self.stats, self._queued())
+
+    def _queued(self) -> int:
+        """Get the number of records waiting in the handler's queue.
+
+        Returns:
+            int: The number of records.
+        """
+        return 0
+
+    def _wrapped(self) -> Iterable["BaseHandler"]:
+        """Get the handlers this handler passes records to, for `Logger.stats`.
+
+        Returns:
+            Iterable[BaseHandler]: The wrapped handlers.
+        """
+        return ()
+
+    def _written(self, record: Record, message: Any) -> None:
+        """Count the bytes written for a record if stats are enabled.
+
+        Args:
+            record (Record): The log record.
+            message (Any): What was written for it, `str` or `bytes`.
+        """
+        if self.stats is not None:
+            size = len(message) if isinstance(message, bytes) else encoded_size(message)
+            self.stats.written(record.level, size)
 
 
 class StreamHandler(BaseHandler):
@@ -60,6 +242,8 @@ class StreamHandler(BaseHandler):
         formatter (Formatter): Formatter instance to format the log records.
         level (Level): Logging level for the handler.
         stream (Optional[TextIO]): Stream to write log records to.
+        colorize (Optional[bool]): Whether to keep the colors of the formatter. Defaults
+            to `None`, which keeps them only if the stream is a terminal, see `supports_color`.
     """
 
     def __init__(
@@ -67,9 +251,12 @@ class StreamHandler(BaseHandler):
         formatter: Formatter = Formatter(),
         level: Level = Level.NOTSET,
         stream: Optional[TextIO] = None,
+        colorize: Optional[bool] = None,
     ) -> None:
         super().__init__(formatter=formatter, level=level)
         self.stream = stream or sys.stdout  # type: TextIO
+        self.colorize = supports_color(self.stream) if colorize is None else colorize
+        self._lock = threading.Lock()
 
     def emit(self, record: Record) -> None:
         """Emit a log record to the stream.
@@ -77,18 +264,33 @@ class StreamHandler(BaseHandler):
         Args:
             record (Record): The log record to be emitted.
         """
-        message = self.formatter.format(record)
-        self.stream.write(message)
-        self.stream.flush()
+        message = render(self.formatter, record, self.colorize)
+        with self._lock:
+            self.stream.write(message)
+            self.stream.flush()
+        self._written(record, message)
 
 
 class FileHandler(BaseHandler):
     """Handler for writing log records to a file.
 
+    The file is opened on the first record and kept open. Writes are buffered
+    and flushed every `flush_every` records, every `flush_interval` seconds,
+    on any record at or above `flush_level`, and when the handler is closed.
+
     Args:
         file_name (str): Name of the file to write log records to.
         level (Level): Logging level for the handler.
         formatter (Formatter): Formatter instance to format the log records.
+        buffer_size (int): Size of the write buffer in bytes.
+        flush_every (int): Flush after this many records. `0` disables count-based flushing.
+        flush_interval (Optional[float]): Flush at least this often, in seconds.
+        flush_level (Level): Flush on any record at or above this level.
+        reopen_signal (Optional[int]): Signal that makes the handler reopen the file,
+            e.g. `signal.SIGHUP` after an external logrotate. Must be installed
+            from the main thread.
+        index (bool): Whether to maintain a sidecar time/level index (`<file_name>.idx`)
+            for `LogIndex` and `python -m tinylogging query`.
     """
 
     def __init__(
@@ -96,9 +298,45 @@ class FileHandler(BaseHandler):
         file_name: str,
         level: Level = Level.NOTSET,
         formatter: Formatter = Formatter(colorize=False),
+        buffer_size: int = io.DEFAULT_BUFFER_SIZE,
+        flush_every: int = 1,
+        flush_interval: Optional[float] = None,
+        flush_level: Level = Level.ERROR,
+        reopen_signal: Optional[int] = None,
+        index: bool = False,
     ) -> None:
         super().__init__(formatter=formatter, level=level)
         self.file_name = file_name
+        self.buffer_size = buffer_size
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.flush_level = flush_level
+        self.file: Optional[IO[Any]] = None
+        self.indexer = IndexWriter(file_name) if index else None
+        self._lock = threading.RLock()
+        self._pending = 0
+        self._reopen = False
+        self._closed = threading.Event()
+
+        if reopen_signal is not None:
+            previous = signal.getsignal(reopen_signal)
+
+            def on_signal(signum: int, frame: Any) -> None:
+                self._reopen = True
+                if callable(previous):
+                    previous(signum, frame)
+
+            signal.signal(reopen_signal, on_signal)
+
+        if flush_interval is not None:
+            threading.Thread(
+                target=_flush_periodically,
+                args=(weakref.ref(self), self._closed, flush_interval),
+                name=f"tinylogging-flush-{file_name}",
+                daemon=True,
+            ).start()
+
+        _close_at_exit(self)
 
     def emit(self, record: Record) -> None:
         """Emit a log record to the file.
@@ -107,14 +345,238 @@ class FileHandler(BaseHandler):
             record (Record): The log record to be emitted.
         """
         message = self.formatter.format(record)
-        with open(self.file_name, "a", encoding="utf-8") as f:
-            f.write(message)
-            f.flush()
+        with self._lock:
+            self._write(record, message)
+
+    def reopen(self) -> None:
+        """Close the file so that the next record reopens it by name."""
+        with self._lock:
+            self._close_file()
+
+    def flush(self) -> None:
+        """Write the buffered log records to the file."""
+        self._release()
+        with self._lock:
+            self._flush()
+
+    def close(self) -> None:
+        """Flush the buffered log records and close the file."""
+        self._release()
+        self._closed.set()
+        _exit_handlers.pop(self, None)
+        with self._lock:
+            self._close_file()
+
+    def _ensure_open(self) -> IO[Any]:
+        """Open the file if it is not open, reopening it first if requested.
+
+        Must be called with the handler's lock held.
+
+        Returns:
+            IO[Any]: The open file.
+        """
+        if self._reopen:
+            self._reopen = False
+            self._close_file()
+        if self.file is None:
+            self.file = self._open()
+        return self.file
+
+    def _write(self, record: Record, message: Any) -> None:
+        """Write a formatted log record and flush it if the flush policy says so.
+
+        Must be called with the handler's lock held.
+
+        Args:
+            record (Record): The log record being emitted.
+            message (Any): The formatted log record, `str` or `bytes` depending on the file mode.
+        """
+        self._ensure_open().write(message)
+        self._pending += 1
+        self._written(record, message)
+        if self.indexer is not None:
+            self.indexer.add(record.time_ns, record.level, encoded_size(message))
+
+        if record.level >= self.flush_level or (
+            self.flush_every and self._pending >= self.flush_every
+        ):
+            self._flush()
+
+    def _open(self) -> IO[Any]:
+        """Open the log file for appending.
+
+        Returns:
+            IO[Any]: The opened file.
+        """
+        file = open(self.file_name, "a", encoding="utf-8", buffering=self.buffer_size)
+        if self.indexer is not None:
+            self.indexer.open(self.formatter, file.tell())
+        return file
+
+    def _flush(self) -> None:
+        if self.file is not None and self._pending:
+            self.file.flush()
+            if self.indexer is not None:
+                self.indexer.flush()
+        self._pending = 0
+
+    def _close_file(self) -> None:
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+            if self.indexer is not None:
+                self.indexer.close()
+        self._pending = 0
+
+
+def _flush_periodically(
+    ref: "weakref.ReferenceType[FileHandler]", closed: threading.Event, interval: float
+) -> None:
+    """Flush a file handler every `interval` seconds until it is closed or collected.
+
+    Args:
+        ref (weakref.ReferenceType[FileHandler]): A weak reference to the handler, so the
+            thread does not keep it alive.
+        closed (threading.Event): The event set when the handler is closed.
+        interval (float): The number of seconds between flushes.
+    """
+    while not closed.wait(interval):
+        handler = ref()
+        if handler is None:
+            return
+        handler.flush()
+        del handler
+
+
+class RotatingFileHandler(FileHandler):
+    """Handler for writing log records to a file that rotates by size and/or time.
+
+    Rotated files are named `<file_name>.<YYYYmmdd-HHMMSS-ffffff>`. Compressing them and
+    removing those beyond `backup_count` happens on a background thread.
+
+    Args:
+        file_name (str): Name of the file to write log records to.
+        max_bytes (Optional[int]): Rotate before the file would exceed this size.
+        interval (Optional[timedelta]): Rotate at multiples of this interval,
+            counted from local midnight.
+        backup_count (int): Number of rotated files to keep. `0` keeps all of them.
+        compression (Optional[Compression]): Compression for rotated files.
+        **kwargs: Additional keyword arguments for `FileHandler`.
+    """
+
+    def __init__(
+        self,
+        file_name: str,
+        max_bytes: Optional[int] = None,
+        interval: Optional[timedelta] = None,
+        backup_count: int = 5,
+        compression: Optional[Compression] = None,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(file_name, **kwargs)
+        self.rotator = Rotator(file_name, max_bytes, interval, backup_count, compression)
+
+    def rollover(self) -> None:
+        """Rotate the file now."""
+        with self._lock:
+            self._close_file()
+            self.rotator.rollover(datetime.now())
+
+    def _write(self, record: Record, message: str) -> None:
+        size = self.rotator.measure(message)
+        if self.file is not None and self.rotator.should_rollover(record.time_ns, size):
+            self._close_file()
+            self.rotator.rollover(record.time)
+        super()._write(record, message)
+        self.rotator.written(size)
+
+    def _open(self) -> IO[Any]:
+        file = super()._open()
+        self.rotator.start(datetime.now())
+        return file
+
+
+class BinaryFileHandler(FileHandler):
+    """Handler for writing log records to a binary log file.
+
+    Records are written unformatted in the layout described by `BinaryEncoder`,
+    with logger names and call sites interned per session. Use `BinaryLogReader`
+    to read them back and a `Formatter` to render them.
+
+    Args:
+        file_name (str): Name of the file to write log records to.
+        **kwargs: Additional keyword arguments for `FileHandler`.
+    """
+
+    def __init__(self, file_name: str, **kwargs: Any) -> None:
+        if kwargs.get("index"):
+            raise ValueError("Binary logs are filtered by BinaryLogReader and cannot be indexed")
+        super().__init__(file_name, **kwargs)
+        self.encoder = BinaryEncoder()
+
+    def emit(self, record: Record) -> None:
+        """Emit a log record to the file.
+
+        Args:
+            record (Record): The log record to be emitted.
+        """
+        with self._lock:
+            # Opening the file starts a new session, so it must happen before encoding.
+            self._ensure_open()
+            self._write(record, self.encoder.encode(record))
+
+    def _open(self) -> IO[Any]:
+        file = open(self.file_name, "ab", buffering=self.buffer_size)
+        file.write(self.encoder.session())
+        return file
+
+
+_STDLIB_LEVELS: dict[int, Level] = {
+    logging.NOTSET: Level.NOTSET,
+    5: Level.TRACE,
+    logging.DEBUG: Level.DEBUG,
+    logging.INFO: Level.INFO,
+    25: Level.NOTICE,
+    logging.WARNING: Level.WARNING,
+    logging.ERROR: Level.ERROR,
+    logging.CRITICAL: Level.CRITICAL,
+}
+
+_LEVEL_TABLE: tuple[Level, ...] = tuple(
+    _STDLIB_LEVELS[max(known for known in _STDLIB_LEVELS if known <= levelno)]
+    for levelno in range(logging.CRITICAL + 1)
+)
+"""The level of each standard library level number up to `logging.CRITICAL`: the
+highest level whose standard library equivalent is not above it."""
+
+_exception_formatter = logging.Formatter()
+
+
+def _stdlib_level(levelno: int) -> Level:
+    """Maps a standard library level number, including custom ones, to a level.
+
+    Args:
+        levelno (int): The level number, e.g. `logging.INFO` or `25`.
+
+    Returns:
+        Level: The highest level whose standard library equivalent is not above it.
+    """
+    if levelno < 0:
+        return Level.NOTSET
+    if levelno > logging.CRITICAL:
+        return Level.CRITICAL
+    return _LEVEL_TABLE[levelno]
 
 
 class LoggingAdapterHandler(logging.Handler):
     """Adapter handler to integrate with the standard logging module.
 
+    Records are built from the fields of the `logging.LogRecord` without inspecting
+    the stack, and `msg % args` is only rendered once the record passes the level
+    of the custom handler. Tracebacks of `exc_info` and `stack_info` are appended to
+    the message like the standard library does. If a formatter is set with
+    `setFormatter`, it renders the message instead.
+
     Args:
         handler (BaseHandler): Custom handler to delegate log records to.
     """
@@ -132,28 +594,63 @@ class LoggingAdapterHandler(logging.Handler):
         Args:
             record (logging.LogRecord): The log record to be emitted.
         """
-        level = Level[record.levelname]  # cspell: disable-line
-        custom_record = Record(
-            message=self.format(record),
-            level=level,
-            name=record.name,
+        level = _stdlib_level(record.levelno)
+        if level < self.custom_handler.level:
+            return
+
+        # `msecs` is rounded to whole milliseconds since Python 3.12, `created` is not.
+        seconds = int(record.created)
+        self.custom_handler.handle(
+            Record.from_fields(
+                self._render(record),
+                level,
+                record.name,
+                seconds * 1_000_000_000 + int((record.created - seconds) * 1e9),
+                record.pathname,
+                record.lineno,
+                record.funcName,
+            )
         )
 
-        custom_record.filename = record.filename
-        custom_record.function = record.funcName
-        custom_record.line = record.lineno
+    def _render(self, record: logging.LogRecord) -> str:
+        """Render the message of a log record with its traceback, if any.
+
+        Args:
+            record (logging.LogRecord): The log record.
+
+        Returns:
+            str: The message.
+        """
+        if self.formatter is not None:
+            return self.format(record)
 
-        self.custom_handler.handle(custom_record)
+        message = record.getMessage()
+        if record.exc_info and not record.exc_text:
+            record.exc_text = _exception_formatter.formatException(record.exc_info)
+        if record.exc_text:
+            message = f"{message}\n{record.exc_text}"
+        if record.stack_info:
+            message = f"{message}\n{_exception_formatter.formatStack(record.stack_info)}"
+        return message
 
 
 class TelegramHandler(BaseHandler):
     """Handler for sending log records to a Telegram chat.
 
+    Messages are sent through one long-lived HTTP client. With a `batch_interval`,
+    records arriving within that window are joined into as few messages as the
+    Telegram length limit allows and sent from a background thread. When the API
+    answers `429 Too Many Requests`, messages are queued and sent once
+    `retry_after` has passed.
+
     Args:
         token (str): Telegram bot token.
         chat_id (int | str): Chat ID to send messages to.
         ignore_errors (bool): Whether to ignore errors when sending messages.
         message_thread_id (Optional[int]): ID of the message thread.
+        batch_interval (float): Seconds to collect records before sending them together.
+            `0` sends each record right away.
+        client (Optional[httpx.Client]): HTTP client to send messages with.
         **kwargs: Additional keyword arguments for the base handler.
     """
 
@@ -163,6 +660,8 @@ class TelegramHandler(BaseHandler):
         chat_id: int | str,
         ignore_errors: bool = False,
         message_thread_id: Optional[int] = None,
+        batch_interval: float = 0.0,
+        client: Optional[httpx.Client] = None,
         **kwargs: Any,
     ) -> None:
         super().__init__(**kwargs)
@@ -170,7 +669,19 @@ class TelegramHandler(BaseHandler):
         self.chat_id = chat_id
         self.message_thread_id = message_thread_id
         self.ignore_errors = ignore_errors
+        self.batch_interval = batch_interval
         self.api_url = f"https://api.telegram.org/bot{self.token}/sendMessage"
+        self.client = client or httpx.Client()
+        self._owns_client = client is None
+        self._pending: deque[str] = deque()
+        self._in_flight = 0
+        self._retry_at = 0.0
+        self._flushing = False
+        self._closed = False
+        self._condition = threading.Condition()
+        self._sender: Optional[threading.Thread] = None
+
+        _close_at_exit(self)
 
     def emit(self, record: Record) -> None:
         """Emit a log record to the Telegram chat.
@@ -178,11 +689,61 @@ class TelegramHandler(BaseHandler):
         Args:
             record (Record): The log record to be emitted.
         """
-        _colorize = self.formatter.colorize
-        self.formatter.colorize = False
-        text = self.formatter.format(record)
-        self.formatter.colorize = _colorize
+        text = render(self.formatter, record, colorize=False)
+        self._written(record, text)
+
+        with self._condition:
+            if (
+                self.batch_interval > 0
+                or self._pending
+                or self._in_flight
+                or time.monotonic() < self._retry_at
+            ):
+                self._enqueue([text])
+                return
+
+        if not self._send(text):
+            with self._condition:
+                self._enqueue([text], front=True)
+
+    def flush(self) -> None:
+        """Send all queued messages, waiting out rate limits if needed."""
+        self._release()
+        with self._condition:
+            if self._sender is None:
+                return
+            self._flushing = True
+            self._condition.notify_all()
+            while self._pending or self._in_flight:
+                self._condition.wait()
+            self._flushing = False
+
+    def close(self) -> None:
+        """Send all queued messages and close the HTTP client."""
+        if self._closed:
+            return
+        self._release()
+        _exit_handlers.pop(self, None)
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        if self._sender is not None:
+            self._sender.join()
+        if self._owns_client:
+            self.client.close()
+
+    def _queued(self) -> int:
+        return len(self._pending) + self._in_flight
 
+    def _send(self, text: str) -> bool:
+        """Send a message to the Telegram chat.
+
+        Args:
+            text (str): The message to send.
+
+        Returns:
+            bool: `False` if the API is rate-limiting the bot, `True` otherwise.
+        """
         data = {
             "chat_id": self.chat_id,
             "text": text,
@@ -190,8 +751,499 @@ class TelegramHandler(BaseHandler):
             "parse_mode": "HTML",
         }
 
-        with httpx.Client() as client:
-            response = client.post(self.api_url, json=data)
+        response = self.client.post(self.api_url, json=data)
+
+        retry_after = get_retry_after(response)
+        if retry_after is not None:
+            with self._condition:
+                self._retry_at = time.monotonic() + retry_after
+            return False
+
+        if not self.ignore_errors:
+            response.raise_for_status()
+        elif response.is_error and self.stats is not None:
+            self.stats.failed()
+        return True
+
+    def _enqueue(self, texts: list[str], front: bool = False) -> None:
+        """Queue messages for the sender thread.
+
+        Must be called with the handler's condition held.
+
+        Args:
+            texts (list[str]): The messages to queue, in order.
+            front (bool): Whether to queue them before the already queued messages.
+        """
+        if front:
+            self._pending.extendleft(reversed(texts))
+        else:
+            self._pending.extend(texts)
+        if self._sender is None:
+            self._sender = threading.Thread(
+                target=self._run_sender,
+                name="tinylogging-telegram",
+                daemon=True,
+            )
+            self._sender.start()
+        self._condition.notify_all()
+
+    def _run_sender(self) -> None:
+        """Sender loop that batches queued messages and honors rate limits."""
+        while True:
+            with self._condition:
+                while not self._pending and not self._closed:
+                    self._condition.wait()
+                if not self._pending:
+                    return
+
+                deadline = time.monotonic() + self.batch_interval
+                while True:
+                    if self._closed or self._flushing:
+                        deadline = 0.0
+                    remaining = max(deadline, self._retry_at) - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+
+                messages = coalesce_messages(self._pending)
+                self._pending.clear()
+                self._in_flight = len(messages)
+
+            for index, message in enumerate(messages):
+                try:
+                    sent = self._send(message)
+                except Exception:
+                    traceback.print_exc(file=sys.stderr)
+                    if self.stats is not None:
+                        self.stats.failed()
+                    sent = True
+                if not sent:
+                    with self._condition:
+                        self._pending.extendleft(reversed(messages[index:]))
+                    break
+
+            with self._condition:
+                self._in_flight = 0
+                self._condition.notify_all()
+
+
+class SocketHandler(BaseHandler):
+    """Handler for sending log records to a `LogAggregator` over a Unix domain socket.
+
+    The calling thread only queues the record. A background thread sends everything
+    queued since its last send in one call, unformatted, in the layout of
+    `BinaryEncoder`. When the aggregator is unreachable, the thread reconnects with
+    exponential backoff and resends the batch that was in flight, so records are
+    kept while the queue has room, but may arrive twice. In a child process created
+    by `os.fork`, the handler starts over with an empty queue and its own connection.
+
+    Args:
+        address (str): Path of the aggregator's Unix domain socket.
+        level (Level): Logging level for the handler.
+        maxsize (int): Maximum number of queued records. `0` means unbounded.
+        overflow (OverflowPolicy): What to do when the queue is full.
+        batch_size (int): Maximum number of records sent in one call.
+        reconnect_max (float): Longest wait between reconnection attempts, in seconds.
+        close_timeout (float): How long `close` keeps trying to deliver queued records
+            to an unreachable aggregator, in seconds.
+    """
+
+    def __init__(
+        self,
+        address: str,
+        level: Level = Level.NOTSET,
+        maxsize: int = 100_000,
+        overflow: OverflowPolicy = OverflowPolicy.BLOCK,
+        batch_size: int = 1000,
+        reconnect_max: float = 5.0,
+        close_timeout: float = 5.0,
+    ) -> None:
+        super().__init__(level=level)
+        self.address = address
+        self.maxsize = maxsize
+        self.overflow = overflow
+        self.batch_size = batch_size
+        self.reconnect_max = reconnect_max
+        self.close_timeout = close_timeout
+        self.dropped = 0
+        self._closed = False
+        self._reset()
+
+        _fork_handlers.add(self)
+        _close_at_exit(self)
+
+    def emit(self, record: Record) -> None:
+        """Queue a log record for the sender thread.
+
+        Args:
+            record (Record): The log record to be emitted.
+        """
+        with self._condition:
+            if self.maxsize and len(self._pending) >= self.maxsize:
+                if self.overflow is OverflowPolicy.DROP_NEWEST:
+                    self.dropped += 1
+                    return
+                if self.overflow is OverflowPolicy.DROP_OLDEST:
+                    self._pending.popleft()
+                    self.dropped += 1
+                else:
+                    while len(self._pending) >= self.maxsize and not self._closed:
+                        self._condition.wait()
+            self._pending.append(record)
+            if self._sender is None:
+                self._sender = threading.Thread(
+                    target=self._run_sender,
+                    name="tinylogging-socket",
+                    daemon=True,
+                )
+                self._sender.start()
+            self._condition.notify_all()
+
+    def flush(self) -> None:
+        """Wait until all queued records are sent."""
+        self._release()
+        with self._condition:
+            while self._sender is not None and (self._pending or self._in_flight):
+                self._condition.wait()
+
+    def close(self) -> None:
+        """Send the queued records and close the connection."""
+        if self._closed:
+            return
+        self._release()
+        _exit_handlers.pop(self, None)
+        _fork_handlers.discard(self)
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        if self._sender is not None:
+            self._sender.join()
+        self._disconnect()
+
+    def _queued(self) -> int:
+        return len(self._pending) + self._in_flight
+
+    def _reset(self) -> None:
+        """Create the queue, lock and encoder state of a fresh handler."""
+        self._pending: deque[Record] = deque()
+        self._in_flight = 0
+        self._condition = threading.Condition()
+        self._sender: Optional[threading.Thread] = None
+        self._socket: Optional[socket.socket] = None
+        self._encoder = BinaryEncoder()
+
+    def _after_fork(self) -> None:
+        """Forget the parent's queue, sender thread and connection in a forked child."""
+        if self._socket is not None:
+            # Only closes the child's copy; the parent's connection stays open.
+            self._socket.close()
+        self._reset()
+
+    def _run_sender(self) -> None:
+        """Sender loop that sends the queued records in batches."""
+        while True:
+            with self._condition:
+                while not self._pending and not self._closed:
+                    self._condition.wait()
+                if not self._pending:
+                    return
+                count = min(len(self._pending), self.batch_size)
+                batch = [self._pending.popleft() for _ in range(count)]
+                self._in_flight = count
+                self._condition.notify_all()
+
+            try:
+                self._deliver(batch)
+            except Exception:
+                # Keep the sender alive; a new session resyncs the interned names.
+                traceback.print_exc(file=sys.stderr)
+                if self.stats is not None:
+                    self.stats.failed(len(batch))
+                self._disconnect()
+            finally:
+                with self._condition:
+                    self._in_flight = 0
+                    self._condition.notify_all()
+
+    def _deliver(self, batch: list[Record]) -> None:
+        """Send a batch of records, reconnecting until it is sent.
+
+        Records that fail to encode are dropped, counted in the stats and printed to
+        `sys.stderr`. Once the handler is closed, gives up after `close_timeout` seconds.
+
+        Args:
+            batch (list[Record]): The records to send.
+        """
+        delay = 0.05
+        deadline: Optional[float] = None
+        while True:
+            try:
+                if self._socket is None:
+                    self._connect()
+                assert self._socket is not None
+                batch, chunks = self._encode(batch)
+                self._socket.sendall(b"".join(chunks))
+                if self.stats is not None:
+                    for record, chunk in zip(batch, chunks):
+                        self._written(record, chunk)
+                return
+            except OSError:
+                self._disconnect()
+
+            if self._closed:
+                if deadline is None:
+                    deadline = time.monotonic() + self.close_timeout
+                if time.monotonic() >= deadline:
+                    self.dropped += len(batch)
+                    print(
+                        f"tinylogging: dropped {len(batch)} records, {self.address} is unreachable",
+                        file=sys.stderr,
+                    )
+                    return
+            time.sleep(delay)
+            delay = min(delay * 2, self.reconnect_max)
+
+    def _encode(self, batch: list[Record]) -> tuple[list[Record], list[bytes]]:
+        """Encode a batch of records, dropping those that fail to encode.
+
+        Args:
+            batch (list[Record]): The records to encode.
+
+        Returns:
+            tuple[list[Record], list[bytes]]: The encoded records and their encoding.
+        """
+        encode = self._encoder.encode
+        records: list[Record] = []
+        chunks: list[bytes] = []
+        for record in batch:
+            try:
+                chunks.append(encode(record))
+            except Exception:
+                traceback.print_exc(file=sys.stderr)
+                if self.stats is not None:
+                    self.stats.failed()
+                continue
+            records.append(record)
+        return records, chunks
+
+    def _connect(self) -> None:
+        """Connect to the aggregator and start a new session."""
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.connect(self.address)
+            sock.sendall(self._encoder.session())
+        except OSError:
+            sock.close()
+            raise
+        self._socket = sock
+
+    def _disconnect(self) -> None:
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+
+
+class QueueHandler(BaseHandler):
+    """Handler that hands log records to worker threads through a bounded queue.
+
+    The calling thread only enqueues the record; the worker threads pass it to
+    the wrapped handlers. With more than one worker, records may be emitted out
+    of order. The queue is drained when the handler is closed, and at interpreter
+    exit unless `flush_at_exit` is `False`. In a child process created by `os.fork`,
+    the handler starts over with an empty queue and its own worker threads.
+
+    Args:
+        handlers (set[BaseHandler]): Handlers to dispatch log records to.
+        level (Level): Logging level for the handler.
+        maxsize (int): Maximum number of queued records. `0` means unbounded.
+        workers (int): Number of worker threads.
+        overflow (OverflowPolicy): What to do when the queue is full.
+        flush_at_exit (bool): Whether to drain the queue at interpreter exit.
+    """
+
+    def __init__(
+        self,
+        handlers: set[BaseHandler],
+        level: Level = Level.NOTSET,
+        maxsize: int = 10_000,
+        workers: int = 1,
+        overflow: OverflowPolicy = OverflowPolicy.BLOCK,
+        flush_at_exit: bool = True,
+    ) -> None:
+        super().__init__(level=level)
+        self.handlers = handlers
+        self.overflow = overflow
+        self.dropped = 0
+        self.maxsize = maxsize
+        self.workers = workers
+        self._closed = False
+        self._start()
+
+        _fork_handlers.add(self)
+        if flush_at_exit:
+            _close_at_exit(self)
+
+    def emit(self, record: Record) -> None:
+        """Enqueue a log record for the worker threads.
+
+        Once the handler is closed, records are dispatched on the calling thread.
+
+        Args:
+            record (Record): The log record to be emitted.
+        """
+        if self._closed:
+            self._dispatch(record)
+        elif self.overflow is OverflowPolicy.BLOCK:
+            self.queue.put(record)
+        elif self.overflow is OverflowPolicy.DROP_NEWEST:
+            try:
+                self.queue.put_nowait(record)
+            except queue.Full:
+                self.dropped += 1
+        else:
+            while True:
+                try:
+                    self.queue.put_nowait(record)
+                    return
+                except queue.Full:
+                    pass
+                try:
+                    self.queue.get_nowait()
+                except queue.Empty:
+                    continue
+                self.queue.task_done()
+                self.dropped += 1
+
+    def flush(self) -> None:
+        """Wait until all queued records are emitted and flush the wrapped handlers."""
+        self._release()
+        self.queue.join()
+        for handler in self.handlers:
+            handler.flush()
+
+    def close(self) -> None:
+        """Drain the queue, stop the worker threads and flush the wrapped handlers."""
+        if self._closed:
+            return
+        self._release()
+        self._closed = True
+        _exit_handlers.pop(self, None)
+        _fork_handlers.discard(self)
+
+        for _ in self._workers:
+            self.queue.put(None)
+        for worker in self._workers:
+            worker.join()
+        for handler in self.handlers:
+            handler.flush()
+
+    def _queued(self) -> int:
+        return self.queue.qsize()
+
+    def _wrapped(self) -> Iterable[BaseHandler]:
+        return self.handlers
+
+    def _start(self) -> None:
+        """Create the queue and start the worker threads."""
+        self.queue: queue.Queue[Optional[Record]] = queue.Queue(self.maxsize)
+        self._workers = [
+            threading.Thread(target=self._work, name=f"tinylogging-queue-{i}", daemon=True)
+            for i in range(self.workers)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def _after_fork(self) -> None:
+        """Replace the parent's queue and worker threads in a forked child, where the
+        workers do not exist and nobody would drain the queue.
+        """
+        self._start()
+
+    def _dispatch(self, record: Record) -> None:
+        """Pass a log record to the wrapped handlers.
+
+        Errors raised by a handler are printed to `sys.stderr` so that a failing
+        handler neither stops the worker nor the other handlers.
+
+        Args:
+            record (Record): The log record to be dispatched.
+        """
+        for handler in self.handlers:
+            try:
+                handler.handle(record)
+            except Exception:
+                traceback.print_exc(file=sys.stderr)
+
+    def _work(self) -> None:
+        """Worker loop that drains the queue until it receives a stop sentinel."""
+        while True:
+            record = self.queue.get()
+            try:
+                if record is None:
+                    return
+                self._dispatch(record)
+            finally:
+                self.queue.task_done()
+
+
+class FingersCrossedHandler(BaseHandler):
+    """Handler that keeps recent records back and passes them on only when an error occurs.
+
+    The last `capacity` records are kept unformatted in a ring buffer per logger, or
+    per thread or asyncio task with `BufferScope.CONTEXT`. When a record at or above
+    `trigger` arrives, the buffered records of its scope and then the record itself
+    are passed to the wrapped handler, which formats them. Records are buffered again
+    afterwards.
+
+    Args:
+        handler (BaseHandler): Handler to pass the records to.
+        trigger (Level): Level of records that flush the buffer.
+        capacity (int): Number of records kept per buffer.
+        scope (BufferScope): Which records share a buffer.
+        level (Level): Logging level for the handler.
+    """
+
+    def __init__(
+        self,
+        handler: BaseHandler,
+        trigger: Level = Level.ERROR,
+        capacity: int = 1000,
+        scope: BufferScope = BufferScope.LOGGER,
+        level: Level = Level.NOTSET,
+    ) -> None:
+        # Shares the formatter so that loggers capture the call site if it needs one.
+        super().__init__(formatter=handler.formatter, level=level)
+        self.handler = handler
+        self.trigger = trigger
+        self.buffers = RecordBuffers(capacity, scope)
+
+    def emit(self, record: Record) -> None:
+        """Buffer a log record, or pass the buffer and the record on if it is at or above `trigger`.
+
+        Args:
+            record (Record): The log record to be emitted.
+        """
+        if record.level < self.trigger:
+            self.buffers.append(record)
+            return
+        for buffered in self.buffers.drain(record):
+            self.handler.handle(buffered)
+        self.handler.handle(record)
+
+    def clear(self) -> None:
+        """Discard the buffered records, e.g. after a request finished without errors."""
+        self.buffers.clear()
+
+    def flush(self) -> None:
+        """Flush the wrapped handler. Buffered records are kept back."""
+        self._release()
+        self.handler.flush()
+
+    def close(self) -> None:
+        """Close the wrapped handler. Buffered records are discarded."""
+        self._release()
+        self.buffers.clear()
+        self.handler.close()
 
-            if not self.ignore_errors:
-                response.raise_for_status()
+    def _wrapped(self) -> Iterable[BaseHandler]:
+        return (self.handler,)
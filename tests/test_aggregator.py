@@ -0,0 +1,85 @@
+import os
+
+import pytest
+
+from tinylogging import FileHandler, Formatter, LogAggregator, Logger, SocketHandler
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "fork"), reason="needs os.fork")
+
+WORKERS = 4
+RECORDS = 2_000
+
+
+def run_workers(handler: SocketHandler) -> None:
+    """Forks workers that each log `RECORDS` numbered records through `handler`."""
+    pids = []
+    for worker in range(WORKERS):
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                logger = Logger(f"worker-{worker}", handlers={handler})
+                for i in range(RECORDS):
+                    logger.info("%d", i)
+                handler.close()
+            except BaseException:
+                code = 1
+            finally:
+                os._exit(code)
+        pids.append(pid)
+
+    for pid in pids:
+        _, status = os.waitpid(pid, 0)
+        assert os.waitstatus_to_exitcode(status) == 0
+
+
+def read_lines(file_name: str) -> dict[str, list[int]]:
+    sequences: dict[str, list[int]] = {}
+    with open(file_name) as file:
+        for line in file:
+            name, number = line.split()
+            sequences.setdefault(name, []).append(int(number))
+    return sequences
+
+
+@pytest.mark.parametrize("late_start", [False, True], ids=["started", "late-start"])
+def test_no_records_lost_across_workers(tmp_path, late_start: bool) -> None:
+    address = str(tmp_path / "log.sock")
+    file_name = str(tmp_path / "app.log")
+    file_handler = FileHandler(
+        file_name,
+        formatter=Formatter(template="{name} {message}", colorize=False),
+        flush_every=0,
+    )
+    aggregator = LogAggregator(address, {file_handler})
+    # Created before the fork, like a logger of a preloaded app in a prefork server.
+    handler = SocketHandler(address, close_timeout=30.0)
+    if not late_start:
+        aggregator.start()
+
+    try:
+        if late_start:
+            # The workers queue their records and reconnect once the aggregator is up.
+            pid = os.fork()
+            if pid == 0:
+                code = 0
+                try:
+                    run_workers(handler)
+                except BaseException:
+                    code = 1
+                finally:
+                    os._exit(code)
+            aggregator.start()
+            _, status = os.waitpid(pid, 0)
+            assert os.waitstatus_to_exitcode(status) == 0
+        else:
+            run_workers(handler)
+    finally:
+        aggregator.close()
+        file_handler.close()
+        handler.close()
+
+    assert aggregator.received == WORKERS * RECORDS
+    sequences = read_lines(file_name)
+    assert sum(len(numbers) for numbers in sequences.values()) == WORKERS * RECORDS
+    assert sequences == {f"worker-{worker}": list(range(RECORDS)) for worker in range(WORKERS)}